@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
@@ -22,6 +22,9 @@ def create_app(config_name = "development"):
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
 
+    from app.utils.json_provider import init_json_provider
+    init_json_provider(app)
+
     # ---------------- JWT CONFIG ----------------
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=12)  # increase lifetime
@@ -50,7 +53,7 @@ def create_app(config_name = "development"):
         "http://127.0.0.1:5173", 
         "http://localhost:5173",
         "https://team-neighbours-chama.netlify.app"
-    ]}}, supports_credentials=True)
+    ]}}, supports_credentials=True, expose_headers=["X-Next-Cursor"])
 
     jwt.init_app(app)
     swagger.init_app(app)
@@ -60,6 +63,36 @@ def create_app(config_name = "development"):
     from app.models.fines import Fine
     from app.models.loans import Loan
     from app.models.members import Member
+    from app.models.refresh_tokens import RefreshToken
+    from app.models.email_outbox import EmailOutbox
+    from app.models.member_balance import MemberBalance
+    from app.models.member_monthly_rollup import MemberMonthlyRollup
+    from app.models.payment import Payment, PaymentAllocation
+    from app.models.table_version import TableVersion
+
+    from app.utils.member_cache import member_cache
+    member_cache.init_app(app)
+    from app.utils.response_cache import response_cache
+    response_cache.init_app(app)
+    from app.utils.password_hashing import password_hasher
+    password_hasher.init_app(app)
+    from app.utils.email_service import email_outbox
+    email_outbox.init_app(app)
+
+    from app.commands import outbox_cli, balances_cli, rollups_cli, contributions_cli, fines_cli, payments_cli
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(balances_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(contributions_cli)
+    app.cli.add_command(fines_cli)
+    app.cli.add_command(payments_cli)
+
+    from app.utils.pagination import InvalidListRequest
+    app.register_error_handler(InvalidListRequest, lambda e: (jsonify({"msg": str(e)}), 400))
+    from app.utils.writes import InvalidWriteRequest
+    app.register_error_handler(InvalidWriteRequest, lambda e: (jsonify({"msg": str(e)}), 400))
+    from app.utils.fine_rules import FineRuleError
+    app.register_error_handler(FineRuleError, lambda e: (jsonify({"msg": str(e)}), 400))
 
     from app.routes import (
         attendance_routes,
@@ -68,7 +101,8 @@ def create_app(config_name = "development"):
         loan_routes,
         contribution_routes,
         member_routes,
-        #payment_routes,
+        dashboard_routes,
+        payment_routes,
     )
 
     # REGISTER BLUEPRINTS
@@ -78,6 +112,8 @@ def create_app(config_name = "development"):
     app.register_blueprint(fine_routes.fine_bp)
     app.register_blueprint(loan_routes.loan_bp)
     app.register_blueprint(member_routes.member_bp)
+    app.register_blueprint(dashboard_routes.dashboard_bp)
+    app.register_blueprint(payment_routes.payment_bp)
 
 
 
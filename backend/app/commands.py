@@ -0,0 +1,147 @@
+import click
+from datetime import date, datetime
+from flask import current_app
+from flask.cli import AppGroup
+from app.utils.email_service import email_outbox
+from app.utils.member_balances import find_drift, rebuild_balances, BALANCE_COLUMNS
+from app.utils.member_rollups import rebuild_rollups
+from app.utils.contribution_import import import_contributions, ContributionImportError, IMPORT_FORMATS
+from app.utils.fine_rules import apply_fine_rules, FineRuleError
+from app.utils.payments import reconcile_payments, StubPaymentProvider
+
+# Flask CLI commands, registered in create_app.
+# Run them from the backend directory, e.g. "flask --app run outbox drain".
+
+outbox_cli = AppGroup('outbox', help='Manage the email outbox.')
+
+
+@outbox_cli.command('drain')
+def drain_outbox():
+    """Send every queued email that is currently due, then exit."""
+    processed = email_outbox.drain()
+    click.echo(f"Processed {processed} queued email(s).")
+
+
+balances_cli = AppGroup('balances', help='Maintain the trigger-maintained member_balances table.')
+
+
+@balances_cli.command('rebuild')
+@click.option('--check-only', is_flag=True, help='Only report drift, do not rewrite the table.')
+def rebuild_member_balances(check_only):
+    """Compare member_balances with the ledgers, report any drift and recompute it from scratch."""
+    drift = find_drift()
+    for row in drift:
+        changes = ", ".join(
+            f"{column} {row[f'stored_{column}']} -> {row[f'expected_{column}']}"
+            for column in BALANCE_COLUMNS
+            if row[f'stored_{column}'] != row[f'expected_{column}']
+        )
+        click.echo(f"Member {row['member_id']}: {changes}")
+    click.echo(f"{len(drift)} member balance(s) drifted.")
+
+    if check_only:
+        if drift:
+            raise SystemExit(1)
+        return
+
+    rows = rebuild_balances()
+    click.echo(f"Rebuilt {rows} member balance(s).")
+
+
+rollups_cli = AppGroup('rollups', help='Maintain the trigger-maintained member_monthly_rollups table.')
+
+
+@rollups_cli.command('backfill')
+@click.option('--since', metavar='YYYY-MM', help='Only recompute this month and the ones after it.')
+def backfill_rollups(since):
+    """Recompute the per-member monthly rollups from the ledgers."""
+    if since:
+        try:
+            since = datetime.strptime(since, '%Y-%m').date()
+        except ValueError:
+            raise click.BadParameter("expected YYYY-MM", param_hint='--since')
+
+    rows = rebuild_rollups(since)
+    click.echo(f"Rebuilt {rows} monthly rollup(s).")
+
+
+contributions_cli = AppGroup('contributions', help='Bulk contribution tools.')
+
+
+@contributions_cli.command('import')
+@click.argument('file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), default='auto', show_default=True)
+@click.option('--skip-invalid', is_flag=True, help='Import the valid rows even if some rows are invalid.')
+@click.option('--dry-run', is_flag=True, help='Validate and report without saving anything.')
+def import_contributions_command(file, fmt, skip_invalid, dry_run):
+    """Import contributions from a CSV (phone, date, amount) or an M-Pesa statement export."""
+    try:
+        report = import_contributions(file, fmt=fmt, skip_invalid=skip_invalid, dry_run=dry_run)
+    except ContributionImportError as error:
+        raise click.ClickException(str(error))
+
+    for error in report['errors']:
+        click.echo(f"Line {error['line']}: {error['msg']}", err=True)
+    if report['invalid'] > len(report['errors']):
+        click.echo(f"... and {report['invalid'] - len(report['errors'])} more invalid row(s)", err=True)
+
+    click.echo(f"{report['valid']} valid row(s), {report['invalid']} invalid row(s).")
+    if report['committed']:
+        click.echo(f"Imported {report['imported']} contribution(s).")
+    else:
+        click.echo("Nothing was imported." + ("" if dry_run else " Fix the rows above or use --skip-invalid."))
+        if report['invalid']:
+            raise SystemExit(1)
+
+
+fines_cli = AppGroup('fines', help='Automatic fine rules.')
+
+
+@fines_cli.command('apply')
+@click.option('--from', 'date_from', type=click.DateTime(['%Y-%m-%d']), help='First day of the period (default: the 1st of this month).')
+@click.option('--to', 'date_to', type=click.DateTime(['%Y-%m-%d']), help='Last day of the period (default: today).')
+@click.option('--rule', 'rule_ids', multiple=True, help='Only apply this rule id (repeatable).')
+@click.option('--dry-run', is_flag=True, help='Only list the fines that would be created.')
+def apply_fines_command(date_from, date_to, rule_ids, dry_run):
+    """Generate the fines the configured rules produce for a period; safe to rerun."""
+    today = date.today()
+    date_from = date_from.date() if date_from else today.replace(day=1)
+    date_to = date_to.date() if date_to else today
+    try:
+        fines = apply_fine_rules(date_from, date_to, list(rule_ids), dry_run=dry_run)
+    except FineRuleError as error:
+        raise click.ClickException(str(error))
+
+    for fine in fines:
+        click.echo(f"{fine['rule_id']}: member {fine['member_id']} {fine['amount']} for {fine['period']}")
+    click.echo(f"{len(fines)} fine(s) {'would be created' if dry_run else 'created'}.")
+
+
+payments_cli = AppGroup('payments', help='Mobile-money payments.')
+
+
+@payments_cli.command('reconcile')
+@click.option('--batch-size', type=click.IntRange(1), help='Payments per transaction (default: PAYMENT_RECONCILE_BATCH_SIZE).')
+def reconcile_payments_command(batch_size):
+    """Match received payments to members and settle their outstanding fines and loans."""
+    report = reconcile_payments(batch_size)
+    click.echo(f"Matched {report['matched']} payment(s) to members, {report['unmatched']} still unmatched.")
+    click.echo(f"Allocated {report['allocated']} from {report['payments']} open payment(s) "
+               f"in {report['allocations']} allocation(s).")
+    click.echo(f"Settled {report['fines_settled']} fine(s) and {report['loans_settled']} loan(s).")
+
+
+@payments_cli.command('simulate')
+@click.argument('phone')
+@click.argument('amount')
+@click.option('--ref', 'account_ref', default='', help='Account reference, e.g. FINE-12 or LOAN-3.')
+@click.option('--url', help='Post to the callback endpoint of a running server instead of in-process.')
+def simulate_payment(phone, amount, account_ref, url):
+    """Send a payment callback from the stub provider, as if PHONE had paid AMOUNT."""
+    if not current_app.config['PAYMENT_CALLBACK_SECRET']:
+        raise click.ClickException("Set PAYMENT_CALLBACK_SECRET first; callbacks are refused without it.")
+    provider = StubPaymentProvider(current_app._get_current_object(), url)
+    status, body = provider.pay(phone, amount, account_ref)
+    click.echo(f"{provider.sent[-1]['TransID']}: {status} {body}")
+    if status != 200:
+        raise SystemExit(1)
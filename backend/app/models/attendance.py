@@ -1,7 +1,17 @@
 from app import db
 
+ATTENDANCE_STATUSES = ('present', 'absent', 'late')
+
+# Attendance statuses that count as having attended the meeting
+ATTENDED_STATUSES = ('present', 'late')
+
 class Attendance(db.Model):
     __tablename__ = 'attendances'
+    __table_args__ = (
+        # One record per member per meeting; its index also serves member_id lookups
+        db.UniqueConstraint('member_id', 'date', name='uq_attendances_member_id_date'),
+        db.Index('ix_attendances_date_id', 'date', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
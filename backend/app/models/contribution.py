@@ -2,6 +2,10 @@ from app import db
 
 class Contribution(db.Model):
     __tablename__= 'contributions'
+    __table_args__ = (
+        db.Index('ix_contributions_member_id_date', 'member_id', 'date'),
+        db.Index('ix_contributions_date_id', 'date', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
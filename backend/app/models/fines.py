@@ -2,6 +2,14 @@ from app import db
 
 class Fine(db.Model):
     __tablename__ = 'fines'
+    __table_args__ = (
+        db.Index('ix_fines_member_id_date', 'member_id', 'date'),
+        db.Index('ix_fines_date_id', 'date', 'id'),
+        db.Index('ix_fines_status_date_id', 'status', 'date', 'id'),
+        # Rule-generated fines are unique per (rule, member, period); see app/utils/fine_rules.py
+        db.Index('uq_fines_rule_id_member_id_period', 'rule_id', 'member_id', 'period',
+                 unique=True, postgresql_where=db.text('rule_id IS NOT NULL')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
@@ -9,6 +17,9 @@ class Fine(db.Model):
     date = db.Column(db.Date, nullable=False)
     status = db.Column(db.String(20), default="pending")
     reason = db.Column(db.String, nullable=False)
+    # Set only on fines generated by a fine rule
+    rule_id = db.Column(db.String(50), nullable=True)
+    period = db.Column(db.Date, nullable=True)
 
     member = db.relationship('Member', back_populates='fines')
 
@@ -22,5 +33,7 @@ class Fine(db.Model):
             'amount': self.amount,
             'date': self.date,
             "status": self.status,
-            "reason": self.reason
+            "reason": self.reason,
+            "rule_id": self.rule_id,
+            "period": self.period
         }
\ No newline at end of file
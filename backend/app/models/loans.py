@@ -2,12 +2,21 @@ from app import db
 
 class Loan(db.Model):
     __tablename__ = 'loans'
+    __table_args__ = (
+        db.Index('ix_loans_member_id_date', 'member_id', 'date'),
+        db.Index('ix_loans_date_id', 'date', 'id'),
+        db.Index('ix_loans_status_date_id', 'status', 'date', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     date = db.Column(db.Date, nullable=False)
     status = db.Column(db.String(20), default="pending")
+    # Annual rate (0.12 = 12%) and repayment term; NULL falls back to
+    # LOAN_DEFAULT_INTEREST_RATE / LOAN_DEFAULT_TERM_MONTHS (see app/utils/amortization.py)
+    interest_rate = db.Column(db.Numeric(5, 4), nullable=True)
+    term_months = db.Column(db.Integer, nullable=True)
 
     member = db.relationship('Member', back_populates='loans')
 
@@ -20,5 +29,7 @@ class Loan(db.Model):
             'member_id': self.member_id,
             'amount': self.amount,
             'date': self.date,
-            "status": self.status
+            "status": self.status,
+            "interest_rate": self.interest_rate,
+            "term_months": self.term_months
         }
@@ -0,0 +1,31 @@
+from app import db
+
+
+class MemberBalance(db.Model):
+    """Running totals per member, kept current by database triggers on
+    contributions, fines and loans (see migration 75ef9f2ff351).
+
+    Never write to this table from the application; use
+    "flask balances rebuild" to recompute it if it is ever suspected to drift.
+    """
+    __tablename__ = 'member_balances'
+
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), primary_key=True)
+    total_contributed = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    fines_outstanding = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    loan_principal_outstanding = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    last_activity_date = db.Column(db.Date, nullable=True)
+
+    member = db.relationship('Member', back_populates='balance')
+
+    def __repr__(self):
+        return f'<MemberBalance Member {self.member_id}>'
+
+    def to_dict(self):
+        return {
+            'member_id': self.member_id,
+            'total_contributed': self.total_contributed,
+            'fines_outstanding': self.fines_outstanding,
+            'loan_principal_outstanding': self.loan_principal_outstanding,
+            'last_activity_date': self.last_activity_date
+        }
@@ -0,0 +1,41 @@
+from app import db
+
+
+class MemberMonthlyRollup(db.Model):
+    """Contribution, fine and attendance totals per member per calendar month,
+    kept current by statement-level database triggers on contributions, fines
+    and attendances (see migration 3c1d8e5a9b27).
+
+    Only the (member, month) buckets touched by a statement are recomputed.
+    Never write to this table from the application; use
+    "flask rollups backfill" to recompute it.
+    """
+    __tablename__ = 'member_monthly_rollups'
+    __table_args__ = (
+        db.Index('ix_member_monthly_rollups_month', 'month'),
+    )
+
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), primary_key=True)
+    # First day of the month
+    month = db.Column(db.Date, primary_key=True)
+    contribution_total = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    contribution_count = db.Column(db.Integer, nullable=False, default=0)
+    fine_total = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    fine_count = db.Column(db.Integer, nullable=False, default=0)
+    attendance_total = db.Column(db.Integer, nullable=False, default=0)
+    attendance_attended = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<MemberMonthlyRollup Member {self.member_id} {self.month:%Y-%m}>'
+
+    def to_dict(self):
+        return {
+            'member_id': self.member_id,
+            'month': self.month.strftime('%Y-%m'),
+            'contribution_total': self.contribution_total,
+            'contribution_count': self.contribution_count,
+            'fine_total': self.fine_total,
+            'fine_count': self.fine_count,
+            'attendance_total': self.attendance_total,
+            'attendance_attended': self.attendance_attended
+        }
@@ -45,6 +45,7 @@ class Member(db.Model):
     loans = db.relationship('Loan', back_populates='member', lazy="select")
     contributions = db.relationship('Contribution', back_populates='member', lazy="select")
     attendances = db.relationship('Attendance', back_populates='member', lazy="select")
+    balance = db.relationship('MemberBalance', back_populates='member', uselist=False, lazy="select")
 
 
     def __repr__(self):
@@ -59,3 +60,7 @@ class Member(db.Model):
             'gender': self.gender,
             'role': self.role
         }
+
+
+# Login looks members up by lower(email), so it needs a matching expression index.
+db.Index('ix_members_email_lower', db.func.lower(Member.email))
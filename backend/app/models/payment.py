@@ -0,0 +1,83 @@
+from app import db
+from datetime import datetime, timezone
+
+# unmatched: no member has the paying phone number (retried on every reconciliation run)
+# unallocated -> partial -> allocated as reconciliation settles fines and loans with it
+PAYMENT_STATUSES = ('unmatched', 'unallocated', 'partial', 'allocated')
+
+
+class Payment(db.Model):
+    """A payment received from the mobile-money provider (see app/utils/payments.py)."""
+    __tablename__ = 'payments'
+    __table_args__ = (
+        db.Index('ix_payments_status_id', 'status', 'id'),
+        db.Index('ix_payments_member_id_date', 'member_id', 'date'),
+        db.Index('ix_payments_date_id', 'date', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # The provider's transaction id; callbacks are retried, so it is unique
+    provider_ref = db.Column(db.String(50), unique=True, nullable=False)
+    phone = db.Column(db.String(20), nullable=False)
+    # Account number the payer typed, e.g. "FINE-12" or "LOAN-3" to settle a specific debt
+    account_ref = db.Column(db.String(50), nullable=True)
+    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    allocated_amount = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    date = db.Column(db.Date, nullable=False)
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='unallocated')
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    allocations = db.relationship('PaymentAllocation', back_populates='payment', order_by='PaymentAllocation.id')
+
+    def __repr__(self):
+        return f'<Payment {self.provider_ref} - {self.amount} ({self.status})>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'provider_ref': self.provider_ref,
+            'phone': self.phone,
+            'account_ref': self.account_ref,
+            'amount': self.amount,
+            'allocated_amount': self.allocated_amount,
+            'date': self.date,
+            'member_id': self.member_id,
+            'status': self.status
+        }
+
+
+class PaymentAllocation(db.Model):
+    """The part of a payment applied to one fine or one loan.
+
+    Fines and loans with allocations cannot be deleted (the foreign keys
+    restrict it), so the payments ledger always adds up.
+    """
+    __tablename__ = 'payment_allocations'
+    __table_args__ = (
+        db.CheckConstraint('num_nonnulls(fine_id, loan_id) = 1', name='ck_payment_allocations_one_target'),
+        db.Index('ix_payment_allocations_payment_id', 'payment_id'),
+        db.Index('ix_payment_allocations_fine_id', 'fine_id'),
+        db.Index('ix_payment_allocations_loan_id', 'loan_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    payment_id = db.Column(db.Integer, db.ForeignKey('payments.id'), nullable=False)
+    fine_id = db.Column(db.Integer, db.ForeignKey('fines.id'), nullable=True)
+    loan_id = db.Column(db.Integer, db.ForeignKey('loans.id'), nullable=True)
+    amount = db.Column(db.Numeric(10, 2), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    payment = db.relationship('Payment', back_populates='allocations')
+
+    def __repr__(self):
+        return f'<PaymentAllocation {self.id} - Payment {self.payment_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'payment_id': self.payment_id,
+            'fine_id': self.fine_id,
+            'loan_id': self.loan_id,
+            'amount': self.amount
+        }
@@ -0,0 +1,19 @@
+from app import db
+from datetime import datetime, timezone
+
+
+class RefreshToken(db.Model):
+    __tablename__ = 'refresh_tokens'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    # Every token rotated from the same login shares a family, so a reused token can revoke the whole chain.
+    family_id = db.Column(db.String(36), nullable=False, index=True)
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False, index=True)
+    issued_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    replaced_by = db.Column(db.String(36), nullable=True)
+    revoked = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        return f'<RefreshToken {self.jti} - Member {self.member_id}>'
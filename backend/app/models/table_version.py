@@ -0,0 +1,26 @@
+from app import db
+
+
+class TableVersion(db.Model):
+    """A change counter per table, bumped once at the commit of every
+    transaction that wrote to it (see migration 6f2b9c0d4a17).
+
+    app/utils/table_versions.py builds ETags from it. Never write to this table
+    from the application.
+    """
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(63), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TableVersion {self.table_name} v{self.version}>'
+
+
+# One row per open transaction that has written to a versioned table; its
+# deferred trigger bumps the counters at commit and deletes it again
+table_versions_pending = db.Table(
+    'table_versions_pending',
+    db.Column('txid', db.BigInteger, primary_key=True),
+    prefixes=['UNLOGGED']
+)
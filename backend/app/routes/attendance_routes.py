@@ -1,13 +1,40 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from psycopg2 import errorcodes
+from sqlalchemy import select
 from app import db
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, ATTENDANCE_STATUSES
 from flasgger.utils import swag_from
 from datetime import datetime
 from app.utils.auth_helpers import role_required
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.pagination import json_page, page_response
+from app.utils.list_filters import apply_list_filters
+from app.utils.export import export_response
+from app.utils.writes import bulk_criteria, bulk_delete, update_member_record, delete_by_id
+from app.utils.response_cache import response_cache
+from app.utils.table_versions import conditional_get
+from flask_jwt_extended import get_jwt_identity
 from app.models.members import Member
 
 
+# The one constraint a well-formed request can still hit: a second record for the member on that date
+ATTENDANCE_UNIQUE_CONSTRAINT = 'uq_attendances_member_id_date'
+
+
+def _integrity_error_response(error):
+    """Turn a rejected attendance write into a response; anything else is a bug and is re-raised."""
+    db.session.rollback()
+    if getattr(getattr(error.orig, 'diag', None), 'constraint_name', None) == ATTENDANCE_UNIQUE_CONSTRAINT:
+        return jsonify({"msg": "Attendance for this member on this date is already recorded"}), 409
+    if getattr(error.orig, 'pgcode', None) == errorcodes.FOREIGN_KEY_VIOLATION:
+        return jsonify({"msg": "Member not found"}), 404
+    raise error
+
+
+# The columns of Attendance.to_dict(), read directly by the list and export endpoints
+ATTENDANCE_COLUMNS = (Attendance.id, Attendance.member_id, Attendance.date, Attendance.status)
+
 attendance_bp = Blueprint('attendance', __name__)
 
 
@@ -49,6 +76,22 @@ attendance_bp = Blueprint('attendance', __name__)
                     'msg': 'Missing required fields or invalid data.'
                 }
             }
+        },
+        404: {
+            'description': 'Member not found',
+            'examples': {
+                'application/json': {
+                    'msg': 'Member not found'
+                }
+            }
+        },
+        409: {
+            'description': 'Attendance already recorded for this member on this date',
+            'examples': {
+                'application/json': {
+                    'msg': 'Attendance for this member on this date is already recorded'
+                }
+            }
         }
     }
 })
@@ -68,6 +111,9 @@ def record_attendance():
     if not member_id or not date_str or not status:
         return jsonify({"msg": "Missing required fields: member_id, date, status"}), 400
     
+    if status not in ATTENDANCE_STATUSES:
+        return jsonify({"msg": "status must be one of: " + ", ".join(ATTENDANCE_STATUSES)}), 400
+
     # Convert date string to datetime.date
     try:
         date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
@@ -76,11 +122,135 @@ def record_attendance():
     # Create a new attendance record
     attendance = Attendance(member_id=member_id, date=date_obj, status=status)
     db.session.add(attendance)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        return _integrity_error_response(e)
+    response_cache.invalidate(Attendance, member_id)
 
     return jsonify({"msg": "Attendance recorded successfully"})
 
 
+# POST REQUEST (whole roll call)
+@attendance_bp.route('/attendance/bulk', methods=['POST', 'OPTIONS'])
+@swag_from({
+    'tags': ['Attendance'],
+    'description': 'Record the attendance of a whole meeting in one request. Re-submitting the same '
+                   'roll call is safe: existing records for that date are updated in place.',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'date': {'type': 'string', 'format': 'date'},
+                    'records': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'member_id': {'type': 'integer'},
+                                'status': {'type': 'string', 'enum': ['present', 'absent', 'late']}
+                            },
+                            'required': ['member_id', 'status']
+                        }
+                    }
+                },
+                'required': ['date', 'records']
+            }
+        }
+    ],
+    'responses': {
+        201: {
+            'description': 'Roll call recorded',
+            'examples': {
+                'application/json': {
+                    'msg': 'Attendance recorded successfully',
+                    'recorded': 40
+                }
+            }
+        },
+        400: {
+            'description': 'Invalid roll call; nothing was recorded',
+            'examples': {
+                'application/json': {
+                    'msg': 'Invalid attendance records',
+                    'errors': [{'index': 3, 'msg': 'Unknown member_id 99'}]
+                }
+            }
+        },
+        404: {
+            'description': 'A member was deleted while the roll call was being recorded; nothing was recorded',
+            'examples': {
+                'application/json': {
+                    'msg': 'Member not found'
+                }
+            }
+        }
+    }
+})
+@role_required('admin')
+def record_bulk_attendance():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    data = request.get_json() or {}
+    date_str = data.get('date')
+    records = data.get('records')
+
+    if not date_str or not isinstance(records, list) or not records:
+        return jsonify({"msg": "Missing required fields: date, records"}), 400
+    try:
+        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return jsonify({"msg": "Date must be in YYYY-MM-DD format"}), 400
+
+    # Validate every record before writing any of them
+    errors = []
+    rows = {}
+    for index, record in enumerate(records):
+        member_id = record.get('member_id') if isinstance(record, dict) else None
+        status = record.get('status') if isinstance(record, dict) else None
+        if not isinstance(member_id, int) or isinstance(member_id, bool):
+            errors.append({"index": index, "msg": "member_id must be an integer"})
+        elif status not in ATTENDANCE_STATUSES:
+            errors.append({"index": index, "msg": "status must be one of: " + ", ".join(ATTENDANCE_STATUSES)})
+        elif member_id in rows:
+            errors.append({"index": index, "msg": f"Duplicate member_id {member_id}"})
+        else:
+            rows[member_id] = index
+
+    known = {member_id for (member_id,) in db.session.query(Member.id).filter(Member.id.in_(rows))}
+    errors.extend(
+        {"index": index, "msg": f"Unknown member_id {member_id}"}
+        for member_id, index in rows.items() if member_id not in known
+    )
+
+    if errors:
+        return jsonify({"msg": "Invalid attendance records", "errors": sorted(errors, key=lambda e: e['index'])}), 400
+
+    # One multi-row INSERT; the (member_id, date) constraint turns a re-submission into an update
+    statement = insert(Attendance).values([
+        {'member_id': records[index]['member_id'], 'date': date_obj, 'status': records[index]['status']}
+        for index in rows.values()
+    ])
+    statement = statement.on_conflict_do_update(
+        constraint='uq_attendances_member_id_date',
+        set_={'status': statement.excluded.status}
+    )
+    try:
+        result = db.session.execute(statement)
+        db.session.commit()
+    except IntegrityError as e:
+        return _integrity_error_response(e)
+    response_cache.invalidate(Attendance, *rows)
+
+    return jsonify({"msg": "Attendance recorded successfully", "recorded": result.rowcount}), 201
+
+
 # GET REQUEST
 @attendance_bp.route('/attendance/<int:member_id>', methods=['GET', 'OPTIONS'])
 @swag_from({
@@ -132,6 +302,8 @@ def record_attendance():
     }
 })
 @role_required('admin', 'member')
+@conditional_get(Attendance)
+@response_cache.per_member(Attendance)
 def get_specifiedAttendance(member_id):
     if request.method == 'OPTIONS':
         return '', 200
@@ -149,6 +321,59 @@ def get_specifiedAttendance(member_id):
     'tags': ['Attendance'],
     'description': 'Get all attendance records',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'name': 'after',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Cursor from the X-Next-Cursor header of the previous page'
+        },
+        {
+            'name': 'all',
+            'in': 'query',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Return every record in one unpaged response'
+        },
+        {
+            'name': 'date_from',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or after this date'
+        },
+        {
+            'name': 'date_to',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or before this date'
+        },
+        {
+            'name': 'member_id',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Only records for this member'
+        },
+        {
+            'name': 'status',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Only records with this status (comma separated for several)'
+        }
+    ],
     'responses': {
         200: {
             'description': 'Attendance records retrieved successfully.',
@@ -184,13 +409,48 @@ def get_specifiedAttendance(member_id):
     }
 })
 @role_required('admin')
+@conditional_get(Attendance)
 def get_all_attendances():
     if request.method == 'OPTIONS':
         return '', 200
     
-    attendances = Attendance.query.all()
+    # Only the listed columns; on Postgres the database writes the JSON body (see json_page)
+    body, next_cursor = json_page(apply_list_filters(select(*ATTENDANCE_COLUMNS), Attendance), Attendance.date, Attendance.id)
+
+    return page_response(body, next_cursor)
+
+
+# Export attendances as a stream
+@attendance_bp.route('/attendance/export', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Attendance'],
+    'description': 'Stream every matching attendance record as CSV or NDJSON. Accepts the same filters as GET /attendance.',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'format',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'enum': ['csv', 'ndjson'],
+            'default': 'csv'
+        }
+    ],
+    'produces': ['text/csv', 'application/x-ndjson'],
+    'responses': {
+        200: {
+            'description': 'Attendance records streamed as an attachment'
+        }
+    }
+})
+@role_required('admin')
+def export_attendances():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    query = apply_list_filters(db.session.query(*ATTENDANCE_COLUMNS), Attendance).order_by(Attendance.date, Attendance.id)
 
-    return jsonify([attendance.to_dict() for attendance in attendances]), 200  
+    return export_response(query, ATTENDANCE_COLUMNS, 'attendances')
 
 
 # DELETE ATTENDANCE RECORD
@@ -231,17 +491,70 @@ def delete_attendance(attendance_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    attendance = Attendance.query.get(attendance_id)
-
-    if not attendance:
-        return jsonify({"msg": "Attendance record not found"})
-    
-    db.session.delete(attendance)
-    db.session.commit()
+    deleted = delete_by_id(Attendance, attendance_id, Attendance.member_id)
+    if not deleted:
+        return jsonify({"msg": "Attendance record not found"}), 404
+    response_cache.invalidate(Attendance, deleted.member_id)
 
     return jsonify({"msg": "Attendance record deleted successfully."}), 200
 
 
+@attendance_bp.route('/attendance/bulk', methods=['DELETE', 'OPTIONS'])
+@swag_from({
+    'tags': ['Attendance'],
+    'description': "Delete many attendance records in one statement, e.g. a cancelled meeting's roll call",
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                    'filter': {
+                        'type': 'object',
+                        'description': 'Select rows by any of date, date_from, date_to, member_id, status',
+                        'properties': {
+                            'date': {'type': 'string', 'format': 'date'},
+                            'date_from': {'type': 'string', 'format': 'date'},
+                            'date_to': {'type': 'string', 'format': 'date'},
+                            'member_id': {'type': 'integer'},
+                            'status': {'type': 'string'}
+                        }
+                    }
+                },
+                'example': {'filter': {'date': '2026-10-04'}}
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Attendance records deleted successfully',
+            'examples': {
+                'application/json': {'msg': 'Attendance records deleted successfully', 'count': 12}
+            }
+        },
+        400: {
+            'description': 'Bad Request',
+            'examples': {
+                'application/json': {'msg': "Provide 'ids' or at least one 'filter' condition"}
+            }
+        }
+    }
+})
+@role_required('admin')
+def bulk_delete_attendances():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    count, member_ids = bulk_delete(Attendance, bulk_criteria(Attendance, request.get_json(silent=True)))
+    response_cache.invalidate(Attendance, *member_ids)
+
+    return jsonify({"msg": "Attendance records deleted successfully", "count": count}), 200
+
+
 @attendance_bp.route('/attendance/<int:attendance_id>', methods=['PATCH'])
 @swag_from({
     'tags': ['Attendance'],
@@ -278,12 +591,20 @@ def delete_attendance(attendance_id):
             }
         },
         404: {
-            'description': 'Attendance not found',
+            'description': 'Attendance record or the new member not found',
             'examples': {
                 'application/json': {
                     'msg': 'Attendance not found'
                 }
             }
+        },
+        409: {
+            'description': 'Another record already exists for this member on this date',
+            'examples': {
+                'application/json': {
+                    'msg': 'Attendance for this member on this date is already recorded'
+                }
+            }
         }
     }
 })
@@ -292,28 +613,33 @@ def update_attendance(attendance_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    attendance = Attendance.query.get(attendance_id)
-
-    if not attendance:
-        return jsonify({"msg": "Attendance record not found"})
-    
     data = request.get_json()
 
     member_id = data.get('member_id')
     date_str = data.get('date')
     status = data.get('status')
 
+    values = {}
     if member_id:
-        attendance.member_id = member_id
+        values['member_id'] = member_id
     if date_str:
         try:
-            attendance.date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            values['date'] = datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             return jsonify({"msg": "Date must be in YYYY-MM-DD format"}), 400
     if status:
-        attendance.status = status
+        if status not in ATTENDANCE_STATUSES:
+            return jsonify({"msg": "status must be one of: " + ", ".join(ATTENDANCE_STATUSES)}), 400
+        values['status'] = status
+
+    try:
+        updated = update_member_record(Attendance, attendance_id, values)
+    except IntegrityError as e:
+        return _integrity_error_response(e)
 
-    db.session.commit()
+    if not updated:
+        return jsonify({"msg": "Attendance record not found"}), 404
+    response_cache.invalidate(Attendance, *updated)
 
     return jsonify({"msg": "Attendance record updated successfully."}), 200
 
@@ -365,8 +691,9 @@ def update_attendance(attendance_id):
         }
     }
 })
-@jwt_required()
 @role_required('admin', 'member')
+@conditional_get(Attendance)
+@response_cache.per_member(Attendance)
 def get_my_attendance():
     # get logged-in user id from JWT
     member_id = get_jwt_identity()  # JWT stores member.id
@@ -1,16 +1,26 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from sqlalchemy import func
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from app import db
 from flasgger.utils import swag_from
 from app.models.members import Member
-from app.utils.email_service import send_welcome_email
+from app.utils.email_service import send_welcome_email, email_outbox
+from app.utils.auth_helpers import member_claims
+from app.utils.member_cache import member_cache
+from app.utils.password_hashing import password_hasher, HashingPoolSaturated
+from app.utils.token_store import issue_refresh_token, rotate_refresh_token, revoke_family, purge_expired_tokens, RefreshTokenReused
 from flask_jwt_extended import decode_token
-from threading import Thread
 
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+
+def busy_response(error):
+    response = jsonify({'message': 'Server is busy, please try again shortly.'})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
+
 @auth_bp.route('/register', methods=['POST', 'OPTIONS'])
 @swag_from({
     'tags': ['Auth'],
@@ -54,6 +64,14 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
                     'msg': 'Email/Phone already registered'
                 }
             }
+        },
+        503: {
+            'description': 'Password hashing pool is saturated; retry after the Retry-After header',
+            'examples': {
+                'application/json': {
+                    'message': 'Server is busy, please try again shortly.'
+                }
+            }
         }
     }
 })
@@ -80,14 +98,17 @@ def register():
     
     # Check if user exists
     existing_user = Member.query.filter(
-        (Member.email==email) | (Member.phone==phone)
+        (func.lower(Member.email)==email.lower()) | (Member.phone==phone)
     ).first()
 
     if existing_user:
         return jsonify({"msg": "Email/Phone already registered"}), 400
     
-    # Hash password
-    hashed_password = generate_password_hash(password)
+    # Hash password on the bounded hashing pool
+    try:
+        hashed_password = password_hasher.generate(password)
+    except HashingPoolSaturated as e:
+        return busy_response(e)
 
     #create new member
     new_member = Member(
@@ -100,10 +121,11 @@ def register():
     )
 
     db.session.add(new_member)
+    # The welcome email is queued in the same transaction, so it exists exactly when the member does
+    send_welcome_email(new_member.email, new_member.name)
     db.session.commit()
-
-     # Send welcome email asynchronously
-    Thread(target=send_welcome_email, args=(new_member.email, new_member.name)).start()
+    member_cache.invalidate(new_member.id)
+    email_outbox.wake()
 
 
     return jsonify({"msg": "Member registered successfully"}), 200
@@ -134,6 +156,7 @@ def register():
             'examples': {
                 'application/json': {
                     'access_token': 'your_jwt_token_here',
+                    'refresh_token': 'your_refresh_token_here',
                     'user': {
                         'id': 1,
                         'name': 'Natalie',
@@ -150,6 +173,14 @@ def register():
                     'message': 'Invalid email or password.'
                 }
             }
+        },
+        503: {
+            'description': 'Password hashing pool is saturated; retry after the Retry-After header',
+            'examples': {
+                'application/json': {
+                    'message': 'Server is busy, please try again shortly.'
+                }
+            }
         }
     }
 })
@@ -161,13 +192,27 @@ def login():
     email = data.get('email')
     password = data.get('password')
 
-    member = Member.query.filter_by(email=email).first()
-    if not member or not check_password_hash(member.password_hash, password):
+    # Case-insensitive match served by the ix_members_email_lower expression index
+    member = Member.query.filter(func.lower(Member.email) == (email or '').lower()).first()
+    if not member:
+        return jsonify({'message': 'Invalid email or password.'}), 401
+
+    try:
+        password_ok = password_hasher.check(member.password_hash, password)
+    except HashingPoolSaturated as e:
+        return busy_response(e)
+
+    if not password_ok:
         return jsonify({'message': 'Invalid email or password.'}), 401
 
-    access_token = create_access_token(identity=member.id)
+    access_token = create_access_token(identity=member.id, additional_claims=member_claims(member))
+    purge_expired_tokens(member.id)
+    refresh_token = issue_refresh_token(member.id)
+    db.session.commit()
+
     return jsonify({
         'access_token': access_token,
+        'refresh_token': refresh_token,
         'user': {
             'id': member.id,
             'name': member.name,
@@ -182,11 +227,67 @@ def login():
 @jwt_required()
 def tutorial_seen():
     member_id = get_jwt_identity()
-    user = Member.query.get(member_id)
-    if not user:
+    cached = member_cache.get(member_id)
+    if not cached:
         return jsonify({"error": "User not found"}), 404
 
+    # Repeat calls are common and need no write once the flag is already cleared.
+    if cached.is_first_login is False:
+        return jsonify({"message": "Tutorial marked as seen"}), 200
+
+    user = Member.query.get(member_id)
     user.is_first_login = False
     db.session.commit()
+    member_cache.invalidate(member_id)
     return jsonify({"message": "Tutorial marked as seen"}), 200
 
+
+@auth_bp.route('/refresh', methods=['POST', 'OPTIONS'])
+@swag_from({
+    'tags': ['Auth'],
+    'description': 'Exchange a refresh token (sent as the Bearer token) for a new access token and a rotated refresh token',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Tokens rotated',
+            'examples': {
+                'application/json': {
+                    'access_token': 'your_new_jwt_token_here',
+                    'refresh_token': 'your_new_refresh_token_here'
+                }
+            }
+        },
+        401: {
+            'description': 'Refresh token was already used, revoked or the member is disabled',
+            'examples': {
+                'application/json': {
+                    'message': 'Refresh token is no longer valid. Please log in again.'
+                }
+            }
+        }
+    }
+})
+@jwt_required(refresh=True)
+def refresh():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    claims = get_jwt()
+    member = member_cache.get(claims['sub'])
+    if not member or member.role == 'disabled':
+        revoke_family(claims.get('family'))
+        db.session.commit()
+        return jsonify({'message': 'Refresh token is no longer valid. Please log in again.'}), 401
+
+    try:
+        refresh_token = rotate_refresh_token(claims)
+    except RefreshTokenReused:
+        return jsonify({'message': 'Refresh token is no longer valid. Please log in again.'}), 401
+
+    access_token = create_access_token(identity=member.id, additional_claims=member_claims(member))
+    db.session.commit()
+
+    return jsonify({
+        'access_token': access_token,
+        'refresh_token': refresh_token
+    }), 200
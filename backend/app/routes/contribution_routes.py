@@ -1,11 +1,23 @@
+import io
 from flask import Blueprint, request, jsonify
+from sqlalchemy import select
 from app import db
 from app.models.contribution import Contribution
 from flasgger.utils import swag_from
 from app.utils.auth_helpers import role_required
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.pagination import json_page, page_response
+from app.utils.list_filters import apply_list_filters
+from app.utils.export import export_response
+from app.utils.writes import bulk_criteria, bulk_delete, update_member_record, delete_by_id
+from app.utils.response_cache import response_cache
+from app.utils.table_versions import conditional_get
+from app.utils.contribution_import import import_contributions, ContributionImportError, IMPORT_FORMATS
+from flask_jwt_extended import get_jwt_identity
 from app.models.members import Member
 
+# The columns of Contribution.to_dict(), read directly by the list and export endpoints
+CONTRIBUTION_COLUMNS = (Contribution.id, Contribution.member_id, Contribution.amount, Contribution.date)
+
 contribution_bp = Blueprint('contribution', __name__) 
 
 @contribution_bp.route('/contribution', methods=['POST', 'OPTIONS'])
@@ -69,9 +81,105 @@ def record_contribution():
 
     db.session.add(contribution)
     db.session.commit()
+    response_cache.invalidate(Contribution, member_id)
 
     return jsonify({"msg": "Contribution recorded successfully"}), 201
 
+
+@contribution_bp.route('/contribution/import', methods=['POST', 'OPTIONS'])
+@swag_from({
+    'tags': ['Contribution'],
+    'description': 'Import contributions from a CSV file (phone, date, amount columns) or an M-Pesa '
+                   'statement export. Rows are matched to members by phone number. By default the '
+                   'import is all-or-nothing: any invalid row rejects the whole file.',
+    'security': [{'Bearer': []}],
+    'consumes': ['multipart/form-data'],
+    'parameters': [
+        {
+            'name': 'file',
+            'in': 'formData',
+            'required': True,
+            'type': 'file'
+        },
+        {
+            'name': 'format',
+            'in': 'formData',
+            'required': False,
+            'type': 'string',
+            'enum': list(IMPORT_FORMATS),
+            'default': 'auto'
+        },
+        {
+            'name': 'skip_invalid',
+            'in': 'formData',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Import the valid rows even if some rows are invalid'
+        },
+        {
+            'name': 'dry_run',
+            'in': 'formData',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Validate and report without saving anything'
+        }
+    ],
+    'responses': {
+        201: {
+            'description': 'Contributions imported',
+            'examples': {
+                'application/json': {
+                    'imported': 412, 'valid': 412, 'invalid': 0, 'committed': True, 'errors': []
+                }
+            }
+        },
+        200: {
+            'description': 'Dry run report; nothing was saved'
+        },
+        400: {
+            'description': 'The file cannot be read as a contributions import',
+            'examples': {
+                'application/json': {'msg': 'Missing column(s): amount'}
+            }
+        },
+        422: {
+            'description': 'Some rows are invalid; nothing was saved',
+            'examples': {
+                'application/json': {
+                    'imported': 0, 'valid': 410, 'invalid': 2, 'committed': False,
+                    'errors': [{'line': 17, 'msg': "No member with phone '0712000000'"}]
+                }
+            }
+        }
+    }
+})
+@role_required('admin')
+def import_contributions_file():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({"msg": "Missing required file upload: file"}), 400
+
+    dry_run = request.form.get('dry_run', 'false').lower() == 'true'
+    stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        report = import_contributions(
+            stream,
+            fmt=request.form.get('format', 'auto').lower(),
+            skip_invalid=request.form.get('skip_invalid', 'false').lower() == 'true',
+            dry_run=dry_run
+        )
+    except ContributionImportError as error:
+        return jsonify({"msg": str(error)}), 400
+    except UnicodeDecodeError:
+        return jsonify({"msg": "File must be UTF-8 encoded text"}), 400
+
+    if report['committed']:
+        return jsonify(report), 201
+    return jsonify(report), 200 if dry_run else 422
+
 @contribution_bp.route('/contribution/<int:member_id>', methods=['GET', 'OPTIONS'])
 @swag_from({
     'tags': ['Contribution'],
@@ -128,6 +236,8 @@ def record_contribution():
     }
 })
 @role_required('admin', 'member')
+@conditional_get(Contribution)
+@response_cache.per_member(Contribution)
 def get_attendance(member_id):
     if request.method == 'OPTIONS':
         return '', 200
@@ -146,6 +256,66 @@ def get_attendance(member_id):
     'tags': ['Contribution'],
     'description': 'Get all contribution records',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'name': 'after',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Cursor from the X-Next-Cursor header of the previous page'
+        },
+        {
+            'name': 'all',
+            'in': 'query',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Return every record in one unpaged response'
+        },
+        {
+            'name': 'date_from',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or after this date'
+        },
+        {
+            'name': 'date_to',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or before this date'
+        },
+        {
+            'name': 'member_id',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Only records for this member'
+        },
+        {
+            'name': 'min_amount',
+            'in': 'query',
+            'required': False,
+            'type': 'number',
+            'description': 'Only records with at least this amount'
+        },
+        {
+            'name': 'max_amount',
+            'in': 'query',
+            'required': False,
+            'type': 'number',
+            'description': 'Only records with at most this amount'
+        }
+    ],
     'responses': {
         200: {
             'description': 'Contribution records retrieved successfully',
@@ -181,14 +351,50 @@ def get_attendance(member_id):
     }
 })
 @role_required('admin')
+@conditional_get(Contribution)
 def get_all_contributions():
     if request.method == 'OPTIONS':
         return '', 200
     
-    # Query all Contribution records
-    contributions = Contribution.query.all()
+    # Query one page of the matching contributions, newest first, as the listed
+    # columns; on Postgres the database writes the JSON body (see json_page)
+    body, next_cursor = json_page(apply_list_filters(select(*CONTRIBUTION_COLUMNS), Contribution), Contribution.date, Contribution.id)
+
+    return page_response(body, next_cursor)
+
+
+# Export contributions as a stream
+@contribution_bp.route('/contribution/export', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Contribution'],
+    'description': 'Stream every matching contribution record as CSV or NDJSON. Accepts the same filters as GET /contribution.',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'format',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'enum': ['csv', 'ndjson'],
+            'default': 'csv'
+        }
+    ],
+    'produces': ['text/csv', 'application/x-ndjson'],
+    'responses': {
+        200: {
+            'description': 'Contribution records streamed as an attachment'
+        }
+    }
+})
+@role_required('admin')
+def export_contributions():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    query = apply_list_filters(db.session.query(*CONTRIBUTION_COLUMNS), Contribution).order_by(Contribution.date, Contribution.id)
+
+    return export_response(query, CONTRIBUTION_COLUMNS, 'contributions')
 
-    return jsonify([contribution.to_dict() for contribution in contributions]), 200
 
 # Edit a contribution
 @contribution_bp.route('/contribution/<int:contribution_id>', methods=['PUT', 'OPTIONS'])
@@ -251,23 +457,22 @@ def edit_contribution(contribution_id):
        
     data = request.get_json()
 
-    contribution = Contribution.query.get(contribution_id)
-
-    if not contribution:
-        return jsonify({"msg": "Contribution not found"}), 404
-
     member_id = data.get('member_id')
     date = data.get('date')
     amount = data.get('amount')
 
+    values = {}
     if member_id:
-        contribution.member_id = member_id
+        values['member_id'] = member_id
     if date:
-        contribution.date = date
+        values['date'] = date
     if amount:
-        contribution.amount = amount
+        values['amount'] = amount
 
-    db.session.commit()
+    member_ids = update_member_record(Contribution, contribution_id, values)
+    if not member_ids:
+        return jsonify({"msg": "Contribution not found"}), 404
+    response_cache.invalidate(Contribution, *member_ids)
 
     return jsonify({"msg": "Contribution record updated successfully"}), 200
 
@@ -310,17 +515,69 @@ def delete_contribution(contribution_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    contribution = Contribution.query.get(contribution_id)
-
-    if not contribution:
+    deleted = delete_by_id(Contribution, contribution_id, Contribution.member_id)
+    if not deleted:
         return jsonify({"msg": "Contribution not found"}), 404
-
-    db.session.delete(contribution)
-    db.session.commit()
+    response_cache.invalidate(Contribution, deleted.member_id)
 
     return jsonify({"msg": "Contribution record deleted successfully"}), 200
 
 
+@contribution_bp.route('/contribution/bulk', methods=['DELETE', 'OPTIONS'])
+@swag_from({
+    'tags': ['Contribution'],
+    'description': 'Delete many contributions in one statement',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                    'filter': {
+                        'type': 'object',
+                        'description': 'Select rows by any of date, date_from, date_to, member_id',
+                        'properties': {
+                            'date': {'type': 'string', 'format': 'date'},
+                            'date_from': {'type': 'string', 'format': 'date'},
+                            'date_to': {'type': 'string', 'format': 'date'},
+                            'member_id': {'type': 'integer'}
+                        }
+                    }
+                },
+                'example': {'ids': [11, 12, 13]}
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Contribution records deleted successfully',
+            'examples': {
+                'application/json': {'msg': 'Contribution records deleted successfully', 'count': 12}
+            }
+        },
+        400: {
+            'description': 'Bad Request',
+            'examples': {
+                'application/json': {'msg': "Provide 'ids' or at least one 'filter' condition"}
+            }
+        }
+    }
+})
+@role_required('admin')
+def bulk_delete_contributions():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    count, member_ids = bulk_delete(Contribution, bulk_criteria(Contribution, request.get_json(silent=True)))
+    response_cache.invalidate(Contribution, *member_ids)
+
+    return jsonify({"msg": "Contribution records deleted successfully", "count": count}), 200
+
+
 @contribution_bp.route('/contribution/my', methods=['GET'])
 @swag_from({ 
     'tags': ['Contribution'],
@@ -368,8 +625,9 @@ def delete_contribution(contribution_id):
         }
     }
 })
-@jwt_required()
 @role_required('admin', 'member')
+@conditional_get(Contribution)
+@response_cache.per_member(Contribution)
 def get_my_contributions():
     # get logged-in user id from JWT
     member_id = get_jwt_identity()  # JWT stores member.id
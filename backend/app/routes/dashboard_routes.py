@@ -0,0 +1,213 @@
+from datetime import datetime
+from decimal import Decimal
+from flask import Blueprint, request, jsonify
+from sqlalchemy import func
+from app import db
+from app.models.attendance import Attendance, ATTENDED_STATUSES
+from app.models.fines import Fine
+from app.models.loans import Loan
+from app.models.members import Member
+from app.models.member_monthly_rollup import MemberMonthlyRollup
+from flasgger.utils import swag_from
+from app.utils.auth_helpers import role_required
+from app.utils.pagination import InvalidListRequest
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+
+@dashboard_bp.route('/dashboard/summary', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Dashboard'],
+    'description': 'Totals for the admin dashboard, aggregated in the database',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Dashboard summary',
+            'examples': {
+                'application/json': {
+                    'members': {'active': 38},
+                    'contributions': {
+                        'total': '152000.00',
+                        'count': 412,
+                        'by_month': [{'month': '2026-09', 'total': '19000.00', 'count': 38}]
+                    },
+                    'fines': {
+                        'outstanding': {'total': '1200.00', 'count': 6},
+                        'paid': {'total': '3400.00', 'count': 17}
+                    },
+                    'loans': {
+                        'active': {'total': '85000.00', 'count': 5},
+                        'paid': {'total': '40000.00', 'count': 3}
+                    },
+                    'attendance': {
+                        'total': 760,
+                        'attended': 701,
+                        'by_status': {'present': 650, 'late': 51, 'absent': 59},
+                        'rate': 0.9224
+                    }
+                }
+            }
+        }
+    }
+})
+@role_required('admin')
+def get_dashboard_summary():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    active_members = db.session.query(func.count(Member.id)).filter(Member.role != 'disabled').scalar()
+
+    # Contributions: overall and per calendar month, from the monthly rollups
+    by_month = db.session.query(
+        MemberMonthlyRollup.month,
+        func.sum(MemberMonthlyRollup.contribution_total),
+        func.sum(MemberMonthlyRollup.contribution_count)
+    ).group_by(MemberMonthlyRollup.month) \
+        .having(func.sum(MemberMonthlyRollup.contribution_count) > 0) \
+        .order_by(MemberMonthlyRollup.month).all()
+
+    contribution_total = sum((row[1] for row in by_month), Decimal(0))
+    contribution_count = sum(row[2] for row in by_month)
+
+    # Fines and loans: one GROUP BY status each, folded into paid vs. still owed
+    def split_by_status(model, open_key):
+        totals = {open_key: {'total': Decimal(0), 'count': 0}, 'paid': {'total': Decimal(0), 'count': 0}}
+        rows = db.session.query(model.status, func.sum(model.amount), func.count(model.id)) \
+            .group_by(model.status).all()
+        for status, amount, count in rows:
+            bucket = totals['paid' if status == 'paid' else open_key]
+            bucket['total'] += amount or 0
+            bucket['count'] += count
+        return totals
+
+    fines = split_by_status(Fine, 'outstanding')
+    loans = split_by_status(Loan, 'active')
+
+    # Attendance
+    attendance_by_status = dict(
+        db.session.query(Attendance.status, func.count(Attendance.id)).group_by(Attendance.status).all()
+    )
+    attendance_total = sum(attendance_by_status.values())
+    attended = sum(count for status, count in attendance_by_status.items() if status in ATTENDED_STATUSES)
+
+    return jsonify({
+        'members': {'active': active_members},
+        'contributions': {
+            'total': contribution_total,
+            'count': contribution_count,
+            'by_month': [
+                {'month': month.strftime('%Y-%m'), 'total': total, 'count': count}
+                for month, total, count in by_month
+            ]
+        },
+        'fines': fines,
+        'loans': loans,
+        'attendance': {
+            'total': attendance_total,
+            'attended': attended,
+            'by_status': attendance_by_status,
+            'rate': round(attended / attendance_total, 4) if attendance_total else 0.0
+        }
+    }), 200
+
+
+def month_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise InvalidListRequest(f"'{name}' must be a month formatted YYYY-MM")
+
+
+@dashboard_bp.route('/dashboard/monthly', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Dashboard'],
+    'description': 'Per-month contribution, fine and attendance totals for trend charts and year-end '
+                   'reports, read from the member_monthly_rollups table',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'from',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'First month to include (YYYY-MM)'
+        },
+        {
+            'name': 'to',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Last month to include (YYYY-MM)'
+        },
+        {
+            'name': 'member_id',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Only include this member'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'One entry per month that has activity, oldest first',
+            'examples': {
+                'application/json': [
+                    {
+                        'month': '2026-09',
+                        'contributions': {'total': '19000.00', 'count': 38},
+                        'fines': {'total': '600.00', 'count': 3},
+                        'attendance': {'total': 76, 'attended': 70, 'rate': 0.9211}
+                    }
+                ]
+            }
+        },
+        400: {
+            'description': 'Invalid filter',
+            'examples': {
+                'application/json': {"msg": "'from' must be a month formatted YYYY-MM"}
+            }
+        }
+    }
+})
+@role_required('admin')
+def get_monthly_trends():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    rollup = MemberMonthlyRollup
+    query = db.session.query(
+        rollup.month,
+        func.sum(rollup.contribution_total), func.sum(rollup.contribution_count),
+        func.sum(rollup.fine_total), func.sum(rollup.fine_count),
+        func.sum(rollup.attendance_total), func.sum(rollup.attendance_attended)
+    ).group_by(rollup.month).order_by(rollup.month)
+
+    month_from, month_to = month_arg('from'), month_arg('to')
+    if month_from:
+        query = query.filter(rollup.month >= month_from)
+    if month_to:
+        query = query.filter(rollup.month <= month_to)
+    member_id = request.args.get('member_id')
+    if member_id:
+        try:
+            query = query.filter(rollup.member_id == int(member_id))
+        except ValueError:
+            raise InvalidListRequest("'member_id' must be an integer")
+
+    return jsonify([
+        {
+            'month': month.strftime('%Y-%m'),
+            'contributions': {'total': contribution_total, 'count': contribution_count},
+            'fines': {'total': fine_total, 'count': fine_count},
+            'attendance': {
+                'total': attendance_total,
+                'attended': attended,
+                'rate': round(attended / attendance_total, 4) if attendance_total else 0.0
+            }
+        }
+        for month, contribution_total, contribution_count, fine_total, fine_count, attendance_total, attended
+        in query.all()
+    ]), 200
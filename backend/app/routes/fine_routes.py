@@ -1,11 +1,24 @@
+from datetime import date
 from flask import Blueprint, request, jsonify
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
 from app import db
 from app.models.fines import Fine
 from flasgger.utils import swag_from
 from app.utils.auth_helpers import role_required
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.pagination import json_page, page_response
+from app.utils.list_filters import apply_list_filters
+from app.utils.export import export_response
+from app.utils.writes import bulk_criteria, bulk_update, update_member_record, delete_by_id
+from app.utils.response_cache import response_cache
+from app.utils.table_versions import conditional_get
+from app.utils.fine_rules import apply_fine_rules, configured_rules
+from flask_jwt_extended import get_jwt_identity
 from app.models.members import Member
 
+# The columns of Fine.to_dict(), read directly by the list and export endpoints
+FINE_COLUMNS = (Fine.id, Fine.member_id, Fine.amount, Fine.date, Fine.status, Fine.reason, Fine.rule_id, Fine.period)
+
 fine_bp = Blueprint('fine', __name__) 
 
 @fine_bp.route('/fine', methods=['POST', 'OPTIONS'])
@@ -73,6 +86,7 @@ def record_fine():
 
     db.session.add(fine)
     db.session.commit()
+    response_cache.invalidate(Fine, member_id)
 
     return jsonify({"msg": "Fine recorded successfully"}), 201
 
@@ -132,6 +146,8 @@ def record_fine():
     }
 })
 @role_required('admin', 'member')
+@conditional_get(Fine)
+@response_cache.per_member(Fine)
 def get_fine_records(member_id):
     if request.method == 'OPTIONS':
         return '', 200
@@ -150,6 +166,73 @@ def get_fine_records(member_id):
     'tags': ['Fine'],
     'description': 'Get all fine records',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'name': 'after',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Cursor from the X-Next-Cursor header of the previous page'
+        },
+        {
+            'name': 'all',
+            'in': 'query',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Return every record in one unpaged response'
+        },
+        {
+            'name': 'date_from',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or after this date'
+        },
+        {
+            'name': 'date_to',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or before this date'
+        },
+        {
+            'name': 'member_id',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Only records for this member'
+        },
+        {
+            'name': 'status',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Only records with this status (comma separated for several)'
+        },
+        {
+            'name': 'min_amount',
+            'in': 'query',
+            'required': False,
+            'type': 'number',
+            'description': 'Only records with at least this amount'
+        },
+        {
+            'name': 'max_amount',
+            'in': 'query',
+            'required': False,
+            'type': 'number',
+            'description': 'Only records with at most this amount'
+        }
+    ],
     'responses': {
         200: {
             'description': 'Fine records retrieved successfully',
@@ -185,14 +268,50 @@ def get_fine_records(member_id):
     }
 })
 @role_required('admin')
+@conditional_get(Fine)
 def get_all_fines():
     if request.method == 'OPTIONS':
         return '', 200
     
-    # Query all Fine records
-    fines = Fine.query.all()
+    # Query one page of the matching Fine records, newest first
+    # Only the listed columns; on Postgres the database writes the JSON body (see json_page)
+    body, next_cursor = json_page(apply_list_filters(select(*FINE_COLUMNS), Fine), Fine.date, Fine.id)
+
+    return page_response(body, next_cursor)
+
+
+# Export fines as a stream
+@fine_bp.route('/fine/export', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Fine'],
+    'description': 'Stream every matching fine record as CSV or NDJSON. Accepts the same filters as GET /fine.',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'format',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'enum': ['csv', 'ndjson'],
+            'default': 'csv'
+        }
+    ],
+    'produces': ['text/csv', 'application/x-ndjson'],
+    'responses': {
+        200: {
+            'description': 'Fine records streamed as an attachment'
+        }
+    }
+})
+@role_required('admin')
+def export_fines():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    query = apply_list_filters(db.session.query(*FINE_COLUMNS), Fine).order_by(Fine.date, Fine.id)
+
+    return export_response(query, FINE_COLUMNS, 'fines')
 
-    return jsonify([fine.to_dict() for fine in fines]), 200
 
 # Edit a fine
 @fine_bp.route('/fine/<int:fine_id>', methods=['PUT', 'OPTIONS'])
@@ -257,33 +376,193 @@ def edit_fine(fine_id):
      
     data = request.get_json()
 
-    fine = Fine.query.get(fine_id)
-
-    if not fine:
-        return jsonify({"msg": "Fine not found"}), 404
-
     member_id = data.get('member_id')
     date = data.get('date')
     amount = data.get('amount')
     status=data.get("status", "pending")
     reason=data.get('reason')
 
+    values = {}
     if member_id:
-        fine.member_id = member_id
+        values['member_id'] = member_id
     if date:
-        fine.date = date
+        values['date'] = date
     if amount:
-        fine.amount = amount
+        values['amount'] = amount
     if status:
-        fine.status = status
+        values['status'] = status
     if reason is not None:
-        fine.reason = reason
+        values['reason'] = reason
 
-    db.session.commit()
+    member_ids = update_member_record(Fine, fine_id, values)
+    if not member_ids:
+        return jsonify({"msg": "Fine not found"}), 404
+    response_cache.invalidate(Fine, *member_ids)
 
     return jsonify({"msg": "Fine record updated successfully"}), 200
 
 
+@fine_bp.route('/fine/bulk', methods=['PATCH', 'OPTIONS'])
+@swag_from({
+    'tags': ['Fine'],
+    'description': 'Update many fines in one statement, e.g. mark a list of fines paid',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                    'filter': {
+                        'type': 'object',
+                        'description': 'Select rows by any of date, date_from, date_to, member_id, status',
+                        'properties': {
+                            'date': {'type': 'string', 'format': 'date'},
+                            'date_from': {'type': 'string', 'format': 'date'},
+                            'date_to': {'type': 'string', 'format': 'date'},
+                            'member_id': {'type': 'integer'},
+                            'status': {'type': 'string'}
+                        }
+                    },
+                    'status': {'type': 'string'},
+                    'reason': {'type': 'string'}
+                },
+                'example': {'ids': [4, 7, 9], 'status': 'paid'}
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Fine records updated successfully',
+            'examples': {
+                'application/json': {'msg': 'Fine records updated successfully', 'count': 12}
+            }
+        },
+        400: {
+            'description': 'Bad Request',
+            'examples': {
+                'application/json': {'msg': "Provide 'ids' or at least one 'filter' condition"}
+            }
+        }
+    }
+})
+@role_required('admin')
+def bulk_update_fines():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    data = request.get_json(silent=True)
+    criteria = bulk_criteria(Fine, data)
+    values = {key: data[key] for key in ('status', 'reason') if key in data}
+    if not values:
+        return jsonify({"msg": "Nothing to update: provide status and/or reason"}), 400
+    for key, value in values.items():
+        if not isinstance(value, str) or not value.strip():
+            return jsonify({"msg": f"{key} must be a non-empty string"}), 400
+
+    count, member_ids = bulk_update(Fine, criteria, values)
+    response_cache.invalidate(Fine, *member_ids)
+
+    return jsonify({"msg": "Fine records updated successfully", "count": count}), 200
+
+
+@fine_bp.route('/fine/rules', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Fine'],
+    'description': 'List the configured automatic fine rules',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Configured fine rules',
+            'examples': {
+                'application/json': [
+                    {'id': 'absent', 'kind': 'attendance', 'amount': '100.00', 'reason': 'Absent from meeting',
+                     'statuses': ['absent'], 'due_day': None},
+                    {'id': 'no_contribution', 'kind': 'missing_contribution', 'amount': '200.00',
+                     'reason': 'No contribution by the 5th', 'statuses': [], 'due_day': 5}
+                ]
+            }
+        }
+    }
+})
+@role_required('admin')
+def get_fine_rules():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    return jsonify([rule._asdict() for rule in configured_rules().values()]), 200
+
+
+@fine_bp.route('/fine/rules/apply', methods=['POST', 'OPTIONS'])
+@swag_from({
+    'tags': ['Fine'],
+    'description': 'Generate the fines the configured rules produce for a period. Safe to rerun: a rule '
+                   'fines a member at most once per period.',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'date_from': {'type': 'string', 'format': 'date'},
+                    'date_to': {'type': 'string', 'format': 'date'},
+                    'rules': {'type': 'array', 'items': {'type': 'string'},
+                              'description': 'Rule ids to apply (default: all)'},
+                    'dry_run': {'type': 'boolean'}
+                },
+                'required': ['date_from', 'date_to']
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Fines generated (or, for a dry run, the fines that would be)',
+            'examples': {
+                'application/json': {
+                    'dry_run': False,
+                    'count': 1,
+                    'fines': [{'rule_id': 'absent', 'member_id': 4, 'period': '2026-10-04',
+                               'date': '2026-10-04', 'amount': '100.00', 'reason': 'Absent from meeting'}]
+                }
+            }
+        },
+        400: {
+            'description': 'Bad Request',
+            'examples': {
+                'application/json': {'msg': 'Unknown fine rule(s): lateness'}
+            }
+        }
+    }
+})
+@role_required('admin')
+def apply_fines():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    data = request.get_json(silent=True) or {}
+    try:
+        date_from = date.fromisoformat(data.get('date_from') or '')
+        date_to = date.fromisoformat(data.get('date_to') or '')
+    except (TypeError, ValueError):
+        return jsonify({"msg": "date_from and date_to are required, in YYYY-MM-DD format"}), 400
+    rule_ids = data.get('rules')
+    if rule_ids is not None and not (isinstance(rule_ids, list) and all(isinstance(r, str) for r in rule_ids)):
+        return jsonify({"msg": "rules must be a list of rule ids"}), 400
+    dry_run = bool(data.get('dry_run'))
+
+    fines = apply_fine_rules(date_from, date_to, rule_ids, dry_run=dry_run)
+    if not dry_run:
+        response_cache.invalidate(Fine, *{fine['member_id'] for fine in fines})
+
+    return jsonify({"dry_run": dry_run, "count": len(fines), "fines": fines}), 200
+
+
 # Delete a fine
 @fine_bp.route('/fine/<int:fine_id>', methods=['DELETE', 'OPTIONS'])
 @swag_from({
@@ -314,6 +593,14 @@ def edit_fine(fine_id):
                     'msg': 'Fine not found'
                 }
             }
+        },
+        409: {
+            'description': 'Fine has payments allocated to it',
+            'examples': {
+                'application/json': {
+                    'msg': 'Fine has payments allocated to it and cannot be deleted'
+                }
+            }
         }
     }
 })
@@ -322,13 +609,14 @@ def delete_fine(fine_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    fine = Fine.query.get(fine_id)
-
-    if not fine:
+    try:
+        deleted = delete_by_id(Fine, fine_id, Fine.member_id)
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"msg": "Fine has payments allocated to it and cannot be deleted"}), 409
+    if not deleted:
         return jsonify({"msg": "Fine not found"}), 404
-
-    db.session.delete(fine)
-    db.session.commit()
+    response_cache.invalidate(Fine, deleted.member_id)
 
     return jsonify({"msg": "Fine record deleted successfully"}), 200
 
@@ -380,8 +668,9 @@ def delete_fine(fine_id):
         }
     }
 })
-@jwt_required()
 @role_required('admin', 'member')
+@conditional_get(Fine)
+@response_cache.per_member(Fine)
 def get_my_fines():
     # get logged-in user id from JWT
     member_id = get_jwt_identity()  # JWT stores member.id
@@ -1,13 +1,43 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, select
 from app import db
 from app.models.loans import Loan
 from flasgger.utils import swag_from
 from app.utils.auth_helpers import role_required
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.pagination import json_page, page_response
+from app.utils.list_filters import apply_list_filters
+from app.utils.export import export_response
+from app.utils.writes import bulk_criteria, bulk_update, update_member_record, delete_by_id
+from app.utils.response_cache import response_cache
+from app.utils.table_versions import conditional_get
+from app.utils.amortization import load_loan_book, loan_schedule, project_portfolio
+from app.utils.member_cache import member_cache
+from flask_jwt_extended import get_jwt_identity
 from app.models.members import Member
 
+# The columns of Loan.to_dict(), read directly by the list and export endpoints
+LOAN_COLUMNS = (Loan.id, Loan.member_id, Loan.amount, Loan.date, Loan.status, Loan.interest_rate, Loan.term_months)
+
 loan_bp = Blueprint('loan', __name__) 
 
+
+def loan_terms(data):
+    """Validate the optional interest_rate / term_months fields; return (values, error message)."""
+    values = {}
+    if data.get('interest_rate') is not None:
+        rate = data['interest_rate']
+        if not isinstance(rate, (int, float)) or isinstance(rate, bool) or not 0 <= rate < 1:
+            return None, "interest_rate must be an annual rate between 0 and 1, e.g. 0.12"
+        values['interest_rate'] = rate
+    if data.get('term_months') is not None:
+        term = data['term_months']
+        if not isinstance(term, int) or isinstance(term, bool) or not 1 <= term <= 360:
+            return None, "term_months must be a whole number of months between 1 and 360"
+        values['term_months'] = term
+    return values, None
+
+
 @loan_bp.route('/loan', methods=['POST', 'OPTIONS'])
 @swag_from({
     'tags': ['Loan'],
@@ -23,7 +53,10 @@ loan_bp = Blueprint('loan', __name__)
                 'properties': {
                     'member_id': {'type': 'integer'},
                     'date': {'type': 'string', 'format': 'date'},
-                    'amount': {'type': 'number', 'format': 'float'}
+                    'amount': {'type': 'number', 'format': 'float'},
+                    'interest_rate': {'type': 'number', 'format': 'float',
+                                      'description': 'Annual rate, e.g. 0.12 for 12% (default from config)'},
+                    'term_months': {'type': 'integer', 'description': 'Repayment term (default from config)'}
                 },
                 'required': ['member_id', 'date', 'amount']
             }
@@ -64,12 +97,16 @@ def record_loan():
 
     if not member_id or not date or not amount or not status:
         return jsonify({"msg": "Missing required fields: member_id, date, status or amount"}), 400
+    terms, error = loan_terms(data)
+    if error:
+        return jsonify({"msg": error}), 400
 
     # Create a new Loan record
-    loan = Loan(member_id=member_id, date=date, amount=amount, status=status)
+    loan = Loan(member_id=member_id, date=date, amount=amount, status=status, **terms)
 
     db.session.add(loan)
     db.session.commit()
+    response_cache.invalidate(Loan, member_id)
 
     return jsonify({"msg": "Loan recorded successfully"}), 201
 
@@ -129,6 +166,8 @@ def record_loan():
     }
 })
 @role_required('admin', 'member')
+@conditional_get(Loan)
+@response_cache.per_member(Loan)
 def get_loan_records(member_id):
     if request.method == 'OPTIONS':
         return '', 200
@@ -147,6 +186,73 @@ def get_loan_records(member_id):
     'tags': ['Loan'],
     'description': 'Get all loan records',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'name': 'after',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Cursor from the X-Next-Cursor header of the previous page'
+        },
+        {
+            'name': 'all',
+            'in': 'query',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Return every record in one unpaged response'
+        },
+        {
+            'name': 'date_from',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or after this date'
+        },
+        {
+            'name': 'date_to',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only records on or before this date'
+        },
+        {
+            'name': 'member_id',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Only records for this member'
+        },
+        {
+            'name': 'status',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Only records with this status (comma separated for several)'
+        },
+        {
+            'name': 'min_amount',
+            'in': 'query',
+            'required': False,
+            'type': 'number',
+            'description': 'Only records with at least this amount'
+        },
+        {
+            'name': 'max_amount',
+            'in': 'query',
+            'required': False,
+            'type': 'number',
+            'description': 'Only records with at most this amount'
+        }
+    ],
     'responses': {
         200: {
             'description': 'Loan records retrieved successfully',
@@ -182,11 +288,47 @@ def get_loan_records(member_id):
     }
 })
 @role_required('admin', 'secretary')
+@conditional_get(Loan)
 def get_all_loans():
-    # Query all Loan records
-    loans = Loan.query.all()
+    # Query one page of the matching Loan records, newest first
+    # Only the listed columns; on Postgres the database writes the JSON body (see json_page)
+    body, next_cursor = json_page(apply_list_filters(select(*LOAN_COLUMNS), Loan), Loan.date, Loan.id)
+
+    return page_response(body, next_cursor)
+
+
+# Export loans as a stream
+@loan_bp.route('/loan/export', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Loan'],
+    'description': 'Stream every matching loan record as CSV or NDJSON. Accepts the same filters as GET /loan.',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'format',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'enum': ['csv', 'ndjson'],
+            'default': 'csv'
+        }
+    ],
+    'produces': ['text/csv', 'application/x-ndjson'],
+    'responses': {
+        200: {
+            'description': 'Loan records streamed as an attachment'
+        }
+    }
+})
+@role_required('admin')
+def export_loans():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    query = apply_list_filters(db.session.query(*LOAN_COLUMNS), Loan).order_by(Loan.date, Loan.id)
+
+    return export_response(query, LOAN_COLUMNS, 'loans')
 
-    return jsonify([loan.to_dict() for loan in loans]), 200
 
 # Edit a loan
 @loan_bp.route('/loan/<int:loan_id>', methods=['PUT', 'OPTIONS'])
@@ -210,7 +352,9 @@ def get_all_loans():
                 'properties': {
                     'member_id': {'type': 'integer'},
                     'date': {'type': 'string', 'format': 'date'},
-                    'amount': {'type': 'number', 'format': 'float'}
+                    'amount': {'type': 'number', 'format': 'float'},
+                    'interest_rate': {'type': 'number', 'format': 'float'},
+                    'term_months': {'type': 'integer'}
                 }
             }
         }
@@ -249,30 +393,211 @@ def edit_loan(loan_id):
       
     data = request.get_json()
 
-    loan = Loan.query.get(loan_id)
-
-    if not loan:
-        return jsonify({"msg": "Loan not found"}), 404
-
     member_id = data.get('member_id')
     date = data.get('date')
     amount = data.get('amount')
     status = data.get('status')
 
+    values = {}
     if member_id:
-        loan.member_id = member_id
+        values['member_id'] = member_id
     if date:
-        loan.date = date
+        values['date'] = date
     if amount:
-        loan.amount = amount
+        values['amount'] = amount
     if status:
-        loan.status = status
+        values['status'] = status
+    terms, error = loan_terms(data)
+    if error:
+        return jsonify({"msg": error}), 400
+    values.update(terms)
 
-    db.session.commit()
+    member_ids = update_member_record(Loan, loan_id, values)
+    if not member_ids:
+        return jsonify({"msg": "Loan not found"}), 404
+    response_cache.invalidate(Loan, *member_ids)
 
     return jsonify({"msg": "Loan record updated successfully"}), 200
 
 
+@loan_bp.route('/loan/bulk', methods=['PATCH', 'OPTIONS'])
+@swag_from({
+    'tags': ['Loan'],
+    'description': 'Update the status of many loans in one statement',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                    'filter': {
+                        'type': 'object',
+                        'description': 'Select rows by any of date, date_from, date_to, member_id, status',
+                        'properties': {
+                            'date': {'type': 'string', 'format': 'date'},
+                            'date_from': {'type': 'string', 'format': 'date'},
+                            'date_to': {'type': 'string', 'format': 'date'},
+                            'member_id': {'type': 'integer'},
+                            'status': {'type': 'string'}
+                        }
+                    },
+                    'status': {'type': 'string'}
+                },
+                'example': {'ids': [2, 3], 'status': 'paid'}
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Loan records updated successfully',
+            'examples': {
+                'application/json': {'msg': 'Loan records updated successfully', 'count': 12}
+            }
+        },
+        400: {
+            'description': 'Bad Request',
+            'examples': {
+                'application/json': {'msg': "Provide 'ids' or at least one 'filter' condition"}
+            }
+        }
+    }
+})
+@role_required('admin')
+def bulk_update_loans():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    data = request.get_json(silent=True)
+    criteria = bulk_criteria(Loan, data)
+    status = data.get('status')
+    if not isinstance(status, str) or not status:
+        return jsonify({"msg": "Missing required field: status"}), 400
+
+    count, member_ids = bulk_update(Loan, criteria, {'status': status})
+    response_cache.invalidate(Loan, *member_ids)
+
+    return jsonify({"msg": "Loan records updated successfully", "count": count}), 200
+
+
+@loan_bp.route('/loan/<int:loan_id>/schedule', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Loan'],
+    'description': 'Repayment schedule of one loan, with the interest accrued and the balance scheduled as of today',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'loan_id',
+            'in': 'path',
+            'required': True,
+            'type': 'integer'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Loan schedule',
+            'examples': {
+                'application/json': {
+                    'loan_id': 3, 'member_id': 7, 'principal': '12000.00', 'annual_rate': 0.12,
+                    'term_months': 3, 'method': 'reducing', 'start_date': '2026-08-15',
+                    'payoff_date': '2026-11-15', 'total_interest': '240.80', 'total_repayable': '12240.80',
+                    'as_of': '2026-10-17', 'instalments_due': 2, 'interest_accrued': '200.40',
+                    'scheduled_balance': '4039.88',
+                    'schedule': [
+                        {'period': 1, 'due_date': '2026-09-15', 'payment': '4080.27', 'principal': '3960.27',
+                         'interest': '120.00', 'balance': '8039.73'}
+                    ]
+                }
+            }
+        },
+        403: {
+            'description': 'Members can only view the schedule of their own loans',
+            'examples': {
+                'application/json': {'msg': 'You can only view your own loans'}
+            }
+        },
+        404: {
+            'description': 'Loan not found',
+            'examples': {
+                'application/json': {'msg': 'Loan not found'}
+            }
+        }
+    }
+})
+@role_required('admin', 'member')
+def get_loan_schedule(loan_id):
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    schedule = loan_schedule(loan_id)
+    if not schedule:
+        return jsonify({"msg": "Loan not found"}), 404
+
+    current_member = member_cache.get(get_jwt_identity())
+    if current_member.role != 'admin' and current_member.id != schedule['member_id']:
+        return jsonify({"msg": "You can only view your own loans"}), 403
+
+    return jsonify(schedule), 200
+
+
+@loan_bp.route('/loan/portfolio/projection', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Loan'],
+    'description': 'Project the repayments of every active (not paid) loan month by month',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'months',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'How many calendar months to project, starting with the current one (default 12, max 120)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Loan book projection',
+            'examples': {
+                'application/json': {
+                    'as_of': '2026-10-17', 'method': 'reducing', 'loans': 5,
+                    'principal': '85000.00', 'scheduled_balance': '52110.37', 'interest_accrued': '3120.55',
+                    'total_interest': '5120.90', 'overdue': {'count': 1, 'principal': '5000.00'},
+                    'payoff_date': '2027-08-01',
+                    'months': [
+                        {'month': '2026-10', 'principal_due': '6710.12', 'interest_due': '431.20',
+                         'total_due': '7141.32', 'scheduled_balance': '45400.25', 'loans_maturing': 0}
+                    ]
+                }
+            }
+        },
+        400: {
+            'description': 'Invalid months parameter',
+            'examples': {
+                'application/json': {'msg': "'months' must be between 1 and 120"}
+            }
+        }
+    }
+})
+@role_required('admin')
+def get_portfolio_projection():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    try:
+        months = int(request.args.get('months', 12))
+    except ValueError:
+        return jsonify({"msg": "'months' must be an integer"}), 400
+    if not 1 <= months <= 120:
+        return jsonify({"msg": "'months' must be between 1 and 120"}), 400
+
+    # Same notion of outstanding as member_balances: anything not marked paid
+    book = load_loan_book(func.coalesce(Loan.status, 'pending') != 'paid')
+    return jsonify(project_portfolio(book, months)), 200
+
+
 # Delete a loan
 @loan_bp.route('/loan/<int:loan_id>', methods=['DELETE', 'OPTIONS'])
 @swag_from({
@@ -303,6 +628,14 @@ def edit_loan(loan_id):
                     'msg': 'Loan not found'
                 }
             }
+        },
+        409: {
+            'description': 'Loan has payments allocated to it',
+            'examples': {
+                'application/json': {
+                    'msg': 'Loan has payments allocated to it and cannot be deleted'
+                }
+            }
         }
     }
 })
@@ -311,13 +644,14 @@ def delete_loan(loan_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    loan = Loan.query.get(loan_id)
-
-    if not loan:
+    try:
+        deleted = delete_by_id(Loan, loan_id, Loan.member_id)
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"msg": "Loan has payments allocated to it and cannot be deleted"}), 409
+    if not deleted:
         return jsonify({"msg": "Loan not found"}), 404
-
-    db.session.delete(loan)
-    db.session.commit()
+    response_cache.invalidate(Loan, deleted.member_id)
 
     return jsonify({"msg": "Loan record deleted successfully"}), 200
 
@@ -369,8 +703,9 @@ def delete_loan(loan_id):
         }
     }
 })
-@jwt_required()
 @role_required('admin', 'member')
+@conditional_get(Loan)
+@response_cache.per_member(Loan)
 def get_my_loans():
     # get logged-in user id from JWT
     member_id = get_jwt_identity()  # JWT stores member.id
@@ -1,19 +1,48 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select
 from app.models.members import Member
 from app.utils.auth_helpers import role_required
+from app.utils.pagination import json_page, page_response, InvalidListRequest
+from app.utils.member_cache import member_cache
+from app.utils.member_statement import build_member_statement
+from app.utils.writes import update_by_id
+from app.utils.response_cache import response_cache
+from app.utils.table_versions import conditional_get
 from app import db
 from flasgger.utils import swag_from
 
 member_bp = Blueprint('member', __name__)
 
 @member_bp.route('/member', methods=['GET', 'OPTIONS'])
-@jwt_required()
 @role_required('admin')
 @swag_from({
     'tags': ['Member'],
     'description': 'List all members excluding disabled accounts',
     'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'name': 'after',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Cursor from the X-Next-Cursor header of the previous page'
+        },
+        {
+            'name': 'all',
+            'in': 'query',
+            'required': False,
+            'type': 'boolean',
+            'description': 'Return every record in one unpaged response'
+        }
+    ],
     'responses': {
         200: {
             'description': 'List of members',
@@ -25,26 +54,20 @@ member_bp = Blueprint('member', __name__)
         }
     }
 })
+@conditional_get(Member)
 def get_members():
     if request.method == 'OPTIONS':
         return '', 200
         
-    members = Member.query.filter(Member.role != 'disabled').all()
+    columns = (Member.id, Member.name, Member.email, Member.phone, Member.gender, Member.role)
+    body, next_cursor = json_page(select(*columns).filter(Member.role != 'disabled'), Member.id, descending=False)
 
-    if not members:
+    if body == '[]' and not request.args.get('after'):
         return jsonify({"msg": "No members found"}), 404
 
-    return jsonify([{
-        "id": member.id,
-        "name": member.name,
-        "email": member.email,
-        "phone": member.phone,
-        "gender": member.gender,
-        "role": member.role
-    } for member in members]), 200
+    return page_response(body, next_cursor)
 
 @member_bp.route('/member/<int:member_id>', methods=['GET', 'OPTIONS'])
-@jwt_required()
 @role_required('admin', 'member') # Only admin can view member details
 @swag_from({    
     'tags': ['Member'],
@@ -77,7 +100,7 @@ def get_member(member_id):
     if request.method == 'OPTIONS':
         return '', 200
      
-    member = Member.query.get(member_id)
+    member = member_cache.get(member_id)
     if not member:
         return jsonify({"msg": "Member not found"}), 404
 
@@ -94,7 +117,6 @@ def get_member(member_id):
 
 
 @member_bp.route('/member/<int:member_id>/disabled', methods=['PATCH', 'OPTIONS'])
-@jwt_required()
 @role_required('admin')
 @swag_from({
     'tags': ['Member'],
@@ -140,20 +162,18 @@ def disable_member(member_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    member = Member.query.get(member_id)
+    # Admins are excluded in the UPDATE itself; only a miss needs a second look
+    member = update_by_id(Member, member_id, {'role': 'disabled'}, Member.name, criteria=(Member.role != 'admin',))
     if not member:
+        if db.session.query(Member.id).filter_by(id=member_id).first():
+            return jsonify({"msg": "Cannot disable an admin member"}), 403
         return jsonify({"msg": "Member not found"}), 404
 
-    if member.role == 'admin':
-        return jsonify({"msg": "Cannot disable an admin member"}), 403
-
-    member.role = 'disabled'
-    db.session.commit()
+    member_cache.invalidate(member_id)
     return jsonify({"msg": f"Member {member.name} disabled"}), 200
 
 
 @member_bp.route('/member/disabled', methods=['GET', 'OPTIONS'])
-@jwt_required()
 @role_required('admin')
 @swag_from({
     'tags': ['Member'],
@@ -175,6 +195,7 @@ def disable_member(member_id):
         }
     }
 })
+@conditional_get(Member)
 def get_disabled_members():
     if request.method == 'OPTIONS':
         return '', 200
@@ -192,7 +213,6 @@ def get_disabled_members():
     return jsonify(result), 200
 
 @member_bp.route('/member/<int:member_id>/enable', methods=['PATCH', 'OPTIONS'])
-@jwt_required()
 @role_required('admin')
 @swag_from({
     'tags': ['Member'],
@@ -238,20 +258,17 @@ def enable_member(member_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    member = Member.query.get(member_id)
+    member = update_by_id(Member, member_id, {'role': 'member'}, Member.name, criteria=(Member.role != 'admin',))
     if not member:
+        if db.session.query(Member.id).filter_by(id=member_id).first():
+            return jsonify({"msg": "Cannot enable an admin member"}), 403
         return jsonify({"msg": "Member not found"}), 404
 
-    if member.role == 'admin':
-        return jsonify({"msg": "Cannot enable an admin member"}), 403
-
-    member.role = 'member'
-    db.session.commit()
+    member_cache.invalidate(member_id)
     return jsonify({"msg": f"Member {member.name} enabled"}), 200
 
 
 @member_bp.route('/member/<int:member_id>', methods=['PATCH', 'OPTIONS'])
-@jwt_required()
 @role_required('admin', 'member') # Both admin and member can update member details
 @swag_from({
     'tags': ['Member'],
@@ -322,5 +339,200 @@ def update_member(member_id):
         member.phone = phone
 
     db.session.commit()
+    member_cache.invalidate(member_id)
     return jsonify({"msg": f"Member {member.name} updated successfully"}), 200
 
+
+
+@member_bp.route('/member/cache/stats', methods=['GET', 'OPTIONS'])
+@role_required('admin')
+@swag_from({
+    'tags': ['Member'],
+    'description': 'Hit/miss counters of the in-process member identity cache (per worker)',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Member cache statistics',
+            'examples': {
+                'application/json': {
+                    "size": 42,
+                    "maxsize": 1024,
+                    "ttl": 300,
+                    "hits": 9876,
+                    "misses": 54,
+                    "evictions": 0,
+                    "hit_rate": 0.9946
+                }
+            }
+        }
+    }
+})
+def get_member_cache_stats():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    return jsonify(member_cache.stats()), 200
+
+
+@member_bp.route('/member/cache/responses/stats', methods=['GET', 'OPTIONS'])
+@role_required('admin')
+@swag_from({
+    'tags': ['Member'],
+    'description': 'Counters of the in-process cache of per-member GET responses (/x/my and /x/<member_id>, per worker)',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Response cache statistics',
+            'examples': {
+                'application/json': {
+                    "entries": 310,
+                    "bytes": 1843200,
+                    "max_bytes": 33554432,
+                    "ttl": 300,
+                    "hits": 15230,
+                    "misses": 420,
+                    "evictions": 0,
+                    "invalidations": 57,
+                    "hit_rate": 0.9732
+                }
+            }
+        }
+    }
+})
+def get_response_cache_stats():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    return jsonify(response_cache.stats()), 200
+
+
+def statement_response(member_id):
+    try:
+        recent = int(request.args.get('recent', 10))
+    except ValueError:
+        raise InvalidListRequest("'recent' must be an integer")
+    if not 1 <= recent <= 100:
+        raise InvalidListRequest("'recent' must be between 1 and 100")
+
+    statement = build_member_statement(member_id, recent)
+    if not statement:
+        return jsonify({"msg": "Member not found"}), 404
+
+    return jsonify(statement), 200
+
+
+@member_bp.route('/member/<int:member_id>/statement', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Member'],
+    'description': 'Profile, balances, attendance rate and recent activity of one member in a single response',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'member_id',
+            'in': 'path',
+            'required': True,
+            'type': 'integer',
+            'description': 'ID of the member'
+        },
+        {
+            'name': 'recent',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'How many recent records of each kind to include (default 10, max 100)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Member statement',
+            'examples': {
+                'application/json': {
+                    'member': {'id': 1, 'name': 'john_doe', 'email': 'john@example.com', 'phone': '254700000001', 'gender': 'male', 'role': 'member'},
+                    'balance': {'member_id': 1, 'total_contributed': '12000.00', 'fines_outstanding': '200.00', 'loan_principal_outstanding': '5000.00', 'last_activity_date': '2026-10-04'},
+                    'attendance': {'total': 40, 'attended': 37, 'rate': 0.925},
+                    'recent': {
+                        'contributions': [{'id': 9, 'member_id': 1, 'amount': '1000.00', 'date': '2026-10-04'}],
+                        'fines': [],
+                        'loans': [],
+                        'attendances': [{'id': 31, 'member_id': 1, 'date': '2026-10-04', 'status': 'present'}]
+                    }
+                }
+            }
+        },
+        403: {
+            'description': 'Members can only view their own statement',
+            'examples': {
+                'application/json': {"msg": "You can only view your own statement"}
+            }
+        },
+        404: {
+            'description': 'Member not found',
+            'examples': {
+                'application/json': {"msg": "Member not found"}
+            }
+        }
+    }
+})
+@role_required('admin', 'member')
+def get_member_statement(member_id):
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    current_member = member_cache.get(get_jwt_identity())
+    if current_member.role != 'admin' and current_member.id != member_id:
+        return jsonify({"msg": "You can only view your own statement"}), 403
+
+    return statement_response(member_id)
+
+
+@member_bp.route('/member/me/statement', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Member'],
+    'description': 'Statement of the logged-in member',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'recent',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'How many recent records of each kind to include (default 10, max 100)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Member statement',
+            'examples': {
+                'application/json': {
+                    'member': {'id': 1, 'name': 'john_doe', 'email': 'john@example.com', 'phone': '254700000001', 'gender': 'male', 'role': 'member'},
+                    'balance': {'member_id': 1, 'total_contributed': '12000.00', 'fines_outstanding': '200.00', 'loan_principal_outstanding': '5000.00', 'last_activity_date': '2026-10-04'},
+                    'attendance': {'total': 40, 'attended': 37, 'rate': 0.925},
+                    'recent': {
+                        'contributions': [{'id': 9, 'member_id': 1, 'amount': '1000.00', 'date': '2026-10-04'}],
+                        'fines': [],
+                        'loans': [],
+                        'attendances': [{'id': 31, 'member_id': 1, 'date': '2026-10-04', 'status': 'present'}]
+                    }
+                }
+            }
+        },
+        403: {
+            'description': 'Members can only view their own statement',
+            'examples': {
+                'application/json': {"msg": "You can only view your own statement"}
+            }
+        },
+        404: {
+            'description': 'Member not found',
+            'examples': {
+                'application/json': {"msg": "Member not found"}
+            }
+        }
+    }
+})
+@role_required('admin', 'member')
+def get_my_statement():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    return statement_response(get_jwt_identity())
@@ -0,0 +1,303 @@
+from flask import Blueprint, request, jsonify
+from app import db
+from app.models.payment import Payment, PaymentAllocation
+from flasgger.utils import swag_from
+from app.utils.auth_helpers import role_required
+from app.utils.pagination import keyset_paginate, page_response
+from app.utils.list_filters import apply_list_filters
+from app.utils.member_cache import member_cache
+from app.utils.payments import (
+    CALLBACK_HEADER, PaymentCallbackError, callback_authorized, parse_callback, record_payment, reconcile_payments
+)
+from flask_jwt_extended import get_jwt_identity
+
+payment_bp = Blueprint('payment', __name__)
+
+
+# Payment notification from the mobile-money provider (M-Pesa C2B confirmation)
+@payment_bp.route('/payment/callback', methods=['POST', 'OPTIONS'])
+@swag_from({
+    'tags': ['Payment'],
+    'description': 'Receive a payment notification from the mobile-money provider. '
+                   'Authenticated with the shared secret in the X-Callback-Token header, not a JWT. '
+                   'Repeated notifications for the same TransID are acknowledged and ignored.',
+    'parameters': [
+        {
+            'name': CALLBACK_HEADER,
+            'in': 'header',
+            'required': True,
+            'type': 'string'
+        },
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'TransID': {'type': 'string'},
+                    'TransTime': {'type': 'string', 'example': '20261017093015'},
+                    'TransAmount': {'type': 'string'},
+                    'MSISDN': {'type': 'string'},
+                    'BillRefNumber': {'type': 'string', 'description': 'Optional: FINE-<id> or LOAN-<id> to pay that debt first'}
+                },
+                'required': ['TransID', 'TransTime', 'TransAmount', 'MSISDN'],
+                'example': {
+                    'TransID': 'RKTQDM7W6S',
+                    'TransTime': '20261017093015',
+                    'TransAmount': '500.00',
+                    'MSISDN': '254712345678',
+                    'BillRefNumber': 'FINE-12'
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Notification accepted',
+            'examples': {
+                'application/json': {'ResultCode': 0, 'ResultDesc': 'Accepted'}
+            }
+        },
+        400: {
+            'description': 'Invalid notification',
+            'examples': {
+                'application/json': {'msg': "'TransAmount' must be a positive amount with at most two decimal places"}
+            }
+        },
+        401: {
+            'description': 'Missing or wrong callback token',
+            'examples': {
+                'application/json': {'msg': 'Invalid callback token'}
+            }
+        }
+    }
+})
+def payment_callback():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    if not callback_authorized(request.headers.get(CALLBACK_HEADER)):
+        return jsonify({"msg": "Invalid callback token"}), 401
+
+    try:
+        values = parse_callback(request.get_json(silent=True))
+    except PaymentCallbackError as error:
+        return jsonify({"msg": str(error)}), 400
+
+    record_payment(values)
+    return jsonify({"ResultCode": 0, "ResultDesc": "Accepted"}), 200
+
+
+@payment_bp.route('/payment', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Payment'],
+    'description': 'Get all received payments, newest first',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Page size (default 100, max 1000)'
+        },
+        {
+            'name': 'after',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'Cursor from the X-Next-Cursor header of the previous page'
+        },
+        {
+            'name': 'date_from',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only payments on or after this date'
+        },
+        {
+            'name': 'date_to',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'format': 'date',
+            'description': 'Only payments on or before this date'
+        },
+        {
+            'name': 'member_id',
+            'in': 'query',
+            'required': False,
+            'type': 'integer',
+            'description': 'Only payments from this member'
+        },
+        {
+            'name': 'status',
+            'in': 'query',
+            'required': False,
+            'type': 'string',
+            'description': 'unmatched, unallocated, partial or allocated (comma separated for several)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Payments retrieved successfully',
+            'examples': {
+                'application/json': [
+                    {
+                        'id': 1,
+                        'provider_ref': 'RKTQDM7W6S',
+                        'phone': '254712345678',
+                        'account_ref': 'FINE-12',
+                        'amount': '500.00',
+                        'allocated_amount': '500.00',
+                        'date': '2026-10-17',
+                        'member_id': 4,
+                        'status': 'allocated'
+                    }
+                ]
+            }
+        }
+    }
+})
+@role_required('admin')
+def get_all_payments():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    payments, next_cursor = keyset_paginate(apply_list_filters(Payment.query, Payment), Payment.date, Payment.id)
+
+    return page_response([payment.to_dict() for payment in payments], next_cursor)
+
+
+@payment_bp.route('/payment/my', methods=['GET'])
+@swag_from({
+    'tags': ['Payment'],
+    'description': 'Get the payments of the logged-in member',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Payments retrieved successfully',
+            'examples': {
+                'application/json': [
+                    {
+                        'id': 1,
+                        'provider_ref': 'RKTQDM7W6S',
+                        'phone': '254712345678',
+                        'account_ref': None,
+                        'amount': '500.00',
+                        'allocated_amount': '300.00',
+                        'date': '2026-10-17',
+                        'member_id': 4,
+                        'status': 'partial'
+                    }
+                ]
+            }
+        }
+    }
+})
+@role_required('admin', 'member')
+def get_my_payments():
+    member_id = get_jwt_identity()
+
+    payments = Payment.query.filter_by(member_id=member_id).order_by(Payment.date.desc(), Payment.id.desc()).all()
+
+    return jsonify([payment.to_dict() for payment in payments]), 200
+
+
+@payment_bp.route('/payment/<int:payment_id>', methods=['GET', 'OPTIONS'])
+@swag_from({
+    'tags': ['Payment'],
+    'description': 'Get one payment with the fines and loans it was applied to',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'payment_id',
+            'in': 'path',
+            'required': True,
+            'type': 'integer'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Payment retrieved successfully',
+            'examples': {
+                'application/json': {
+                    'id': 1,
+                    'provider_ref': 'RKTQDM7W6S',
+                    'phone': '254712345678',
+                    'account_ref': None,
+                    'amount': '500.00',
+                    'allocated_amount': '500.00',
+                    'date': '2026-10-17',
+                    'member_id': 4,
+                    'status': 'allocated',
+                    'allocations': [
+                        {'id': 1, 'payment_id': 1, 'fine_id': 12, 'loan_id': None, 'amount': '100.00'},
+                        {'id': 2, 'payment_id': 1, 'fine_id': None, 'loan_id': 3, 'amount': '400.00'}
+                    ]
+                }
+            }
+        },
+        403: {
+            'description': 'Members can only view their own payments',
+            'examples': {
+                'application/json': {'msg': 'You can only view your own payments'}
+            }
+        },
+        404: {
+            'description': 'Payment not found',
+            'examples': {
+                'application/json': {'msg': 'Payment not found'}
+            }
+        }
+    }
+})
+@role_required('admin', 'member')
+def get_payment(payment_id):
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    payment = db.session.get(Payment, payment_id)
+    if not payment:
+        return jsonify({"msg": "Payment not found"}), 404
+
+    current_member = member_cache.get(get_jwt_identity())
+    if current_member.role != 'admin' and current_member.id != payment.member_id:
+        return jsonify({"msg": "You can only view your own payments"}), 403
+
+    allocations = PaymentAllocation.query.filter_by(payment_id=payment_id).order_by(PaymentAllocation.id).all()
+    return jsonify({**payment.to_dict(), "allocations": [allocation.to_dict() for allocation in allocations]}), 200
+
+
+@payment_bp.route('/payment/reconcile', methods=['POST', 'OPTIONS'])
+@swag_from({
+    'tags': ['Payment'],
+    'description': 'Match received payments to members and settle their outstanding fines and loans '
+                   '(fines first, oldest first; a debt named in the account reference before anything else). '
+                   'Safe to run at any time; "flask payments reconcile" does the same from a scheduler.',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'Reconciliation report',
+            'examples': {
+                'application/json': {
+                    'matched': 3,
+                    'unmatched': 1,
+                    'payments': 3,
+                    'allocations': 5,
+                    'allocated': '1450.00',
+                    'fines_settled': 3,
+                    'loans_settled': 1
+                }
+            }
+        }
+    }
+})
+@role_required('admin')
+def reconcile():
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    return jsonify(reconcile_payments()), 200
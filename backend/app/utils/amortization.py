@@ -0,0 +1,227 @@
+import calendar
+from collections import namedtuple
+from datetime import date
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, select
+from app import db
+from app.models.loans import Loan
+
+# "reducing": equal monthly instalments, interest charged on the remaining balance.
+# "flat": interest charged on the original principal every month, principal repaid in equal parts.
+INTEREST_METHODS = ('reducing', 'flat')
+
+# Arrays describing a set of loans, one element per loan
+LoanBook = namedtuple('LoanBook', 'ids member_ids principal start annual_rate terms')
+
+# Per-loan schedules as (loans x months) matrices; column t is instalment t + 1.
+# balance has one extra leading column: the balance before the first instalment.
+Schedules = namedtuple('Schedules', 'payment interest principal balance')
+
+
+def add_months(start, months):
+    """Return `start` moved by whole months, clamping the day to the end of shorter months."""
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def _money(value):
+    return f"{value:.2f}"
+
+
+def load_loan_book(*criteria):
+    """Load the loans matching `criteria` into a LoanBook with one column query.
+
+    Loans without their own interest rate or term use the configured defaults.
+    """
+    rows = db.session.execute(
+        select(
+            Loan.id,
+            Loan.member_id,
+            Loan.amount,
+            Loan.date,
+            func.coalesce(Loan.interest_rate, current_app.config['LOAN_DEFAULT_INTEREST_RATE']),
+            func.coalesce(Loan.term_months, current_app.config['LOAN_DEFAULT_TERM_MONTHS'])
+        ).where(*criteria).order_by(Loan.id)
+    ).all()
+    ids, member_ids, principal, start, rates, terms = zip(*rows) if rows else ((),) * 6
+
+    return LoanBook(
+        ids=np.array(ids, dtype=np.int64),
+        member_ids=np.array(member_ids, dtype=np.int64),
+        principal=np.array(principal, dtype=np.float64),
+        start=np.array(start, dtype='datetime64[D]'),
+        annual_rate=np.array(rates, dtype=np.float64),
+        terms=np.maximum(np.array(terms, dtype=np.int64), 1)
+    )
+
+
+def amortize(principal, annual_rate, terms, method=None):
+    """Compute the full repayment schedule of every loan at once.
+
+    Returns Schedules of (loans x max term) matrices, zero past each loan's
+    own term. Balances use the closed form of the annuity recurrence, so there
+    is no loop over loans or over months.
+    """
+    method = method or current_app.config['LOAN_INTEREST_METHOD']
+    if method not in INTEREST_METHODS:
+        raise ValueError(f"LOAN_INTEREST_METHOD must be one of: {', '.join(INTEREST_METHODS)}")
+
+    rate = (annual_rate / 12)[:, None]
+    principal = principal[:, None]
+    terms = terms[:, None]
+    periods = np.arange((terms.max() if terms.size else 0) + 1)[None, :]
+    shape = (len(rate), periods.shape[1])
+    interest_bearing = rate > 0
+
+    if method == 'reducing':
+        # balance_t = P(1+r)^t - A((1+r)^t - 1)/r; the annuity factor tends to t as r -> 0
+        growth = (1 + rate) ** periods
+        factor = np.divide(growth - 1, rate, out=np.broadcast_to(periods, shape).astype(np.float64),
+                           where=interest_bearing)
+        balance = principal * growth
+        # Instalment that brings the balance to zero after the last period
+        instalment = np.take_along_axis(balance, terms, axis=1) / np.take_along_axis(factor, terms, axis=1)
+        balance -= instalment * factor
+    else:
+        balance = principal - principal / terms * periods
+
+    # Zero once the loan is repaid; clip the floating-point residue around the last instalment
+    balance *= periods < terms
+    np.maximum(balance, 0, out=balance)
+    principal_paid = balance[:, :-1] - balance[:, 1:]
+    if method == 'reducing':
+        interest = balance[:, :-1] * rate
+    else:
+        interest = (principal * rate) * (periods[:, 1:] <= terms)
+
+    return Schedules(payment=principal_paid + interest, interest=interest, principal=principal_paid, balance=balance)
+
+
+def months_elapsed(start, as_of):
+    """Number of monthly instalments that have fallen due by `as_of` for each start date."""
+    start_month = start.astype('datetime64[M]')
+    months = (np.datetime64(as_of, 'M') - start_month).astype(np.int64)
+    start_day = (start - start_month.astype('datetime64[D]')).astype(np.int64) + 1
+    return months - (as_of.day < start_day)
+
+
+def loan_schedule(loan_id, as_of=None):
+    """Return the repayment schedule of one loan as a dict, or None if there is no such loan.
+
+    Amounts are rounded to cents with the rounding carried into the balance, so
+    the instalments always add up to the principal exactly.
+    """
+    as_of = as_of or date.today()
+    book = load_loan_book(Loan.id == loan_id)
+    if not book.ids.size:
+        return None
+
+    schedules = amortize(book.principal, book.annual_rate, book.terms)
+    term = int(book.terms[0])
+    start = book.start[0].item()
+    balance = np.round(schedules.balance[0, :term + 1], 2)
+    principal = np.round(balance[:-1] - balance[1:], 2)
+    interest = np.round(schedules.interest[0, :term], 2)
+    due = int(np.clip(months_elapsed(book.start, as_of)[0], 0, term))
+
+    return {
+        'loan_id': int(book.ids[0]),
+        'member_id': int(book.member_ids[0]),
+        'principal': _money(book.principal[0]),
+        'annual_rate': float(book.annual_rate[0]),
+        'term_months': term,
+        'method': current_app.config['LOAN_INTEREST_METHOD'],
+        'start_date': start.isoformat(),
+        'payoff_date': add_months(start, term).isoformat(),
+        'total_interest': _money(interest.sum()),
+        'total_repayable': _money(principal.sum() + interest.sum()),
+        'as_of': as_of.isoformat(),
+        'instalments_due': due,
+        'interest_accrued': _money(interest[:due].sum()),
+        'scheduled_balance': _money(balance[due]),
+        'schedule': [
+            {
+                'period': period + 1,
+                'due_date': add_months(start, period + 1).isoformat(),
+                'payment': _money(principal[period] + interest[period]),
+                'principal': _money(principal[period]),
+                'interest': _money(interest[period]),
+                'balance': _money(balance[period + 1])
+            }
+            for period in range(term)
+        ]
+    }
+
+
+def project_portfolio(book, months, as_of=None):
+    """Project the repayments of every loan in `book` over the next `months` calendar months.
+
+    Returns a dict with the book's current position and one entry per month
+    (the current month first) with the principal and interest falling due and
+    the scheduled balance left at the end of it.
+    """
+    as_of = as_of or date.today()
+    schedules = amortize(book.principal, book.annual_rate, book.terms)
+    terms = book.terms[:, None]
+    horizon = schedules.interest.shape[1]
+
+    elapsed = months_elapsed(book.start, as_of)
+    due = np.clip(elapsed, 0, book.terms)
+    cumulative_interest = np.concatenate(
+        [np.zeros((len(book.ids), 1)), np.cumsum(schedules.interest, axis=1)], axis=1)
+    accrued = np.take_along_axis(cumulative_interest, due[:, None], axis=1)[:, 0]
+    current_balance = np.take_along_axis(schedules.balance, due[:, None], axis=1)[:, 0]
+    overdue = elapsed > book.terms
+
+    # Instalment number falling due in each projected calendar month, per loan
+    month_diff = (np.datetime64(as_of, 'M') - book.start.astype('datetime64[M]')).astype(np.int64)
+    instalment = month_diff[:, None] + np.arange(months)[None, :]
+    falls_due = (instalment >= 1) & (instalment <= terms)
+    column = np.clip(instalment - 1, 0, max(horizon - 1, 0))
+
+    def due_in_month(matrix):
+        if not horizon:
+            return np.zeros(months)
+        return np.where(falls_due, np.take_along_axis(matrix, column, axis=1), 0.0).sum(axis=0)
+
+    principal_due = due_in_month(schedules.principal)
+    interest_due = due_in_month(schedules.interest)
+    outstanding = np.take_along_axis(schedules.balance, np.clip(instalment, 0, terms), axis=1).sum(axis=0) \
+        if len(book.ids) else np.zeros(months)
+    maturing = (instalment == terms).sum(axis=0)
+
+    # Latest payoff: order loans by (final month, start day) and convert only the last one
+    payoff = None
+    if len(book.ids):
+        start_month = book.start.astype('datetime64[M]')
+        start_day = (book.start - start_month.astype('datetime64[D]')).astype(np.int64)
+        last = np.argmax((start_month.astype(np.int64) + book.terms) * 31 + start_day)
+        payoff = add_months(book.start[last].item(), int(book.terms[last]))
+    first_month = date(as_of.year, as_of.month, 1)
+    return {
+        'as_of': as_of.isoformat(),
+        'method': current_app.config['LOAN_INTEREST_METHOD'],
+        'loans': int(len(book.ids)),
+        'principal': _money(book.principal.sum()),
+        'scheduled_balance': _money(current_balance.sum()),
+        'interest_accrued': _money(accrued.sum()),
+        'total_interest': _money(schedules.interest.sum()),
+        'overdue': {
+            'count': int(overdue.sum()),
+            'principal': _money(book.principal[overdue].sum())
+        },
+        'payoff_date': payoff.isoformat() if payoff else None,
+        'months': [
+            {
+                'month': add_months(first_month, offset).strftime('%Y-%m'),
+                'principal_due': _money(principal_due[offset]),
+                'interest_due': _money(interest_due[offset]),
+                'total_due': _money(principal_due[offset] + interest_due[offset]),
+                'scheduled_balance': _money(outstanding[offset]),
+                'loans_maturing': int(maturing[offset])
+            }
+            for offset in range(months)
+        ]
+    }
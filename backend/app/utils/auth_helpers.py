@@ -4,12 +4,30 @@ from functools import wraps
 # This imports verify_jwt_in_request and get_jwt_identity from Flask-JWT-Extended.
 # verify_jwt_in_request() ensures that a valid JWT is present in the request (usually in the Authorization header).
 #get_jwt_identity() retrieves the user's identity (usually the user ID) from the token.
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from flask import jsonify
-# Imports the User model so you can query the database and check the current user's role.
-from app.models.members import Member
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
+from flask import jsonify, g
+# Imports the member identity cache, used to check that a token's claims still match the member.
+from app.utils.member_cache import member_cache
 from flask import request
 
+
+# Builds the extra claims that login and refresh embed in the access token.
+# role_required authorizes from these claims; the member cache only confirms they have not been revoked.
+def member_claims(member):
+    return {
+        "role": member.role,
+        "disabled": member.role == 'disabled'
+    }
+
+
+# Verifies the JWT once per request and memoizes the decoded claims on flask.g.
+# Stacking @jwt_required() and @role_required() (or calling this from the route) no longer decodes the token twice.
+def get_verified_claims():
+    if 'verified_claims' not in g:
+        verify_jwt_in_request()
+        g.verified_claims = get_jwt()
+    return g.verified_claims
+
 # Defines the outer function of the decorator. It accepts a variable number of roles,
 # The asterisk * before the parameter name (roles) allows the function to accept any number of arguments, which will be collected into a tuple.
 # In this context, roles will be a tuple containing all the role names you want to allow access to a route.
@@ -28,16 +46,37 @@ def role_required(*roles):
                 return jsonify({}), 200
             # Verify the JWT token
             # Verifies that the request contains a valid JWT. If not, it will automatically return a 401 Unauthorized.
-            verify_jwt_in_request()
-            # Get the current user's identity
-            current_user_id = get_jwt_identity()
-            user = Member.query.get(current_user_id)
+            claims = get_verified_claims()
+            role = claims.get('role')
+
+            # Authorize from the verified claims alone: a request the token does not allow
+            # is refused without touching the cache or the database.
+            if claims.get('disabled') or role == 'disabled':
+                return jsonify({"msg": "Access forbidden for role disabled"}), 403
+
+            if roles and role is not None and role not in roles:
+                return jsonify({"msg": f"Access forbidden for role {role}"}), 403
+
+            # Revocation check: the claims must still match the cached member row, so that
+            # deleting, disabling or changing a member takes effect without waiting for the
+            # token to expire. A cache hit costs no database round trip.
+            user = member_cache.get(get_jwt_identity())
 
             if not user:
                 return jsonify({"msg": "User not found"}), 404
 
-            if roles and user.role not in roles:
-                return jsonify({"msg": f"Access forbidden for role {user.role}"}), 403
+            # Tokens issued before role claims existed take the role from the cached row.
+            if role is None:
+                role = user.role
+
+                if role == 'disabled':
+                    return jsonify({"msg": "Access forbidden for role disabled"}), 403
+
+                if roles and role not in roles:
+                    return jsonify({"msg": f"Access forbidden for role {role}"}), 403
+
+            elif user.role != role:
+                return jsonify({"msg": "Token has been revoked, please log in again"}), 401
 
             return fn(*args, **kwargs)
 
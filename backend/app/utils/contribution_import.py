@@ -0,0 +1,219 @@
+import csv
+import io
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from app import db
+from app.models.contribution import Contribution
+from app.models.members import Member
+from app.utils.response_cache import response_cache
+
+IMPORT_FORMATS = ('auto', 'csv', 'mpesa')
+
+# Plain CSV: one contribution per row
+CSV_COLUMNS = ('phone', 'date', 'amount')
+
+# M-Pesa business statement export; the file starts with a preamble before this header
+MPESA_COLUMNS = ('Receipt No.', 'Completion Time', 'Transaction Status', 'Paid In', 'Other Party Info')
+
+DATE_FORMATS = (
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M',
+    '%d/%m/%Y', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M',
+    '%d-%m-%Y', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M',
+)
+
+# How far into the file to look for the header row
+MAX_PREAMBLE_LINES = 20
+
+# contributions.amount is Numeric(10, 2)
+MAX_AMOUNT = Decimal('99999999.99')
+
+COPY_CONTRIBUTIONS = "COPY contributions (member_id, date, amount) FROM STDIN WITH (FORMAT csv)"
+
+
+class ContributionImportError(Exception):
+    """The file as a whole cannot be imported (unknown format, missing columns)."""
+
+
+def normalize_phone(value):
+    """Return a phone number in 2547XXXXXXXX form, or None if it does not look like one.
+
+    Accepts the usual ways members write it: 07.., 01.., +254.., 254.. or the
+    bare 9-digit subscriber number, with any spaces or dashes.
+    """
+    digits = re.sub(r'\D', '', value or '')
+    if len(digits) == 10 and digits.startswith('0'):
+        digits = '254' + digits[1:]
+    elif len(digits) == 9:
+        digits = '254' + digits
+    return digits if len(digits) == 12 and digits.startswith('254') else None
+
+
+def phone_directory():
+    """Build the normalised phone -> member id lookup used to match imported rows."""
+    return {
+        normalize_phone(phone): member_id
+        for member_id, phone in db.session.query(Member.id, Member.phone)
+        if normalize_phone(phone)
+    }
+
+
+def _parse_date(value):
+    value = (value or '').strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date '{value}'")
+
+
+def _parse_amount(value):
+    try:
+        amount = Decimal((value or '').replace(',', '').strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{value}'")
+    if not amount.is_finite() or amount <= 0 or amount > MAX_AMOUNT:
+        raise ValueError(f"Amount must be between 0.01 and {MAX_AMOUNT}")
+    if amount != amount.quantize(Decimal('0.01')):
+        raise ValueError("Amount must have at most two decimal places")
+    return amount
+
+
+def _csv_rows(reader, header, line):
+    missing = [column for column in CSV_COLUMNS if column not in header]
+    if missing:
+        raise ContributionImportError("Missing column(s): " + ", ".join(missing))
+    index = [header.index(column) for column in CSV_COLUMNS]
+
+    def rows(line):
+        for fields in reader:
+            line += 1
+            if not any(field.strip() for field in fields):
+                continue
+            yield line, *(fields[i] if i < len(fields) else '' for i in index)
+
+    return rows(line)
+
+
+def _mpesa_rows(reader, header, line):
+    index = {column: header.index(column) for column in MPESA_COLUMNS}
+
+    for fields in reader:
+        line += 1
+        if not any(field.strip() for field in fields):
+            continue
+        if len(fields) < len(header):
+            # Truncated row: yielded without values so it is reported as a per-row error
+            yield line, None, None, None
+            continue
+        # Only completed incoming payments are contributions
+        if fields[index['Transaction Status']].strip().lower() != 'completed':
+            continue
+        if not fields[index['Paid In']].strip():
+            continue
+        # "2547XXXXXXXX - JANE DOE"
+        party = fields[index['Other Party Info']].split(' - ')[0]
+        yield line, party, fields[index['Completion Time']], fields[index['Paid In']]
+
+
+def parse_contributions(stream, fmt='auto'):
+    """Return an iterator of (line, phone, date, amount) text tuples from a CSV or M-Pesa statement.
+
+    The header is read up front, so a file that cannot be imported at all raises
+    ContributionImportError here; the rows are then read one at a time. With
+    fmt='auto' the first recognised header decides the format, and M-Pesa
+    preamble lines before it are skipped. A row with fewer fields than the header
+    is yielded as (line, None, None, None).
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ContributionImportError("format must be one of: " + ", ".join(IMPORT_FORMATS))
+
+    reader = csv.reader(stream)
+    for line, fields in enumerate(reader, 1):
+        header = [field.strip() for field in fields]
+        if fmt in ('auto', 'mpesa') and all(column in header for column in MPESA_COLUMNS):
+            return _mpesa_rows(reader, header, line)
+        lowered = [column.lower() for column in header]
+        if fmt == 'csv' or (fmt == 'auto' and 'phone' in lowered):
+            return _csv_rows(reader, lowered, line)
+        if line == MAX_PREAMBLE_LINES:
+            break
+
+    raise ContributionImportError("No header row found")
+
+
+def import_contributions(stream, fmt='auto', skip_invalid=False, dry_run=False):
+    """Match rows to members by phone and COPY them into contributions.
+
+    Valid rows are streamed to Postgres in chunks of CONTRIBUTION_IMPORT_CHUNK_SIZE,
+    all inside one transaction. It is committed only if every row was valid
+    (or skip_invalid is set) and this is not a dry run; otherwise it is rolled back.
+    A commit invalidates the cached contribution responses of the members imported.
+    Returns a report dict with the counts and the first CONTRIBUTION_IMPORT_MAX_ERRORS
+    per-row errors.
+    """
+    rows = parse_contributions(stream, fmt)
+    chunk_size = current_app.config['CONTRIBUTION_IMPORT_CHUNK_SIZE']
+    max_errors = current_app.config['CONTRIBUTION_IMPORT_MAX_ERRORS']
+    directory = phone_directory()
+
+    cursor = db.session.connection().connection.cursor()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    imported = buffered = invalid = 0
+    errors = []
+    member_ids = set()
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(COPY_CONTRIBUTIONS, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    try:
+        for line, phone, date_value, amount_value in rows:
+            try:
+                if phone is None:
+                    raise ValueError("Row has fewer columns than the header")
+                member_id = directory.get(normalize_phone(phone))
+                if member_id is None:
+                    raise ValueError(f"No member with phone '{phone.strip()}'")
+                writer.writerow((member_id, _parse_date(date_value), _parse_amount(amount_value)))
+            except ValueError as error:
+                invalid += 1
+                if len(errors) < max_errors:
+                    errors.append({"line": line, "msg": str(error)})
+                continue
+
+            member_ids.add(member_id)
+            buffered += 1
+            if buffered == chunk_size:
+                flush()
+                imported += buffered
+                buffered = 0
+
+        if buffered:
+            flush()
+            imported += buffered
+
+        committed = not dry_run and (skip_invalid or not invalid)
+        if committed:
+            db.session.commit()
+            response_cache.invalidate(Contribution, *member_ids)
+        else:
+            db.session.rollback()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return {
+        "imported": imported if committed else 0,
+        "valid": imported,
+        "invalid": invalid,
+        "committed": committed,
+        "errors": errors
+    }
@@ -1,7 +1,12 @@
 import os
 import threading
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import select, update, or_, and_
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
+from app import db
+from app.models.email_outbox import EmailOutbox
 
 # Environment variables
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
@@ -9,25 +14,237 @@ FROM_EMAIL = os.getenv("FROM_EMAIL")
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
 
-def send_email(to_email, subject, text_content, html_content=None):
-    """Generic SendGrid email sender"""
-    message = Mail(
-        from_email=FROM_EMAIL,
-        to_emails=to_email,
+class EmailDeliveryError(Exception):
+    """Raised by a transport when the provider did not accept the message."""
+
+
+class SendGridTransport:
+    """Sends through one SendGrid client that is reused for every message."""
+
+    def __init__(self, api_key, from_email):
+        self.client = SendGridAPIClient(api_key)
+        self.from_email = from_email
+
+    def send(self, to_email, subject, text_content, html_content=None):
+        message = Mail(
+            from_email=self.from_email,
+            to_emails=to_email,
+            subject=subject,
+            plain_text_content=text_content,
+            html_content=html_content
+        )
+        response = self.client.send(message)
+        if response.status_code >= 400:
+            raise EmailDeliveryError(f"SendGrid returned {response.status_code}")
+
+
+class StubTransport:
+    """Keeps messages in memory instead of sending them, for local development and offline tests.
+
+    Set fail_next to make the next N sends raise, to exercise the retry path.
+    """
+
+    def __init__(self):
+        self.sent = []
+        self.fail_next = 0
+        self._lock = threading.Lock()
+
+    def send(self, to_email, subject, text_content, html_content=None):
+        with self._lock:
+            if self.fail_next:
+                self.fail_next -= 1
+                raise EmailDeliveryError("Stub transport asked to fail")
+            self.sent.append({
+                "to_email": to_email,
+                "subject": subject,
+                "text_content": text_content,
+                "html_content": html_content
+            })
+
+
+def make_transport(name):
+    if name == "stub":
+        return StubTransport()
+    return SendGridTransport(SENDGRID_API_KEY, FROM_EMAIL)
+
+
+def queue_email(to_email, subject, text_content, html_content=None):
+    """Add a message to the outbox in the current session.
+
+    The caller commits, so the email is only sent if the surrounding write
+    (for example creating the member) actually commits. Call
+    email_outbox.wake() after the commit to have it picked up immediately.
+    """
+    db.session.add(EmailOutbox(
+        to_email=to_email,
         subject=subject,
-        plain_text_content=text_content,
+        text_content=text_content,
         html_content=html_content
-    )
-    try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        sg.send(message)
-        print(f"Email successfully sent to {to_email}")
-    except Exception as e:
-        print("Error sending email:", str(e))
+    ))
+
+
+class EmailOutboxWorkers:
+    """A fixed pool of threads that drain the email_outbox table.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED and leased for
+    EMAIL_OUTBOX_LEASE_SECONDS, so several workers (and several gunicorn
+    processes) never send the same row, and rows left behind by a worker that
+    died are picked up again once the lease expires. Failed sends are retried
+    with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS is reached.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.transport = None
+        self.workers = 2
+        self.batch_size = 10
+        self.poll_interval = 30
+        self.lease_seconds = 120
+        self.max_attempts = 5
+        self.backoff_base = 30
+        self.backoff_max = 3600
+        self._threads = []
+        self._pid = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.transport = make_transport(app.config.get("EMAIL_TRANSPORT", "sendgrid"))
+        self.workers = app.config.get("EMAIL_OUTBOX_WORKERS", self.workers)
+        self.batch_size = app.config.get("EMAIL_OUTBOX_BATCH_SIZE", self.batch_size)
+        self.poll_interval = app.config.get("EMAIL_OUTBOX_POLL_INTERVAL", self.poll_interval)
+        self.lease_seconds = app.config.get("EMAIL_OUTBOX_LEASE_SECONDS", self.lease_seconds)
+        self.max_attempts = app.config.get("EMAIL_OUTBOX_MAX_ATTEMPTS", self.max_attempts)
+        self.backoff_base = app.config.get("EMAIL_OUTBOX_BACKOFF_BASE", self.backoff_base)
+        self.backoff_max = app.config.get("EMAIL_OUTBOX_BACKOFF_MAX", self.backoff_max)
+
+        # Workers start with the first request a process serves rather than in create_app,
+        # so CLI commands such as "flask db upgrade" never spawn them.
+        if app.config.get("EMAIL_OUTBOX_AUTOSTART", True):
+            app.before_request(self.ensure_started)
+
+    def ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f"email-outbox-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = pid
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            with self.app.app_context():
+                try:
+                    processed = self.drain_once()
+                except Exception:
+                    current_app.logger.exception("Email outbox worker failed to drain a batch")
+                    db.session.rollback()
+                    processed = 0
+                finally:
+                    db.session.remove()
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _claim_batch(self):
+        now = datetime.now(timezone.utc)
+        # A lease that expired on the last attempt (the worker died mid-send) is given
+        # up on rather than claimed again, so a crashing message cannot retry forever
+        exhausted = db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.status == 'sending', EmailOutbox.locked_until < now,
+                   EmailOutbox.attempts >= self.max_attempts)
+            .values(status='failed', locked_until=None,
+                    last_error='Lease expired without a result on the final attempt')
+            .returning(EmailOutbox.id, EmailOutbox.to_email, EmailOutbox.attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for row in exhausted:
+            current_app.logger.error("Giving up on email %s to %s after %s attempts: lease expired",
+                                     row.id, row.to_email, row.attempts)
+
+        due = select(EmailOutbox.id).where(or_(
+            and_(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == 'sending', EmailOutbox.locked_until < now,
+                 EmailOutbox.attempts < self.max_attempts)
+        )).order_by(EmailOutbox.id).limit(self.batch_size).with_for_update(skip_locked=True)
+
+        rows = db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(
+                status='sending',
+                attempts=EmailOutbox.attempts + 1,
+                locked_until=now + timedelta(seconds=self.lease_seconds)
+            )
+            .returning(EmailOutbox.id, EmailOutbox.to_email, EmailOutbox.subject,
+                       EmailOutbox.text_content, EmailOutbox.html_content, EmailOutbox.attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.session.commit()
+        return rows
+
+    def drain_once(self):
+        """Claim and send one batch. Returns the number of rows processed."""
+        rows = self._claim_batch()
+        for row in rows:
+            try:
+                self.transport.send(row.to_email, row.subject, row.text_content, row.html_content)
+            except Exception as e:
+                self._record_failure(row, e)
+            else:
+                db.session.execute(
+                    update(EmailOutbox).where(EmailOutbox.id == row.id)
+                    .values(status='sent', sent_at=datetime.now(timezone.utc), locked_until=None, last_error=None)
+                    .execution_options(synchronize_session=False)
+                )
+            db.session.commit()
+        return len(rows)
+
+    def _record_failure(self, row, error):
+        if row.attempts >= self.max_attempts:
+            current_app.logger.error("Giving up on email %s to %s after %s attempts: %s",
+                                     row.id, row.to_email, row.attempts, error)
+            values = {'status': 'failed'}
+        else:
+            delay = min(self.backoff_base * 2 ** (row.attempts - 1), self.backoff_max)
+            current_app.logger.warning("Email %s to %s failed (attempt %s), retrying in %ss: %s",
+                                       row.id, row.to_email, row.attempts, delay, error)
+            values = {'status': 'pending',
+                      'next_attempt_at': datetime.now(timezone.utc) + timedelta(seconds=delay)}
+
+        db.session.execute(
+            update(EmailOutbox).where(EmailOutbox.id == row.id)
+            .values(locked_until=None, last_error=str(error)[:1000], **values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def drain(self):
+        """Send everything that is currently due. Returns the number of rows processed."""
+        total = 0
+        while True:
+            processed = self.drain_once()
+            if not processed:
+                return total
+            total += processed
+
+
+email_outbox = EmailOutboxWorkers()
 
 
 def send_welcome_email(email, name):
-    """Prepare and send welcome email"""
+    """Prepare the welcome email and queue it in the outbox"""
     text_body = f"""
 Hi {name},
 
@@ -72,20 +289,6 @@ Team Neighbours
 <p>Team Neighbours</p>
 """
 
-    # Send asynchronously using threading
-    threading.Thread(target=send_email, args=(email, "Welcome to Team Neighbours 🎉", text_body, html_body)).start()
-
-
-# ----------------------------
-# Example: Call after account creation
-# ----------------------------
-def create_user_account(user_data):
-    new_user = save_to_database(user_data)  # Your user creation function
-    if new_user:
-        send_welcome_email(new_user.email, new_user.name)
-        # User-facing message
-        return {
-            "success": True,
-            "message": f"Account created! A welcome email has been sent to {new_user.email}."
-        }
-    return {"success": False, "message": "Account creation failed."}
\ No newline at end of file
+    # Queued in the caller's transaction and sent by the outbox workers
+    queue_email(email, "Welcome to Team Neighbours 🎉", text_body, html_body)
+
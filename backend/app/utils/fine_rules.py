@@ -0,0 +1,145 @@
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from sqlalchemy import Date, Numeric, String, exists, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from app import db
+from app.models.attendance import Attendance, ATTENDANCE_STATUSES
+from app.models.contribution import Contribution
+from app.models.fines import Fine
+from app.models.members import Member
+
+# kind "attendance": one fine per attendance record whose status is in `statuses`;
+#   the period is the meeting date.
+# kind "missing_contribution": one fine per active member with no contribution
+#   between the 1st of the month and `due_day`; the period is the 1st of the month.
+RULE_KINDS = ('attendance', 'missing_contribution')
+
+FineRule = namedtuple('FineRule', 'id kind amount reason statuses due_day')
+
+CANDIDATE_COLUMNS = ('rule_id', 'member_id', 'period', 'date', 'amount', 'reason')
+
+
+class FineRuleError(Exception):
+    """Raised for an unknown rule or an invalid run period; create_app turns it into a 400 response."""
+
+
+def configured_rules():
+    """Parse and validate the FINE_RULES setting into FineRule tuples, keyed by rule id.
+
+    A misconfigured rule raises ValueError: that is a deployment error, not a bad request.
+    """
+    rules = {}
+    for raw in current_app.config['FINE_RULES']:
+        rule_id = raw.get('id')
+        if not rule_id or len(rule_id) > 50 or rule_id in rules:
+            raise ValueError(f"Fine rule ids must be unique strings of at most 50 characters: {rule_id!r}")
+        if raw.get('kind') not in RULE_KINDS:
+            raise ValueError(f"Fine rule {rule_id!r}: kind must be one of {', '.join(RULE_KINDS)}")
+        try:
+            amount = Decimal(str(raw['amount']))
+        except (KeyError, InvalidOperation):
+            raise ValueError(f"Fine rule {rule_id!r}: amount must be a number")
+
+        statuses = tuple(raw.get('statuses') or ())
+        due_day = raw.get('due_day')
+        if raw['kind'] == 'attendance' and (not statuses or set(statuses) - set(ATTENDANCE_STATUSES)):
+            raise ValueError(f"Fine rule {rule_id!r}: statuses must be a subset of {', '.join(ATTENDANCE_STATUSES)}")
+        if raw['kind'] == 'missing_contribution' and not (isinstance(due_day, int) and 1 <= due_day <= 28):
+            raise ValueError(f"Fine rule {rule_id!r}: due_day must be a day of the month between 1 and 28")
+
+        rules[rule_id] = FineRule(rule_id, raw['kind'], amount, raw.get('reason') or rule_id, statuses, due_day)
+    return rules
+
+
+def _attendance_candidates(rule, date_from, date_to):
+    return select(
+        literal(rule.id, String).label('rule_id'),
+        Attendance.member_id.label('member_id'),
+        Attendance.date.label('period'),
+        Attendance.date.label('date'),
+        literal(rule.amount, Numeric(10, 2)).label('amount'),
+        literal(rule.reason, String).label('reason')
+    ).where(Attendance.status.in_(rule.statuses), Attendance.date.between(date_from, date_to))
+
+
+def _due_dates(due_day, date_from, date_to):
+    # Every (month start, due date) whose due date falls in the period and has already passed
+    year, month = date_from.year, date_from.month
+    while date(year, month, 1) <= date_to:
+        due = date(year, month, due_day)
+        if date_from <= due <= min(date_to, date.today()):
+            yield date(year, month, 1), due
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _missing_contribution_candidates(rule, date_from, date_to):
+    return [
+        select(
+            literal(rule.id, String).label('rule_id'),
+            Member.id.label('member_id'),
+            literal(month_start, Date).label('period'),
+            literal(due, Date).label('date'),
+            literal(rule.amount, Numeric(10, 2)).label('amount'),
+            literal(rule.reason, String).label('reason')
+        ).where(
+            Member.role != 'disabled',
+            ~exists().where(Contribution.member_id == Member.id, Contribution.date.between(month_start, due))
+        )
+        for month_start, due in _due_dates(rule.due_day, date_from, date_to)
+    ]
+
+
+def fine_candidates(rules, date_from, date_to):
+    """Return one UNION ALL select of every fine the rules produce for the period, or None if none can."""
+    selects = []
+    for rule in rules:
+        if rule.kind == 'attendance':
+            selects.append(_attendance_candidates(rule, date_from, date_to))
+        else:
+            selects.extend(_missing_contribution_candidates(rule, date_from, date_to))
+    if not selects:
+        return None
+    return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+
+
+def apply_fine_rules(date_from, date_to, rule_ids=None, dry_run=False):
+    """Evaluate the fine rules over [date_from, date_to] and insert the resulting fines.
+
+    Each rule is evaluated set-based across the whole membership and all rules
+    go into a single INSERT ... SELECT. The partial unique index on
+    (rule_id, member_id, period) plus ON CONFLICT DO NOTHING makes reruns
+    idempotent. With dry_run nothing is written and the fines that would be
+    created are returned instead. Returns a list of fine dicts.
+    """
+    if date_from > date_to:
+        raise FineRuleError("'date_from' must not be after 'date_to'")
+    rules = configured_rules()
+    unknown = set(rule_ids or ()) - set(rules)
+    if unknown:
+        raise FineRuleError("Unknown fine rule(s): " + ", ".join(sorted(unknown)))
+    selected = [rules[rule_id] for rule_id in dict.fromkeys(rule_ids)] if rule_ids else list(rules.values())
+
+    candidates = fine_candidates(selected, date_from, date_to)
+    if candidates is None:
+        return []
+
+    if dry_run:
+        pending = select(candidates).where(~exists().where(
+            Fine.rule_id == candidates.c.rule_id,
+            Fine.member_id == candidates.c.member_id,
+            Fine.period == candidates.c.period
+        )).order_by(candidates.c.rule_id, candidates.c.period, candidates.c.member_id)
+        return [dict(row) for row in db.session.execute(pending).mappings()]
+
+    statement = insert(Fine).from_select(
+        [*CANDIDATE_COLUMNS, 'status'],
+        select(*[candidates.c[column] for column in CANDIDATE_COLUMNS], literal('pending', String))
+    ).on_conflict_do_nothing(
+        index_elements=['rule_id', 'member_id', 'period'],
+        index_where=Fine.rule_id.isnot(None)
+    ).returning(*[Fine.__table__.c[column] for column in CANDIDATE_COLUMNS])
+    created = [dict(row) for row in db.session.execute(statement).mappings()]
+    db.session.commit()
+    return sorted(created, key=lambda fine: (fine['rule_id'], fine['period'], fine['member_id']))
@@ -0,0 +1,86 @@
+import dataclasses
+import json
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+DECIMAL_POLICIES = ("string", "number")
+
+
+def _default_for(decimal_policy):
+    # Only called for the types orjson cannot serialize natively (dates and datetimes
+    # are written by orjson itself); in this app that is Decimal
+    decimal_to_json = str if decimal_policy == "string" else float
+
+    def default(o):
+        if isinstance(o, Decimal):
+            return decimal_to_json(o)
+        if dataclasses.is_dataclass(o):
+            return dataclasses.asdict(o)
+        if hasattr(o, "__html__"):
+            return str(o.__html__())
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    return default
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson.
+
+    Dates and datetimes are written as ISO 8601 ("2026-10-17") instead of the
+    RFC 822 strings of Flask's provider, and Decimal amounts follow
+    JSON_DECIMAL: "string" (the default, exact, what the API has always sent)
+    or "number" (a JSON number, rounded to a double). Integer dict keys are
+    allowed, as with the json module. Responses are encoded straight to bytes.
+    """
+
+    decimal_policy = "string"
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.decimal_policy = app.config.get("JSON_DECIMAL", self.decimal_policy)
+        if self.decimal_policy not in DECIMAL_POLICIES:
+            raise ValueError(f"JSON_DECIMAL must be one of: {', '.join(DECIMAL_POLICIES)}")
+        self.default = _default_for(self.decimal_policy)
+
+    def _options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # json.dumps arguments (tojson's, or a caller's own) keep the json module
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    "orjson": OrjsonProvider,
+    "default": DefaultJSONProvider,
+}
+
+
+def init_json_provider(app):
+    """Install the JSON provider named by the JSON_PROVIDER setting on the app."""
+    name = app.config.get("JSON_PROVIDER", "orjson")
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER must be one of: {', '.join(JSON_PROVIDERS)}")
+    app.json = JSON_PROVIDERS[name](app)
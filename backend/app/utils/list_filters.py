@@ -0,0 +1,45 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from flask import request
+from app.utils.pagination import InvalidListRequest
+
+
+def _parse(name, parser, message):
+    value = request.args.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return parser(value)
+    except (ValueError, InvalidOperation):
+        raise InvalidListRequest(message)
+
+
+def apply_list_filters(query, model):
+    """Narrow a list query with the filters in the query string.
+
+    Supported parameters, each applied only when the model has the column:
+    date_from / date_to (YYYY-MM-DD, inclusive), member_id, status (one value
+    or a comma separated list) and min_amount / max_amount.
+    """
+    date_from = _parse("date_from", date.fromisoformat, "'date_from' must be in YYYY-MM-DD format")
+    date_to = _parse("date_to", date.fromisoformat, "'date_to' must be in YYYY-MM-DD format")
+    member_id = _parse("member_id", int, "'member_id' must be an integer")
+    min_amount = _parse("min_amount", Decimal, "'min_amount' must be a number")
+    max_amount = _parse("max_amount", Decimal, "'max_amount' must be a number")
+    statuses = [status.strip() for status in request.args.get("status", "").split(",") if status.strip()]
+
+    if date_from is not None:
+        query = query.filter(model.date >= date_from)
+    if date_to is not None:
+        query = query.filter(model.date <= date_to)
+    if member_id is not None:
+        query = query.filter(model.member_id == member_id)
+    if statuses and hasattr(model, "status"):
+        query = query.filter(model.status.in_(statuses))
+    if hasattr(model, "amount"):
+        if min_amount is not None:
+            query = query.filter(model.amount >= min_amount)
+        if max_amount is not None:
+            query = query.filter(model.amount <= max_amount)
+
+    return query
@@ -0,0 +1,79 @@
+from sqlalchemy import select, func, case, delete, insert, text, or_
+from app import db
+from app.models.contribution import Contribution
+from app.models.fines import Fine
+from app.models.loans import Loan
+from app.models.members import Member
+from app.models.member_balance import MemberBalance
+
+BALANCE_COLUMNS = ('total_contributed', 'fines_outstanding', 'loan_principal_outstanding', 'last_activity_date')
+
+
+def _outstanding(model):
+    # Must match the trigger functions: anything not marked paid is still owed.
+    return func.sum(case((func.coalesce(model.status, 'pending') != 'paid', model.amount), else_=0))
+
+
+def expected_balances():
+    """Select the balances recomputed from scratch from the ledger tables (Postgres)."""
+    contributions = select(
+        Contribution.member_id,
+        func.sum(Contribution.amount).label('total'),
+        func.max(Contribution.date).label('last_date')
+    ).group_by(Contribution.member_id).subquery()
+    fines = select(
+        Fine.member_id, _outstanding(Fine).label('total'), func.max(Fine.date).label('last_date')
+    ).group_by(Fine.member_id).subquery()
+    loans = select(
+        Loan.member_id, _outstanding(Loan).label('total'), func.max(Loan.date).label('last_date')
+    ).group_by(Loan.member_id).subquery()
+
+    return select(
+        Member.id.label('member_id'),
+        func.coalesce(contributions.c.total, 0).label('total_contributed'),
+        func.coalesce(fines.c.total, 0).label('fines_outstanding'),
+        func.coalesce(loans.c.total, 0).label('loan_principal_outstanding'),
+        func.greatest(contributions.c.last_date, fines.c.last_date, loans.c.last_date).label('last_activity_date')
+    ).select_from(Member) \
+        .outerjoin(contributions, contributions.c.member_id == Member.id) \
+        .outerjoin(fines, fines.c.member_id == Member.id) \
+        .outerjoin(loans, loans.c.member_id == Member.id)
+
+
+def find_drift():
+    """Return one dict per member whose stored balance differs from the recomputed one."""
+    expected = expected_balances().subquery()
+    stored = MemberBalance.__table__
+
+    rows = db.session.execute(
+        select(
+            expected.c.member_id,
+            *[expected.c[column].label(f'expected_{column}') for column in BALANCE_COLUMNS],
+            *[stored.c[column].label(f'stored_{column}') for column in BALANCE_COLUMNS]
+        ).select_from(expected.outerjoin(stored, stored.c.member_id == expected.c.member_id))
+        .where(or_(
+            # A member without any ledger rows may legitimately have no balance row yet
+            stored.c.member_id.is_(None) & expected.c.last_activity_date.isnot(None),
+            stored.c.member_id.isnot(None) & or_(
+                *[expected.c[column].is_distinct_from(stored.c[column]) for column in BALANCE_COLUMNS]
+            )
+        ))
+        .order_by(expected.c.member_id)
+    ).mappings().all()
+
+    return [dict(row) for row in rows]
+
+
+def rebuild_balances():
+    """Recompute member_balances from scratch in one transaction and return the row count.
+
+    The ledger tables are locked in SHARE mode for the duration so no write can
+    slip in between the recompute and the swap.
+    """
+    db.session.execute(text('LOCK TABLE contributions, fines, loans IN SHARE MODE'))
+    db.session.execute(delete(MemberBalance))
+    result = db.session.execute(
+        insert(MemberBalance).from_select(['member_id', *BALANCE_COLUMNS], expected_balances())
+    )
+    db.session.commit()
+    return result.rowcount
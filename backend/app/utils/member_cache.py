@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from app import db
+from app.models.members import Member
+
+
+# The member columns kept in the cache. The password hash is deliberately never cached.
+MemberIdentity = namedtuple('MemberIdentity', [
+    'id', 'name', 'email', 'phone', 'gender', 'role', 'email_verified', 'is_first_login'
+])
+
+
+class MemberCache:
+    """Bounded LRU cache of member identity rows with a time-to-live.
+
+    Every protected request needs the caller's role, and member pages read the
+    same few rows over and over, while members themselves change rarely. Routes
+    that change a member call invalidate() after committing so this process
+    never serves a stale row; other worker processes catch up within the TTL.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.maxsize = app.config.get('MEMBER_CACHE_MAXSIZE', self.maxsize)
+        self.ttl = app.config.get('MEMBER_CACHE_TTL', self.ttl)
+        self.clear()
+
+    def get(self, member_id):
+        """Return the MemberIdentity for member_id, loading it on a miss, or None if it does not exist."""
+        try:
+            member_id = int(member_id)
+        except (TypeError, ValueError):
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(member_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(member_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        row = db.session.query(*[getattr(Member, field) for field in MemberIdentity._fields]) \
+            .filter(Member.id == member_id).first()
+        if row is None:
+            return None
+
+        identity = MemberIdentity(*row)
+        with self._lock:
+            self._entries[member_id] = (now + self.ttl, identity)
+            self._entries.move_to_end(member_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return identity
+
+    def invalidate(self, member_id):
+        with self._lock:
+            self._entries.pop(int(member_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+member_cache = MemberCache()
@@ -0,0 +1,60 @@
+from sqlalchemy import select, func, case, delete, insert, literal, text, union_all, Date
+from app import db
+from app.models.attendance import Attendance, ATTENDED_STATUSES
+from app.models.contribution import Contribution
+from app.models.fines import Fine
+from app.models.member_monthly_rollup import MemberMonthlyRollup
+
+ROLLUP_COLUMNS = (
+    'contribution_total', 'contribution_count', 'fine_total', 'fine_count',
+    'attendance_total', 'attendance_attended'
+)
+
+
+def _month(model):
+    return func.date_trunc('month', model.date).cast(Date)
+
+
+def expected_rollups(since=None):
+    """Select the monthly rollups recomputed from scratch from the ledgers (Postgres).
+
+    `since` (a date) limits the result to months starting on or after it.
+    """
+    # Each branch needs its own literal objects: a select collapses repeated ones into one column
+    ledger = union_all(
+        select(Contribution.member_id, _month(Contribution).label('month'), Contribution.amount,
+               literal(1), literal(0), literal(0), literal(0), literal(0)),
+        select(Fine.member_id, _month(Fine), literal(0), literal(0), Fine.amount,
+               literal(1), literal(0), literal(0)),
+        select(Attendance.member_id, _month(Attendance), literal(0), literal(0), literal(0), literal(0),
+               literal(1), case((Attendance.status.in_(ATTENDED_STATUSES), 1), else_=0)),
+    ).subquery()
+
+    # Union columns take their names from the first select; address them by position
+    member_id, month, *values = ledger.c
+    query = select(
+        member_id.label('member_id'),
+        month.label('month'),
+        *[func.sum(value).label(column) for value, column in zip(values, ROLLUP_COLUMNS)]
+    ).group_by(member_id, month)
+    if since is not None:
+        query = query.where(month >= since)
+    return query
+
+
+def rebuild_rollups(since=None):
+    """Recompute member_monthly_rollups (from `since` onwards, or entirely) and return the row count.
+
+    The ledger tables are locked in SHARE mode while the rows are swapped, the
+    same way rebuild_balances() does it.
+    """
+    db.session.execute(text('LOCK TABLE contributions, fines, attendances IN SHARE MODE'))
+    stale = delete(MemberMonthlyRollup)
+    if since is not None:
+        stale = stale.where(MemberMonthlyRollup.month >= since)
+    db.session.execute(stale)
+    result = db.session.execute(
+        insert(MemberMonthlyRollup).from_select(['member_id', 'month', *ROLLUP_COLUMNS], expected_rollups(since))
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,96 @@
+from functools import cache
+from decimal import Decimal
+from sqlalchemy import select, func, literal, null, cast, union_all
+from app import db
+from app.models.attendance import Attendance, ATTENDED_STATUSES
+from app.models.contribution import Contribution
+from app.models.fines import Fine
+from app.models.loans import Loan
+from app.models.members import Member
+from app.models.member_balance import MemberBalance
+
+RECENT_MODELS = {
+    'contributions': Contribution,
+    'fines': Fine,
+    'loans': Loan,
+    'attendances': Attendance,
+}
+
+
+@cache
+def recent_fields():
+    """The keys each kind exposes: exactly the keys of the model's to_dict().
+
+    Read from a blank instance (after the mappers are configured, hence not at
+    import), so the statement always has the same shape as the per-resource endpoints.
+    """
+    return {kind: tuple(model().to_dict()) for kind, model in RECENT_MODELS.items()}
+
+
+@cache
+def _union_columns():
+    # Every field any kind exposes, with its column type; kinds without it select a typed NULL
+    columns = {}
+    for kind, model in RECENT_MODELS.items():
+        for field in recent_fields()[kind]:
+            columns.setdefault(field, model.__table__.c[field].type)
+    return columns
+
+
+def _recent_rows(member_id, limit):
+    # One UNION ALL of the latest `limit` rows from each ledger: a single round trip.
+    branches = []
+    fields = recent_fields()
+    for kind, model in RECENT_MODELS.items():
+        columns = [
+            (getattr(model, field) if field in fields[kind] else cast(null(), column_type)).label(field)
+            for field, column_type in _union_columns().items()
+        ]
+        latest = select(literal(kind).label('kind'), *columns).where(model.member_id == member_id) \
+            .order_by(model.date.desc(), model.id.desc()).limit(limit).subquery()
+        branches.append(select(latest))
+
+    return db.session.execute(union_all(*branches)).mappings().all()
+
+
+def build_member_statement(member_id, recent_limit=10):
+    """Return the member's profile, aggregates and recent ledger activity, or None if no such member.
+
+    Always two queries: the member joined to its member_balances row (with the
+    attendance counts as scalar subqueries), then the recent rows.
+    """
+    attendance_total = select(func.count(Attendance.id)) \
+        .where(Attendance.member_id == Member.id).scalar_subquery()
+    attendance_attended = select(func.count(Attendance.id)) \
+        .where(Attendance.member_id == Member.id, Attendance.status.in_(ATTENDED_STATUSES)).scalar_subquery()
+
+    row = db.session.execute(
+        select(Member, MemberBalance, attendance_total, attendance_attended)
+        .outerjoin(MemberBalance, MemberBalance.member_id == Member.id)
+        .where(Member.id == member_id)
+    ).first()
+    if row is None:
+        return None
+
+    member, balance, attendance_count, attended = row
+    recent = {kind: [] for kind in RECENT_MODELS}
+    fields = recent_fields()
+    for item in _recent_rows(member_id, recent_limit):
+        recent[item['kind']].append({field: item[field] for field in fields[item['kind']]})
+
+    return {
+        'member': member.to_dict(),
+        'balance': balance.to_dict() if balance else {
+            'member_id': member.id,
+            'total_contributed': Decimal('0.00'),
+            'fines_outstanding': Decimal('0.00'),
+            'loan_principal_outstanding': Decimal('0.00'),
+            'last_activity_date': None
+        },
+        'attendance': {
+            'total': attendance_count,
+            'attended': attended,
+            'rate': round(attended / attendance_count, 4) if attendance_count else 0.0
+        },
+        'recent': recent
+    }
@@ -0,0 +1,172 @@
+import base64
+from datetime import date
+from flask import current_app, jsonify, request
+from sqlalchemy import Date, Float, Numeric, Select, Text, case, cast, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app import db
+
+
+class InvalidListRequest(Exception):
+    """Raised for malformed list query parameters; create_app turns it into a 400 response."""
+
+
+def _encode_cursor(values):
+    raw = ",".join(value.isoformat() if isinstance(value, date) else str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor, columns):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        parts = raw.split(",")
+        if len(parts) != len(columns):
+            raise ValueError
+        return [
+            date.fromisoformat(part) if isinstance(column.type, Date) else int(part)
+            for part, column in zip(parts, columns)
+        ]
+    except ValueError:
+        raise InvalidListRequest("Invalid 'after' cursor")
+
+
+def page_args():
+    """Read limit, after and all from the query string.
+
+    Lists are paged by default. all=true returns every row and is kept only
+    for callers that really need the old unbounded response.
+    """
+    unbounded = request.args.get("all", "").lower() in ("1", "true", "yes")
+    after = request.args.get("after") or None
+
+    limit = request.args.get("limit", current_app.config["LIST_PAGE_SIZE"])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise InvalidListRequest("'limit' must be an integer")
+    if limit < 1 or limit > current_app.config["LIST_MAX_PAGE_SIZE"]:
+        raise InvalidListRequest(f"'limit' must be between 1 and {current_app.config['LIST_MAX_PAGE_SIZE']}")
+
+    return limit, after, unbounded
+
+
+def _fetch(query):
+    if isinstance(query, Select):
+        # Core select: run on the session's connection, so rows come back as plain
+        # tuples without going through the ORM's loading machinery
+        return db.session.connection().execute(query).all()
+    return query.all()
+
+
+def _keyset_query(query, columns, descending):
+    # Order the query and apply the 'after' cursor; returns (query, limit), limit None for all=true
+    limit, after, unbounded = page_args()
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+    if unbounded:
+        return query, None
+
+    if after:
+        key = tuple_(*columns)
+        values = tuple_(*[literal(value, column.type) for value, column in zip(_decode_cursor(after, columns), columns)])
+        query = query.filter(key < values if descending else key > values)
+    return query, limit
+
+
+def keyset_paginate(query, *columns, descending=True):
+    """Apply keyset pagination over columns (the last one must be unique, normally the id).
+
+    Works for entity queries, column queries and Core selects alike. Returns
+    (rows, next_cursor), where next_cursor is None on the last page.
+    """
+    query, limit = _keyset_query(query, columns, descending)
+    if limit is None:
+        return _fetch(query), None
+
+    rows = _fetch(query.limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, _encode_cursor([getattr(rows[-1], column.key) for column in columns])
+
+
+def _json_field(column):
+    # Mirror the Python encoder: Decimal amounts as strings unless JSON_DECIMAL is "number"
+    if isinstance(column.type, Numeric) and not isinstance(column.type, Float) \
+            and current_app.config["JSON_DECIMAL"] == "string":
+        return cast(column, Text)
+    return column
+
+
+def _cursor_part(column):
+    # Same text as _encode_cursor, whatever the session's DateStyle
+    if isinstance(column.type, Date):
+        return func.to_char(column, "YYYY-MM-DD")
+    return cast(column, Text)
+
+
+def _database_page(query, columns, descending, limit):
+    order = [column.desc() if descending else column.asc() for column in columns]
+    numbered = query.add_columns(func.row_number().over(order_by=order).label("_row"))
+    if limit is not None:
+        numbered = numbered.limit(limit + 1)
+    page = numbered.subquery()
+
+    fields = sorted((column for column in page.c if column.key != "_row"), key=lambda column: column.key)
+    row = func.json_build_object(*[part for column in fields for part in (cast(literal(column.key), Text), _json_field(column))])
+    in_page = page.c._row <= limit if limit is not None else None
+
+    body = func.json_agg(aggregate_order_by(row, page.c._row))
+    next_cursor = None
+    if in_page is not None:
+        body = body.filter(in_page)
+        # base64url of "value,value" without padding, as _encode_cursor writes it
+        raw = func.concat_ws(",", *[_cursor_part(page.c[column.key]) for column in columns])
+        encoded = func.rtrim(func.translate(func.encode(func.convert_to(raw, "UTF8"), "base64"), "+/\n", "-_"), "=")
+        next_cursor = case((func.count() > limit, func.max(encoded).filter(page.c._row == limit)))
+
+    statement = select(func.coalesce(cast(body, Text), "[]"), next_cursor)
+    return tuple(db.session.connection().execute(statement).one())
+
+
+def json_page(query, *columns, descending=True):
+    """Build one keyset page of a Core select as JSON text; see keyset_paginate for columns.
+
+    On Postgres, with LIST_JSON_IN_DATABASE on, pages of at least
+    LIST_JSON_IN_DATABASE_MIN_LIMIT rows and all=true lists are built by the
+    database with json_agg/json_build_object, next cursor included, so Python
+    never sees the rows: it passes the text through. Otherwise the rows are
+    fetched and encoded by the app's JSON provider. Both write the same values,
+    keys sorted; an empty page is []. Returns (body, next_cursor).
+    """
+    limit, _, unbounded = page_args()
+    # Small pages are cheaper to encode here than the aggregate statement is to build
+    large = unbounded or limit >= current_app.config["LIST_JSON_IN_DATABASE_MIN_LIMIT"]
+    if large and current_app.config["LIST_JSON_IN_DATABASE"] and db.session.get_bind().dialect.name == "postgresql":
+        query, limit = _keyset_query(query, columns, descending)
+        return _database_page(query, columns, descending, limit)
+
+    rows, next_cursor = keyset_paginate(query, *columns, descending=descending)
+    return current_app.json.dumps(row_dicts(rows)), next_cursor
+
+
+def row_dicts(rows):
+    """Turn column rows into the dicts a list endpoint returns, keyed by column name."""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def page_response(items, next_cursor):
+    """Serialize a page; the cursor for the following page travels in the X-Next-Cursor header.
+
+    items may also be a page already encoded as JSON text (json_page), which is sent as is.
+    """
+    if isinstance(items, str):
+        response = current_app.response_class(items + "\n", mimetype=current_app.json.mimetype)
+    else:
+        response = jsonify(items)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
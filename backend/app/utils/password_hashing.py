@@ -0,0 +1,104 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when the hashing pool has no free slot, so the route can answer 503 straight away."""
+
+    def __init__(self, retry_after):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a bounded worker pool.
+
+    Hashing is deliberately slow, so a burst of logins could otherwise occupy
+    every request thread. At most PASSWORD_HASH_WORKERS hashes run at once and
+    at most PASSWORD_HASH_QUEUE_DEPTH more may wait; anything beyond that is
+    rejected with HashingPoolSaturated instead of queueing without bound.
+
+    The limit is per process, so it is also capped at half of WEB_THREADS, the
+    request threads each gunicorn gthread worker runs (see gunicorn.conf.py).
+    Requests blocked on a hash can then never hold more than half of a
+    worker's threads, and the 503 is returned while the rest still serve.
+    """
+
+    def __init__(self):
+        self.executor_type = 'thread'
+        self.workers = os.cpu_count() or 2
+        self.queue_depth = 16
+        self.retry_after = 2
+        self.timeout = 10
+        self.web_threads = 16
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.executor_type = app.config.get('PASSWORD_HASH_EXECUTOR', self.executor_type)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or self.workers
+        self.queue_depth = app.config.get('PASSWORD_HASH_QUEUE_DEPTH', self.queue_depth)
+        self.retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER', self.retry_after)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        self.web_threads = app.config.get('WEB_THREADS', self.web_threads)
+        self.shutdown()
+
+    @property
+    def slot_count(self):
+        """Hashes that may run or wait at once in this process."""
+        return max(1, min(self.workers + self.queue_depth, self.web_threads // 2))
+
+    def _get_executor(self):
+        # Pools are created lazily and per process, so gunicorn workers forked
+        # from a preloaded master never share the master's pool.
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            with self._lock:
+                if self._executor is None or self._pid != pid:
+                    if self.executor_type == 'process':
+                        self._executor = ProcessPoolExecutor(max_workers=min(self.workers, self.slot_count))
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=min(self.workers, self.slot_count),
+                                                            thread_name_prefix='password-hash')
+                    self._slots = threading.BoundedSemaphore(self.slot_count)
+                    self._pid = pid
+        return self._executor
+
+    def _run(self, fn, *args):
+        executor = self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingPoolSaturated(self.retry_after)
+
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingPoolSaturated(self.retry_after)
+
+    def generate(self, password):
+        return self._run(generate_password_hash, password)
+
+    def check(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._slots = None
+            self._pid = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,314 @@
+import hmac
+import json
+import re
+import secrets
+import string
+import urllib.error
+import urllib.request
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from sqlalchemy import Integer, any_, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from app import db
+from app.models.fines import Fine
+from app.models.loans import Loan
+from app.models.payment import Payment, PaymentAllocation
+from app.utils.contribution_import import normalize_phone, phone_directory
+from app.utils.response_cache import response_cache
+
+# The provider sends the shared secret (PAYMENT_CALLBACK_SECRET) in this header
+CALLBACK_HEADER = 'X-Callback-Token'
+
+# Payments still holding money that has not been applied to a fine or loan
+OPEN_STATUSES = ('unallocated', 'partial')
+
+# payments.amount is Numeric(10, 2)
+MAX_AMOUNT = Decimal('99999999.99')
+
+# "FINE-12", "loan 3", "LOAN3": pay that debt first
+ACCOUNT_REF = re.compile(r'^(FINE|LOAN)\W*(\d+)$', re.IGNORECASE)
+
+# Debts are settled in this order: fines, then loans, oldest first within each
+DEBT_MODELS = (('fine', Fine), ('loan', Loan))
+
+
+class PaymentCallbackError(Exception):
+    """Raised for a callback body that is not a valid payment notification."""
+
+
+def callback_authorized(token):
+    """Check the callback's shared secret; callbacks are refused while none is configured."""
+    secret = current_app.config['PAYMENT_CALLBACK_SECRET']
+    return bool(secret) and hmac.compare_digest((token or '').encode(), secret.encode())
+
+
+def parse_callback(payload):
+    """Validate an M-Pesa C2B confirmation body and return the Payment column values."""
+    if not isinstance(payload, dict):
+        raise PaymentCallbackError("Request body must be a JSON object")
+
+    provider_ref = str(payload.get('TransID') or '').strip()
+    if not provider_ref or len(provider_ref) > 50:
+        raise PaymentCallbackError("'TransID' is required and must be at most 50 characters")
+
+    try:
+        amount = Decimal(str(payload.get('TransAmount')).strip())
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite() or amount <= 0 or amount > MAX_AMOUNT \
+            or amount != amount.quantize(Decimal('0.01')):
+        raise PaymentCallbackError("'TransAmount' must be a positive amount with at most two decimal places")
+
+    phone = str(payload.get('MSISDN') or '').strip()
+    if not phone:
+        raise PaymentCallbackError("'MSISDN' is required")
+
+    try:
+        paid_on = datetime.strptime(str(payload.get('TransTime') or ''), '%Y%m%d%H%M%S').date()
+    except ValueError:
+        raise PaymentCallbackError("'TransTime' must be in YYYYMMDDHHMMSS format")
+
+    return {
+        'provider_ref': provider_ref,
+        'phone': normalize_phone(phone) or phone[:20],
+        'account_ref': str(payload.get('BillRefNumber') or '').strip()[:50] or None,
+        'amount': amount,
+        'date': paid_on
+    }
+
+
+def record_payment(values):
+    """Store a parsed callback and commit; a repeated callback for the same transaction is ignored.
+
+    Returns (payment id, created). Matching the payment to a member and
+    settling debts with it is left to reconcile_payments, so the provider gets
+    its acknowledgement straight away.
+    """
+    statement = pg_insert(Payment).values(**values, allocated_amount=0, status='unallocated') \
+        .on_conflict_do_nothing(index_elements=['provider_ref']).returning(Payment.id)
+    payment_id = db.session.execute(statement).scalar()
+    created = payment_id is not None
+    if not created:
+        payment_id = db.session.execute(
+            select(Payment.id).where(Payment.provider_ref == values['provider_ref'])
+        ).scalar()
+    db.session.commit()
+    return payment_id, created
+
+
+def _ids(values):
+    # One array parameter: id = ANY(%(ids)s)
+    return literal(sorted(values), ARRAY(Integer))
+
+
+def _match_members():
+    """Attach a member to every payment whose phone belongs to one, in bulk.
+
+    Payments nobody owns are marked unmatched and tried again on the next run,
+    for example after the member has been added. Returns (matched, unmatched).
+    """
+    pending = db.session.execute(
+        select(Payment.id, Payment.phone).where(Payment.status.in_(('unmatched', 'unallocated')),
+                                                Payment.member_id.is_(None))
+    ).all()
+    if not pending:
+        return 0, 0
+
+    directory = phone_directory()
+    matched = [
+        {'id': payment_id, 'member_id': directory[normalize_phone(phone)], 'status': 'unallocated'}
+        for payment_id, phone in pending if normalize_phone(phone) in directory
+    ]
+    unmatched = {payment_id for payment_id, phone in pending if normalize_phone(phone) not in directory}
+
+    if matched:
+        # ORM bulk UPDATE by primary key: one executemany
+        db.session.execute(update(Payment), matched)
+    if unmatched:
+        db.session.execute(
+            update(Payment).where(Payment.id == any_(_ids(unmatched))).values(status='unmatched')
+            .execution_options(synchronize_session=False)
+        )
+    db.session.commit()
+    return len(matched), len(unmatched)
+
+
+def _outstanding_debts(kind, model, member_ids):
+    """Lock and return (id, member_id, amount still owed) for every unpaid debt of the members.
+
+    Uses the (member_id, date) index of the debt table and the payment_allocations
+    index on the debt id, in settlement order.
+    """
+    allocation_column = PaymentAllocation.fine_id if kind == 'fine' else PaymentAllocation.loan_id
+    allocated = select(func.coalesce(func.sum(PaymentAllocation.amount), 0)) \
+        .where(allocation_column == model.id).scalar_subquery()
+    return db.session.execute(
+        select(model.id, model.member_id, (model.amount - allocated).label('owed'))
+        .where(model.member_id == any_(_ids(member_ids)), func.coalesce(model.status, 'pending') != 'paid')
+        .order_by(model.member_id, model.date, model.id)
+        .with_for_update(of=model)
+    ).all()
+
+
+def _account_target(account_ref):
+    match = ACCOUNT_REF.match(account_ref or '')
+    return (match.group(1).lower(), int(match.group(2))) if match else None
+
+
+def _reconcile_batch(payments):
+    """Allocate one batch of open payments and write the result in a handful of statements."""
+    member_ids = {payment.member_id for payment in payments}
+    debts = {}
+    settled = {kind: set() for kind, _ in DEBT_MODELS}
+    # Members whose fines or loans changed, for the response cache
+    touched = {kind: set() for kind, _ in DEBT_MODELS}
+    for kind, model in DEBT_MODELS:
+        for debt_id, member_id, owed in _outstanding_debts(kind, model, member_ids):
+            if owed <= 0:
+                # Fully covered already (e.g. its status was edited back); just close it
+                settled[kind].add(debt_id)
+                touched[kind].add(member_id)
+            else:
+                debts.setdefault(member_id, []).append([kind, debt_id, owed])
+
+    allocations = []
+    payment_updates = []
+    for payment in payments:
+        remaining = payment.amount - payment.allocated_amount
+        target = _account_target(payment.account_ref)
+        queue = debts.get(payment.member_id, [])
+        if target:
+            # Stable sort: the debt named in the account reference first, the rest in order
+            queue = sorted(queue, key=lambda debt: (debt[0], debt[1]) != target)
+
+        for debt in queue:
+            if not remaining:
+                break
+            if not debt[2]:
+                continue
+            share = min(remaining, debt[2])
+            debt[2] -= share
+            remaining -= share
+            allocations.append({'payment_id': payment.id, f'{debt[0]}_id': debt[1], 'amount': share})
+            if not debt[2]:
+                settled[debt[0]].add(debt[1])
+                touched[debt[0]].add(payment.member_id)
+
+        if remaining != payment.amount - payment.allocated_amount:
+            payment_updates.append({
+                'id': payment.id,
+                'allocated_amount': payment.amount - remaining,
+                'status': 'partial' if remaining else 'allocated'
+            })
+
+    if allocations:
+        # Rows missing a fine_id or loan_id get NULL there
+        db.session.execute(insert(PaymentAllocation), [
+            {'fine_id': None, 'loan_id': None, **allocation} for allocation in allocations
+        ])
+    for kind, model in DEBT_MODELS:
+        if settled[kind]:
+            db.session.execute(
+                update(model).where(model.id == any_(_ids(settled[kind]))).values(status='paid')
+                .execution_options(synchronize_session=False)
+            )
+    if payment_updates:
+        db.session.execute(update(Payment), payment_updates)
+    db.session.commit()
+    for kind, model in DEBT_MODELS:
+        response_cache.invalidate(model, *touched[kind])
+
+    return {
+        'allocations': len(allocations),
+        'allocated': sum((allocation['amount'] for allocation in allocations), Decimal('0.00')),
+        'fines_settled': len(settled['fine']),
+        'loans_settled': len(settled['loan'])
+    }
+
+
+def reconcile_payments(batch_size=None):
+    """Match received payments to members and settle their outstanding fines and loans.
+
+    Open payments are taken in id order, PAYMENT_RECONCILE_BATCH_SIZE at a time,
+    with FOR UPDATE SKIP LOCKED so concurrent runs never share a payment. For
+    each batch the members' unpaid debts are loaded with one indexed query per
+    debt table, allocated oldest first (fines before loans, a debt named in the
+    payment's account reference before everything else), and the allocations,
+    settled debts and payment totals are written in bulk before the batch
+    commits. Money left over stays on the payment for the next run.
+    Returns a report dict.
+    """
+    batch_size = batch_size or current_app.config['PAYMENT_RECONCILE_BATCH_SIZE']
+    matched, unmatched = _match_members()
+    report = {'matched': matched, 'unmatched': unmatched, 'payments': 0,
+              'allocations': 0, 'allocated': Decimal('0.00'), 'fines_settled': 0, 'loans_settled': 0}
+
+    last_id = 0
+    while True:
+        payments = db.session.execute(
+            select(Payment.id, Payment.member_id, Payment.amount, Payment.allocated_amount, Payment.account_ref)
+            .where(Payment.status.in_(OPEN_STATUSES), Payment.member_id.isnot(None), Payment.id > last_id)
+            .order_by(Payment.id).limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not payments:
+            break
+
+        for key, value in _reconcile_batch(payments).items():
+            report[key] += value
+        report['payments'] += len(payments)
+        last_id = payments[-1].id
+        if len(payments) < batch_size:
+            break
+
+    return report
+
+
+def callback_payload(phone, amount, account_ref='', when=None, provider_ref=None):
+    """Build a C2B confirmation body shaped like the ones M-Pesa sends."""
+    return {
+        'TransactionType': 'Pay Bill',
+        'TransID': provider_ref or ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(10)),
+        'TransTime': (when or datetime.now()).strftime('%Y%m%d%H%M%S'),
+        'TransAmount': str(amount),
+        'BusinessShortCode': '600000',
+        'BillRefNumber': account_ref,
+        'MSISDN': phone,
+        'FirstName': 'STUB'
+    }
+
+
+class StubPaymentProvider:
+    """Stands in for the mobile-money provider in local development and offline tests.
+
+    pay() sends a callback the way the provider would, with the shared secret:
+    through the app's test client by default, or over HTTP to `url` (the
+    /payment/callback endpoint of a running server). Every payload sent is
+    kept in `sent`.
+    """
+
+    def __init__(self, app, url=None):
+        self.app = app
+        self.url = url
+        self.sent = []
+
+    def pay(self, phone, amount, account_ref='', when=None, provider_ref=None):
+        """Deliver one payment callback and return (status code, response body)."""
+        payload = callback_payload(phone, amount, account_ref, when, provider_ref)
+        headers = {CALLBACK_HEADER: self.app.config['PAYMENT_CALLBACK_SECRET'] or ''}
+        self.sent.append(payload)
+
+        if not self.url:
+            response = self.app.test_client().post('/payment/callback', json=payload, headers=headers)
+            return response.status_code, response.get_json()
+
+        request = urllib.request.Request(
+            self.url, data=json.dumps(payload).encode(), method='POST',
+            headers={**headers, 'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read() or b'null')
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity
+from werkzeug.http import unquote_etag
+
+
+# A stored GET response; headers are the few worth replaying (content type, pagination cursor, ETag).
+# tag is the table-version tag (app/utils/table_versions.py) current when the body was built.
+CachedResponse = namedtuple('CachedResponse', ['owner', 'expires', 'tag', 'status', 'headers', 'body'])
+
+REPLAYED_HEADERS = ('Content-Type', 'X-Next-Cursor', 'ETag')
+
+# Rough per-entry bookkeeping cost on top of the body, so tiny bodies still count
+ENTRY_OVERHEAD = 256
+
+
+class ResponseCache:
+    """Bounded LRU cache of per-member GET responses with a time-to-live.
+
+    Entries are keyed by (endpoint, member id, query args) and grouped by the
+    ledger table they were read from, so a write invalidates exactly the
+    affected members' entries for that table and nothing else. The cache is
+    bounded by the total size of the cached bodies, not by the entry count.
+
+    Routes that write a ledger row call invalidate() after committing, which
+    keeps this process exact. Writes made by other worker processes or straight
+    to the database are caught by the table-version tag that @conditional_get
+    puts on flask.g: an entry built under another tag is a miss. Without table
+    versions (other databases) those writes show up within the TTL.
+    A per-member generation counter stops a response computed before a write
+    from being stored after that write's invalidation.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entry_bytes=1024 * 1024, ttl=300):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_member = {}
+        self._generations = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('RESPONSE_CACHE_MAX_BYTES', self.max_bytes)
+        self.max_entry_bytes = app.config.get('RESPONSE_CACHE_MAX_ENTRY_BYTES', self.max_entry_bytes)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', self.ttl)
+        self.clear()
+
+    def per_member(self, model):
+        """Cache a GET route's responses per member; the member is the <member_id> URL argument or the caller.
+
+        Put it below @role_required so the role check still runs on every request,
+        and below @conditional_get so a 304 never reaches it.
+        """
+        group = model.__tablename__
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if request.method != 'GET' or not self.max_bytes:
+                    return fn(*args, **kwargs)
+
+                member_id = int(kwargs['member_id'] if 'member_id' in kwargs else get_jwt_identity())
+                key = (request.endpoint, member_id, tuple(sorted(request.args.items(multi=True))))
+                owner = (group, member_id)
+
+                now = time.monotonic()
+                tag = g.get('etag')
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry.expires > now and entry.tag == tag:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        if 'ETag' in entry.headers and \
+                                request.if_none_match.contains_weak(unquote_etag(entry.headers['ETag'])[0]):
+                            # The client already holds exactly this body
+                            return current_app.response_class(
+                                status=304, headers={'ETag': entry.headers['ETag'], 'X-Cache': 'HIT'})
+                        return current_app.response_class(
+                            entry.body, status=entry.status, headers={**entry.headers, 'X-Cache': 'HIT'})
+                    self.misses += 1
+                    generation = self._generations.get(owner, 0)
+
+                response = current_app.make_response(fn(*args, **kwargs))
+                response.headers['X-Cache'] = 'MISS'
+                if response.status_code == 200 and tag:
+                    # Tag the body with the table versions it was read at (app/utils/table_versions.py),
+                    # so a replayed body never goes out under a newer version's tag
+                    response.set_etag(tag)
+                if response.status_code < 500 and not response.direct_passthrough:
+                    self._store(key, owner, generation, tag, now, response)
+                return response
+            return wrapper
+        return decorator
+
+    def _store(self, key, owner, generation, tag, now, response):
+        body = response.get_data()
+        size = len(body) + ENTRY_OVERHEAD
+        if size > self.max_entry_bytes:
+            return
+        headers = {name: response.headers[name] for name in REPLAYED_HEADERS if name in response.headers}
+
+        with self._lock:
+            if self._generations.get(owner, 0) != generation:
+                # A write for this member committed while the response was being built
+                return
+            self._discard(key)
+            self._entries[key] = CachedResponse(owner, now + self.ttl, tag, response.status_code, headers, body)
+            self._keys_by_member.setdefault(owner, set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body) + ENTRY_OVERHEAD
+        keys = self._keys_by_member[entry.owner]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_member[entry.owner]
+
+    def invalidate(self, model, *member_ids):
+        """Drop the cached responses read from model's table for these members."""
+        group = model.__tablename__
+        with self._lock:
+            for member_id in member_ids:
+                if member_id is None:
+                    continue
+                owner = (group, int(member_id))
+                self._generations[owner] = self._generations.get(owner, 0) + 1
+                for key in list(self._keys_by_member.get(owner, ())):
+                    self._discard(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_member.clear()
+            self._generations.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+response_cache = ResponseCache()
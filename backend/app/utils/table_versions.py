@@ -0,0 +1,69 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select
+
+from app import db
+from app.models.table_version import TableVersion
+
+
+def current_versions(tables):
+    """Return the versions of `tables` in order, or None when they are not tracked.
+
+    The counters are kept by Postgres triggers, so other databases have none.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return None
+    versions = dict(db.session.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    ).all())
+    if len(versions) != len(tables):
+        return None
+    return [versions[table] for table in tables]
+
+
+def conditional_get(*models):
+    """Answer If-None-Match on a GET route from the table versions alone.
+
+    The ETag combines the versions of the models' tables with the endpoint,
+    the query string and the member, so a 304 costs one primary-key lookup
+    and no row is queried or serialised. The versions are read before the
+    view runs: a write that lands in between can only make the body newer
+    than its tag, which costs the client one extra download, never a stale
+    page. Put it below @role_required.
+    """
+    tables = [model.__tablename__ for model in models]
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return fn(*args, **kwargs)
+            versions = current_versions(tables)
+            if versions is None:
+                return fn(*args, **kwargs)
+
+            # The member is part of the tag (the <member_id> in the URL, otherwise the
+            # caller, as in response_cache): /x/my bodies differ per member, and a
+            # browser shared by two members must not revalidate one's page for the other
+            member_id = kwargs['member_id'] if 'member_id' in kwargs else get_jwt_identity()
+            scope = repr((request.endpoint, sorted(request.args.items(multi=True)), str(member_id)))
+            tag = "-".join(map(str, versions)) + "-" + hashlib.blake2b(scope.encode(), digest_size=8).hexdigest()
+            # response_cache stores this tag with the body it caches
+            g.etag = tag
+
+            if request.if_none_match.contains_weak(tag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            if 'ETag' not in response.headers:
+                response.set_etag(tag)
+            # Let the browser keep the body but always revalidate it
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
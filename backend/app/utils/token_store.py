@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timezone
+from flask_jwt_extended import create_refresh_token, decode_token
+from app import db
+from app.models.refresh_tokens import RefreshToken
+
+
+class RefreshTokenReused(Exception):
+    """Raised when a refresh token is presented after it was already rotated or revoked."""
+
+
+def issue_refresh_token(member_id, family_id=None):
+    """Create a refresh token, record it in the store and return the encoded token.
+
+    The caller owns the transaction and must commit.
+    """
+    family_id = family_id or str(uuid.uuid4())
+    token = create_refresh_token(identity=member_id, additional_claims={"family": family_id})
+    decoded = decode_token(token)
+
+    db.session.add(RefreshToken(
+        jti=decoded["jti"],
+        family_id=family_id,
+        member_id=member_id,
+        expires_at=datetime.fromtimestamp(decoded["exp"], tz=timezone.utc)
+    ))
+    return token
+
+
+def rotate_refresh_token(claims):
+    """Swap the verified refresh token described by claims for a new one in the same family.
+
+    The swap is a single conditional UPDATE, so two concurrent refreshes with the
+    same token cannot both succeed. Presenting a token that was already rotated
+    means it leaked: the whole family is revoked and RefreshTokenReused is raised.
+    """
+    new_token = issue_refresh_token(claims["sub"], claims.get("family"))
+    new_jti = decode_token(new_token)["jti"]
+
+    rotated = RefreshToken.query.filter(
+        RefreshToken.jti == claims["jti"],
+        RefreshToken.replaced_by.is_(None),
+        RefreshToken.revoked.is_(False)
+    ).update({"replaced_by": new_jti}, synchronize_session=False)
+
+    if not rotated:
+        db.session.rollback()
+        revoke_family(claims.get("family"))
+        db.session.commit()
+        raise RefreshTokenReused()
+
+    return new_token
+
+
+def revoke_family(family_id):
+    if family_id:
+        RefreshToken.query.filter_by(family_id=family_id) \
+            .update({"revoked": True}, synchronize_session=False)
+
+
+def purge_expired_tokens(member_id):
+    RefreshToken.query.filter(
+        RefreshToken.member_id == member_id,
+        RefreshToken.expires_at < datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
@@ -0,0 +1,134 @@
+from datetime import date
+from flask import current_app
+from sqlalchemy import Integer, any_, delete, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import aliased
+from app import db
+
+
+class InvalidWriteRequest(Exception):
+    """Raised for a malformed write request body; create_app turns it into a 400 response."""
+
+
+def _parse_date(value, name):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise InvalidWriteRequest(f"'{name}' must be in YYYY-MM-DD format")
+
+
+def bulk_criteria(model, data):
+    """Build the WHERE criteria of a bulk write from a JSON body.
+
+    The body selects rows by "ids" (a list of ids), by "filter" (an object with
+    any of date, date_from, date_to, member_id and status), or both. At least
+    one condition is required so a bulk write can never touch a whole table by
+    accident.
+    """
+    if not isinstance(data, dict):
+        raise InvalidWriteRequest("Request body must be a JSON object")
+
+    criteria = []
+    ids = data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not ids \
+                or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            raise InvalidWriteRequest("'ids' must be a non-empty list of integers")
+        max_ids = current_app.config['BULK_MAX_IDS']
+        if len(ids) > max_ids:
+            raise InvalidWriteRequest(f"At most {max_ids} ids can be changed at once")
+        # One array parameter: id = ANY(%(ids)s)
+        criteria.append(model.id == any_(literal(ids, ARRAY(Integer))))
+
+    filters = data.get('filter') or {}
+    if not isinstance(filters, dict):
+        raise InvalidWriteRequest("'filter' must be an object")
+    unknown = set(filters) - {'date', 'date_from', 'date_to', 'member_id', 'status'}
+    if unknown or ('status' in filters and not hasattr(model, 'status')):
+        raise InvalidWriteRequest("Unsupported filter(s): " + ", ".join(sorted(unknown or {'status'})))
+
+    if 'date' in filters:
+        criteria.append(model.date == _parse_date(filters['date'], 'date'))
+    if 'date_from' in filters:
+        criteria.append(model.date >= _parse_date(filters['date_from'], 'date_from'))
+    if 'date_to' in filters:
+        criteria.append(model.date <= _parse_date(filters['date_to'], 'date_to'))
+    if 'member_id' in filters:
+        if not isinstance(filters['member_id'], int) or isinstance(filters['member_id'], bool):
+            raise InvalidWriteRequest("'member_id' must be an integer")
+        criteria.append(model.member_id == filters['member_id'])
+    if 'status' in filters:
+        criteria.append(model.status == filters['status'])
+
+    if not criteria:
+        raise InvalidWriteRequest("Provide 'ids' or at least one 'filter' condition")
+    return criteria
+
+
+def bulk_update(model, criteria, values):
+    """UPDATE every matching row in one statement and commit.
+
+    Returns (affected row count, set of affected member ids).
+    """
+    statement = update(model).where(*criteria).values(**values).returning(model.member_id) \
+        .execution_options(synchronize_session=False)
+    member_ids = [member_id for (member_id,) in db.session.execute(statement)]
+    db.session.commit()
+    return len(member_ids), set(member_ids)
+
+
+def bulk_delete(model, criteria):
+    """DELETE every matching row in one statement and commit.
+
+    Returns (affected row count, set of affected member ids).
+    """
+    statement = delete(model).where(*criteria).returning(model.member_id) \
+        .execution_options(synchronize_session=False)
+    member_ids = [member_id for (member_id,) in db.session.execute(statement)]
+    db.session.commit()
+    return len(member_ids), set(member_ids)
+
+
+def update_by_id(model, record_id, values, *returning, criteria=()):
+    """UPDATE one row by id with a single UPDATE ... RETURNING and commit.
+
+    `criteria` adds conditions the row must also meet. Returns the RETURNING
+    row (model.id unless other columns are given), or None when no row
+    matched, which callers answer with a 404. With no values to set it only
+    checks that the row exists.
+    """
+    returning = returning or (model.id,)
+    if not values:
+        return db.session.execute(select(*returning).where(model.id == record_id, *criteria)).first()
+
+    statement = update(model).where(model.id == record_id, *criteria).values(**values) \
+        .returning(*returning).execution_options(synchronize_session=False)
+    row = db.session.execute(statement).first()
+    db.session.commit()
+    return row
+
+
+def update_member_record(model, record_id, values):
+    """update_by_id for a ledger row, returning (member id before, member id after).
+
+    An edit can move a record to another member, and both members' cached
+    responses then need invalidating. Joining the table to itself in the
+    UPDATE ... FROM reads the old value in the same statement. Returns None
+    when there is no such row.
+    """
+    before = aliased(model)
+    return update_by_id(model, record_id, values, before.member_id, model.member_id,
+                        criteria=(before.id == model.id,))
+
+
+def delete_by_id(model, record_id, *returning):
+    """DELETE one row by id with a single DELETE ... RETURNING and commit.
+
+    Returns the RETURNING row (model.id unless other columns are given), or
+    None when there was no such row.
+    """
+    statement = delete(model).where(model.id == record_id).returning(*(returning or (model.id,))) \
+        .execution_options(synchronize_session=False)
+    row = db.session.execute(statement).first()
+    db.session.commit()
+    return row
@@ -0,0 +1,145 @@
+# index_benchmark.py
+# Seeds a reproducible data set and reports lookup latency with and without the
+# member_id / email indexes added in migration 452a9126a154.
+#
+# DATABASE_URL must name a scratch database, and the script refuses to run
+# without one (see scratch_db.py): it creates missing tables, inserts synthetic
+# members and ledger rows, and drops/recreates the indexes.
+#   DATABASE_URL=postgresql://.../chama_bench python benchmarks/index_benchmark.py
+#   DATABASE_URL=... python benchmarks/index_benchmark.py --members 2000 --rows-per-member 100 --runs 200
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scratch_db import require_scratch_database
+from sqlalchemy import func, insert, text
+from app import create_app, db
+from app.models.attendance import Attendance
+from app.models.contribution import Contribution
+from app.models.fines import Fine
+from app.models.loans import Loan
+from app.models.members import Member
+
+BENCH_INDEXES = [
+    'ix_contributions_member_id_date',
+    'ix_fines_member_id_date',
+    'ix_loans_member_id_date',
+    'ix_members_email_lower',
+]
+
+
+def bench_indexes():
+    tables = [Member.__table__, Contribution.__table__, Fine.__table__, Loan.__table__, Attendance.__table__]
+    return [index for table in tables for index in table.indexes if index.name in BENCH_INDEXES]
+
+
+def seed(members, rows_per_member):
+    if db.session.query(Member.id).filter(Member.email.like('bench-%')).first():
+        print("Benchmark data already present, skipping seed.")
+        return
+
+    rng = random.Random(2026)
+    start = date(2020, 1, 1)
+    print(f"Seeding {members} members and {rows_per_member} rows per member per table...")
+
+    db.session.execute(insert(Member), [{
+        'name': f'Bench Member {i}',
+        'email': f'bench-{i}@Example.com',
+        'phone': f'2547{i:08d}',
+        'gender': 'female' if i % 2 else 'male',
+        'password_hash': 'not-a-real-hash',
+        'role': 'member',
+    } for i in range(members)])
+    member_ids = [row[0] for row in db.session.query(Member.id).filter(Member.email.like('bench-%'))]
+
+    for model, extra in (
+        (Contribution, lambda: {'amount': rng.randrange(100, 5000)}),
+        (Fine, lambda: {'amount': rng.randrange(50, 500), 'status': rng.choice(['pending', 'paid']), 'reason': 'Late'}),
+        (Loan, lambda: {'amount': rng.randrange(1000, 50000), 'status': rng.choice(['borrowed', 'paid'])}),
+        (Attendance, lambda: {'status': rng.choice(['present', 'absent', 'late'])}),
+    ):
+        batch = []
+        for member_id in member_ids:
+            # Distinct dates per member: attendances are unique per (member_id, date)
+            for day in rng.sample(range(2000), rows_per_member):
+                batch.append({'member_id': member_id, 'date': start + timedelta(days=day), **extra()})
+                if len(batch) == 10000:
+                    db.session.execute(insert(model), batch)
+                    batch = []
+        if batch:
+            db.session.execute(insert(model), batch)
+    db.session.commit()
+
+
+def analyze():
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+
+def measure(runs, member_ids, emails):
+    rng = random.Random(7)
+    queries = {
+        'contributions by member': lambda: Contribution.query.filter_by(member_id=rng.choice(member_ids)).all(),
+        'fines by member': lambda: Fine.query.filter_by(member_id=rng.choice(member_ids)).all(),
+        'loans by member': lambda: Loan.query.filter_by(member_id=rng.choice(member_ids)).all(),
+        'attendances by member': lambda: Attendance.query.filter_by(member_id=rng.choice(member_ids)).all(),
+        'login email lookup': lambda: Member.query.filter(
+            func.lower(Member.email) == rng.choice(emails).lower()).first(),
+    }
+    results = {}
+    for name, run in queries.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+            db.session.expunge_all()
+        timings.sort()
+        results[name] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark member_id and email lookup indexes")
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--rows-per-member", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    require_scratch_database(app)
+    with app.app_context():
+        db.create_all()
+        seed(args.members, args.rows_per_member)
+        member_ids = [row[0] for row in db.session.query(Member.id).filter(Member.email.like('bench-%'))]
+        emails = [row[0] for row in db.session.query(Member.email).filter(Member.email.like('bench-%'))]
+
+        # DROP INDEX IF EXISTS rather than checkfirst, which misses expression indexes
+        for index in bench_indexes():
+            db.session.execute(text(f'DROP INDEX IF EXISTS {index.name}'))
+        db.session.commit()
+        analyze()
+        before = measure(args.runs, member_ids, emails)
+
+        for index in bench_indexes():
+            index.create(bind=db.engine)
+        analyze()
+        after = measure(args.runs, member_ids, emails)
+
+    print(f"\n{'query':<26} {'before p50':>11} {'after p50':>10} {'before p95':>11} {'after p95':>10} {'speedup':>8}")
+    for name in before:
+        b50, b95 = before[name]
+        a50, a95 = after[name]
+        print(f"{name:<26} {b50:>9.2f}ms {a50:>8.2f}ms {b95:>9.2f}ms {a95:>8.2f}ms {b50 / a50 if a50 else 0:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
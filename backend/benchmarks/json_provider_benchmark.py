@@ -0,0 +1,92 @@
+# json_provider_benchmark.py
+# Times jsonify-style responses of large lists of to_dict() rows (ints,
+# Decimal amounts, dates and strings, as the list endpoints return them)
+# through Flask's stock json-module provider and the orjson provider, with
+# both Decimal policies, and checks that they carry the same values.
+#
+# Needs no database: the rows are generated in memory.
+#   python benchmarks/json_provider_benchmark.py
+#   python benchmarks/json_provider_benchmark.py --rows 1000 10000 100000
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from app.utils.json_provider import OrjsonProvider
+
+
+def synthetic_rows(size):
+    rng = random.Random(2026)
+    today = date.today()
+    return [
+        {
+            'id': row_id,
+            'member_id': rng.randrange(1, 200),
+            'amount': Decimal(rng.randrange(100, 5000000)) / 100,
+            'date': today - timedelta(days=rng.randrange(0, 720)),
+            'reason': rng.choice(['Late to meeting', 'Absent from meeting', 'No contribution by the 5th']),
+            'status': rng.choice(['paid', 'unpaid'])
+        }
+        for row_id in range(1, size + 1)
+    ]
+
+
+def timed(fn, runs):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def same_values(stock_body, fast_body):
+    # The stock provider writes RFC 822 dates, the orjson one ISO dates; compare the values
+    stock, fast = json.loads(stock_body), json.loads(fast_body)
+    for row in stock:
+        row['date'] = parsedate_to_datetime(row['date']).date().isoformat()
+    return stock == fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSON providers on list responses")
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    providers = [('stock', DefaultJSONProvider(app))]
+    for policy in ('string', 'number'):
+        app.config['JSON_DECIMAL'] = policy
+        providers.append((f'orjson/{policy}', OrjsonProvider(app)))
+
+    print(f"{'rows':>8} {'provider':>14} {'time':>10} {'speedup':>8} {'size':>10}  values")
+    with app.app_context():
+        for size in args.rows:
+            rows = synthetic_rows(size)
+            stock_ms = stock_body = None
+            for name, provider in providers:
+                elapsed_ms, response = timed(lambda: provider.response(rows), args.runs)
+                body = response.get_data()
+                if stock_ms is None:
+                    stock_ms, stock_body, check = elapsed_ms, body, '-'
+                elif name.endswith('string'):
+                    check = 'ok' if same_values(stock_body, body) else 'MISMATCH'
+                else:
+                    check = 'numbers'
+                print(f"{size:>8} {name:>14} {elapsed_ms:>8.1f}ms {stock_ms / elapsed_ms:>7.1f}x "
+                      f"{len(body) / 1024:>8.0f}kB  {check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# list_read_benchmark.py
+# Compares the ways a GET /contribution, /fine, /loan or /attendance page can
+# be built: loading ORM instances and calling to_dict() on each, a column
+# select whose rows go to the encoder as plain tuples, and the Postgres
+# json_agg body the routes use (json_page), which Python only passes through.
+# Reports wall time and this process's CPU time (best of --runs) and peak
+# Python memory (tracemalloc) per page size, from the query through the JSON
+# body. Wall time includes the database's own work; CPU time does not.
+#
+# DATABASE_URL must name a scratch database, and the script refuses to run
+# without one (see scratch_db.py); the data set is seeded as in index_benchmark.py.
+#   DATABASE_URL=postgresql://.../chama_bench python benchmarks/list_read_benchmark.py
+#   DATABASE_URL=... python benchmarks/list_read_benchmark.py --limits 100 1000 all
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scratch_db import require_scratch_database
+from flask import current_app
+from sqlalchemy import select
+from app import create_app, db
+from app.models.attendance import Attendance
+from app.models.contribution import Contribution
+from app.models.fines import Fine
+from app.models.loans import Loan
+from app.utils.pagination import json_page, keyset_paginate, page_response, row_dicts
+from index_benchmark import analyze, seed
+
+LIST_COLUMNS = {
+    Contribution: ('id', 'member_id', 'amount', 'date'),
+    Fine: ('id', 'member_id', 'amount', 'date', 'status', 'reason', 'rule_id', 'period'),
+    Loan: ('id', 'member_id', 'amount', 'date', 'status', 'interest_rate', 'term_months'),
+    Attendance: ('id', 'member_id', 'date', 'status'),
+}
+
+
+def orm_page(model):
+    rows, _ = keyset_paginate(model.query, model.date, model.id)
+    return current_app.json.response([row.to_dict() for row in rows]).get_data()
+
+
+def column_page(model):
+    columns = [getattr(model, name) for name in LIST_COLUMNS[model]]
+    rows, _ = keyset_paginate(select(*columns), model.date, model.id)
+    return current_app.json.response(row_dicts(rows)).get_data()
+
+
+def database_page(model):
+    columns = [getattr(model, name) for name in LIST_COLUMNS[model]]
+    body, next_cursor = json_page(select(*columns), model.date, model.id)
+    return page_response(body, next_cursor)[0].get_data()
+
+
+def measure(fn, model, runs):
+    best = best_cpu = float('inf')
+    for _ in range(runs):
+        db.session.expunge_all()
+        started, started_cpu = time.perf_counter(), time.process_time()
+        body = fn(model)
+        best = min(best, time.perf_counter() - started)
+        best_cpu = min(best_cpu, time.process_time() - started_cpu)
+    db.session.expunge_all()
+
+    tracemalloc.start()
+    fn(model)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return best * 1000, best_cpu * 1000, peak / 1024 / 1024, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ORM and column read paths of the list endpoints")
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--rows-per-member", type=int, default=50)
+    parser.add_argument("--limits", nargs="+", default=["100", "1000", "all"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    require_scratch_database(app)
+    with app.app_context():
+        db.create_all()
+        seed(args.members, args.rows_per_member)
+        analyze()
+        if db.engine.dialect.name != 'postgresql':
+            print("Not a Postgres database: the json_agg column shows the fallback path.")
+    app.config['LIST_JSON_IN_DATABASE'] = True
+    app.config['LIST_JSON_IN_DATABASE_MIN_LIMIT'] = 0
+
+    print(f"{'':<21}" + "".join(f"{name:>27}" for name in ('orm', 'columns', 'json_agg')))
+    print(f"{'table':<14} {'limit':>6}" + f"{'wall':>10} {'cpu':>8} {'peak':>7}" * 3 + "  body")
+    for model in LIST_COLUMNS:
+        for limit in args.limits:
+            query_string = "all=true" if limit == "all" else f"limit={limit}"
+            with app.test_request_context(f"/?{query_string}"):
+                results = [measure(fn, model, args.runs) for fn in (orm_page, column_page, database_page)]
+            bodies = [json.loads(body) for *_, body in results]
+            cells = "".join(f"{ms:>8.1f}ms {cpu:>6.1f}ms {mb:>5.1f}MB" for ms, cpu, mb, _ in results)
+            print(f"{model.__tablename__:<14} {limit:>6}{cells}  "
+                  f"{'same' if bodies[0] == bodies[1] == bodies[2] else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# loan_projection_benchmark.py
+# Times the NumPy amortization engine on synthetic loan books of growing size
+# and compares it with a plain per-loan Python loop computing the same totals
+# (scheduled balance, interest accrued and the amount due in each month).
+#
+# Needs no database: the books are generated in memory.
+#   python benchmarks/loan_projection_benchmark.py
+#   python benchmarks/loan_projection_benchmark.py --loans 1000 10000 100000 --months 24
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app import create_app
+from app.utils.amortization import LoanBook, months_elapsed, project_portfolio
+
+
+def synthetic_book(size):
+    rng = random.Random(2026)
+    today = date.today()
+    starts = [today - timedelta(days=rng.randrange(0, 720)) for _ in range(size)]
+    return LoanBook(
+        ids=np.arange(1, size + 1, dtype=np.int64),
+        member_ids=np.array([rng.randrange(1, 200) for _ in range(size)], dtype=np.int64),
+        principal=np.array([rng.randrange(1000, 200000) for _ in range(size)], dtype=np.float64),
+        start=np.array(starts, dtype='datetime64[D]'),
+        annual_rate=np.array([rng.choice([0.0, 0.06, 0.1, 0.12, 0.18]) for _ in range(size)], dtype=np.float64),
+        terms=np.array([rng.choice([3, 6, 12, 18, 24]) for _ in range(size)], dtype=np.int64)
+    )
+
+
+def loop_projection(book, months, as_of):
+    # Reference implementation: one loan and one instalment at a time
+    elapsed = months_elapsed(book.start, as_of)
+    month_diff = (np.datetime64(as_of, 'M') - book.start.astype('datetime64[M]')).astype(np.int64)
+    balance_total = accrued_total = 0.0
+    due_totals = [0.0] * months
+    for principal, annual_rate, term, due, offset in zip(
+            book.principal, book.annual_rate, book.terms, elapsed, month_diff):
+        rate = annual_rate / 12
+        instalment = principal * rate / (1 - (1 + rate) ** -term) if rate else principal / term
+        balance = principal
+        for period in range(1, term + 1):
+            interest = balance * rate
+            balance = max(balance - (instalment - interest), 0.0)
+            if period <= due:
+                accrued_total += interest
+                if period == due and due < term:
+                    balance_total += balance
+            if 0 <= period - offset < months:
+                due_totals[period - offset] += instalment
+        if due <= 0:
+            balance_total += principal
+    return balance_total, accrued_total, due_totals
+
+
+def timed(fn, runs):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized loan projection")
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--loans", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    app.config['LOAN_INTEREST_METHOD'] = 'reducing'
+    as_of = date.today()
+
+    print(f"{'loans':>8} {'numpy':>10} {'loop':>10} {'speedup':>8}  balance check")
+    with app.app_context():
+        for size in args.loans:
+            book = synthetic_book(size)
+            numpy_ms, projection = timed(lambda: project_portfolio(book, args.months, as_of), args.runs)
+            loop_ms, (balance, accrued, due) = timed(lambda: loop_projection(book, args.months, as_of), 1)
+            tolerance = 0.01 * size
+            matches = abs(float(projection['scheduled_balance']) - balance) < tolerance \
+                and abs(float(projection['interest_accrued']) - accrued) < tolerance \
+                and all(abs(float(month['total_due']) - total) < tolerance
+                        for month, total in zip(projection['months'], due))
+            print(f"{size:>8} {numpy_ms:>8.1f}ms {loop_ms:>8.1f}ms {loop_ms / numpy_ms:>7.1f}x  "
+                  f"{'ok' if matches else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# login_throughput.py
+# Measures /auth/login throughput and latency at several concurrency levels.
+#
+# Usage (from the backend directory). The script creates missing tables and a
+# benchmark member, so DATABASE_URL must name a scratch database; it refuses
+# to run without one (see scratch_db.py).
+#   DATABASE_URL=postgresql://.../chama_bench python benchmarks/login_throughput.py
+#   DATABASE_URL=... python benchmarks/login_throughput.py --concurrency 1 4 16 --duration 10
+#
+# Try it with different PASSWORD_HASH_EXECUTOR / PASSWORD_HASH_WORKERS /
+# PASSWORD_HASH_QUEUE_DEPTH / WEB_THREADS settings to see how the pool trades 503s for latency.
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scratch_db import require_scratch_database
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from app.models.members import Member
+from app.utils.password_hashing import password_hasher
+
+BENCH_EMAIL = "login.bench@example.com"
+BENCH_PASSWORD = "Bench.Passw0rd"
+
+
+def seed_member(app):
+    with app.app_context():
+        db.create_all()
+        if not Member.query.filter_by(email=BENCH_EMAIL).first():
+            db.session.add(Member(
+                name="Login Bench",
+                email=BENCH_EMAIL,
+                phone="254700000999",
+                gender="female",
+                password_hash=generate_password_hash(BENCH_PASSWORD),
+                role="member",
+            ))
+            db.session.commit()
+
+
+def run_level(app, concurrency, duration):
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = client.post("/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    ok = statuses.get(200, 0)
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "ok_per_sec": ok / wall,
+        "rejected_503": statuses.get(503, 0),
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        "other": {code: count for code, count in statuses.items() if code not in (200, 503)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /auth/login throughput")
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per concurrency level")
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    require_scratch_database(app)
+    seed_member(app)
+
+    print(f"executor={app.config['PASSWORD_HASH_EXECUTOR']} "
+          f"workers={app.config['PASSWORD_HASH_WORKERS'] or os.cpu_count()} "
+          f"queue_depth={app.config['PASSWORD_HASH_QUEUE_DEPTH']} slots={password_hasher.slot_count}")
+    print(f"{'conc':>5} {'requests':>9} {'ok/s':>8} {'503s':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for concurrency in args.concurrency:
+        result = run_level(app, concurrency, args.duration)
+        print(f"{result['concurrency']:>5} {result['requests']:>9} {result['ok_per_sec']:>8.1f} "
+              f"{result['rejected_503']:>6} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f}"
+              + (f"  other={result['other']}" if result['other'] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+# scratch_db.py
+# Guard for the benchmarks that create tables and insert rows. They only run
+# against a DATABASE_URL given explicitly on the command line: without one,
+# the app's config falls back to .env or the development database.
+#
+# Import this before app: importing app loads .env into the environment.
+import os
+import sys
+
+LAUNCH_DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+def require_scratch_database(app):
+    """Exit unless the app is using the DATABASE_URL the script was started with."""
+    if not LAUNCH_DATABASE_URL or app.config["SQLALCHEMY_DATABASE_URI"] != LAUNCH_DATABASE_URL:
+        sys.exit("This benchmark creates tables and inserts rows; set DATABASE_URL to a throwaway database:\n"
+                 "  DATABASE_URL=postgresql://.../chama_bench python benchmarks/<script>.py")
@@ -0,0 +1,11 @@
+# gunicorn.conf.py
+# Threaded workers: each process serves WEB_THREADS requests at once, so a
+# login waiting on the password hashing pool does not hold up the others, and
+# the pool's per-process limit (half of WEB_THREADS) can actually be reached
+# and answered with 503 + Retry-After.
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("WEB_THREADS", 16))
@@ -0,0 +1,172 @@
+"""Add trigger-maintained member_monthly_rollups table
+
+Revision ID: 3c1d8e5a9b27
+Revises: 75ef9f2ff351
+Create Date: 2026-10-17 17:02:41.318266
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d8e5a9b27'
+down_revision = '75ef9f2ff351'
+branch_labels = None
+depends_on = None
+
+
+LEDGER_TABLES = ('contributions', 'fines', 'attendances')
+
+# Recomputes the given (member, month) buckets from the ledgers and upserts them,
+# dropping buckets that no longer have any rows. The range scans are served by
+# the (member_id, date) indexes. A transaction-level advisory lock per bucket
+# serialises concurrent writers, so the recompute always sees the rows the
+# previous writer committed. 'present' and 'late' count as attended, matching
+# ATTENDED_STATUSES in app/models/attendance.py.
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION member_monthly_rollups_refresh(p_member_ids integer[], p_months date[])
+RETURNS void AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(b.member_id, (extract(year FROM b.month) * 12 + extract(month FROM b.month))::integer)
+    FROM (SELECT DISTINCT * FROM unnest(p_member_ids, p_months) AS u(member_id, month)) b
+    ORDER BY b.member_id, b.month;
+
+    WITH buckets AS (
+        SELECT DISTINCT u.member_id, u.month, (u.month + interval '1 month')::date AS next_month
+        FROM unnest(p_member_ids, p_months) AS u(member_id, month)
+    ), totals AS (
+        SELECT b.member_id, b.month, c.total AS contribution_total, c.count AS contribution_count,
+               f.total AS fine_total, f.count AS fine_count,
+               a.total AS attendance_total, a.attended AS attendance_attended
+        FROM buckets b
+        CROSS JOIN LATERAL (SELECT COALESCE(sum(amount), 0) AS total, count(*) AS count FROM contributions
+                            WHERE member_id = b.member_id AND date >= b.month AND date < b.next_month) c
+        CROSS JOIN LATERAL (SELECT COALESCE(sum(amount), 0) AS total, count(*) AS count FROM fines
+                            WHERE member_id = b.member_id AND date >= b.month AND date < b.next_month) f
+        CROSS JOIN LATERAL (SELECT count(*) AS total,
+                                   count(*) FILTER (WHERE status IN ('present', 'late')) AS attended
+                            FROM attendances
+                            WHERE member_id = b.member_id AND date >= b.month AND date < b.next_month) a
+    ), emptied AS (
+        DELETE FROM member_monthly_rollups r
+        USING totals t
+        WHERE r.member_id = t.member_id AND r.month = t.month
+          AND t.contribution_count = 0 AND t.fine_count = 0 AND t.attendance_total = 0
+    )
+    INSERT INTO member_monthly_rollups AS r
+        (member_id, month, contribution_total, contribution_count, fine_total, fine_count,
+         attendance_total, attendance_attended)
+    SELECT member_id, month, contribution_total, contribution_count, fine_total, fine_count,
+           attendance_total, attendance_attended
+    FROM totals
+    WHERE contribution_count > 0 OR fine_count > 0 OR attendance_total > 0
+    ON CONFLICT (member_id, month) DO UPDATE SET
+        contribution_total = EXCLUDED.contribution_total,
+        contribution_count = EXCLUDED.contribution_count,
+        fine_total = EXCLUDED.fine_total,
+        fine_count = EXCLUDED.fine_count,
+        attendance_total = EXCLUDED.attendance_total,
+        attendance_attended = EXCLUDED.attendance_attended;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Statement-level, so a bulk write refreshes each affected bucket once instead
+# of once per row. The transition tables hold the rows the statement touched.
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION member_monthly_rollups_trg() RETURNS trigger AS $$
+DECLARE
+    v_member_ids integer[];
+    v_months date[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(member_id), array_agg(date_trunc('month', date)::date)
+        INTO v_member_ids, v_months FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(member_id), array_agg(date_trunc('month', date)::date)
+        INTO v_member_ids, v_months FROM old_rows;
+    ELSE
+        SELECT array_agg(member_id), array_agg(date_trunc('month', date)::date)
+        INTO v_member_ids, v_months
+        FROM (SELECT member_id, date FROM old_rows UNION SELECT member_id, date FROM new_rows) changed;
+    END IF;
+
+    IF v_member_ids IS NOT NULL THEN
+        PERFORM member_monthly_rollups_refresh(v_member_ids, v_months);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = """
+CREATE TRIGGER member_monthly_rollups_{table}_insert
+AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION member_monthly_rollups_trg();
+
+CREATE TRIGGER member_monthly_rollups_{table}_update
+AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION member_monthly_rollups_trg();
+
+CREATE TRIGGER member_monthly_rollups_{table}_delete
+AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION member_monthly_rollups_trg();
+"""
+
+BACKFILL = """
+INSERT INTO member_monthly_rollups
+    (member_id, month, contribution_total, contribution_count, fine_total, fine_count,
+     attendance_total, attendance_attended)
+SELECT member_id, month, sum(contribution_total), sum(contribution_count), sum(fine_total),
+       sum(fine_count), sum(attendance_total), sum(attendance_attended)
+FROM (
+    SELECT member_id, date_trunc('month', date)::date AS month, amount AS contribution_total,
+           1 AS contribution_count, 0 AS fine_total, 0 AS fine_count, 0 AS attendance_total,
+           0 AS attendance_attended
+    FROM contributions
+    UNION ALL
+    SELECT member_id, date_trunc('month', date)::date, 0, 0, amount, 1, 0, 0
+    FROM fines
+    UNION ALL
+    SELECT member_id, date_trunc('month', date)::date, 0, 0, 0, 0, 1,
+           CASE WHEN status IN ('present', 'late') THEN 1 ELSE 0 END
+    FROM attendances
+) ledger
+GROUP BY member_id, month
+"""
+
+
+def upgrade():
+    op.create_table('member_monthly_rollups',
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('contribution_total', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('contribution_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('fine_total', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('fine_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('attendance_total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('attendance_attended', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('member_id', 'month')
+    )
+    with op.batch_alter_table('member_monthly_rollups', schema=None) as batch_op:
+        batch_op.create_index('ix_member_monthly_rollups_month', ['month'], unique=False)
+
+    op.execute(REFRESH_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    for table in LEDGER_TABLES:
+        op.execute(TRIGGERS.format(table=table))
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    for table in LEDGER_TABLES:
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS member_monthly_rollups_{table}_{event} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS member_monthly_rollups_trg()")
+    op.execute("DROP FUNCTION IF EXISTS member_monthly_rollups_refresh(integer[], date[])")
+    with op.batch_alter_table('member_monthly_rollups', schema=None) as batch_op:
+        batch_op.drop_index('ix_member_monthly_rollups_month')
+
+    op.drop_table('member_monthly_rollups')
@@ -0,0 +1,51 @@
+"""Add member_id and case-insensitive email lookup indexes
+
+Revision ID: 452a9126a154
+Revises: fafb1918e910
+Create Date: 2026-10-17 14:21:55.067342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '452a9126a154'
+down_revision = 'fafb1918e910'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres does not index foreign keys on its own, so every /x/<member_id> and /x/my
+    # lookup was a sequential scan. (member_id, date) also serves per-member date ranges.
+    # The plain (date, id) indexes were added with the list filters in fafb1918e910.
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.create_index('ix_attendances_member_id_date', ['member_id', 'date'], unique=False)
+
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.create_index('ix_contributions_member_id_date', ['member_id', 'date'], unique=False)
+
+    with op.batch_alter_table('fines', schema=None) as batch_op:
+        batch_op.create_index('ix_fines_member_id_date', ['member_id', 'date'], unique=False)
+
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.create_index('ix_loans_member_id_date', ['member_id', 'date'], unique=False)
+
+    op.create_index('ix_members_email_lower', 'members', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_members_email_lower', table_name='members')
+
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.drop_index('ix_loans_member_id_date')
+
+    with op.batch_alter_table('fines', schema=None) as batch_op:
+        batch_op.drop_index('ix_fines_member_id_date')
+
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.drop_index('ix_contributions_member_id_date')
+
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendances_member_id_date')
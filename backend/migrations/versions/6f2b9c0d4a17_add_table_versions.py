@@ -0,0 +1,104 @@
+"""Add trigger-maintained table_versions counters
+
+Revision ID: 6f2b9c0d4a17
+Revises: 53134b480810
+Create Date: 2026-10-17 22:05:18.640912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2b9c0d4a17'
+down_revision = '53134b480810'
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = ('contributions', 'fines', 'loans', 'attendances', 'members')
+
+# Writes do not touch the counters directly. A statement trigger only records
+# the written table in a transaction-local setting, and the first write of a
+# transaction queues one row in table_versions_pending. That row's deferred
+# trigger bumps every recorded table once, at commit: the counter rows are
+# locked in table_name order and only for the commit itself. Writers to the
+# same table therefore never queue behind each other's open transactions
+# (COPY imports, reconciliation, fine-rule runs), and transactions touching
+# several tables in different orders cannot deadlock on the counters.
+#
+# The new version still commits together with the rows that caused it, so a
+# reader can never pair the new version with the old data. (A sequence would
+# not give that guarantee.)
+MARK_FUNCTION = """
+CREATE OR REPLACE FUNCTION table_versions_mark() RETURNS trigger AS $$
+DECLARE
+    pending text := coalesce(current_setting('table_versions.pending', true), '');
+BEGIN
+    IF pending = '' THEN
+        INSERT INTO table_versions_pending (txid) VALUES (txid_current());
+    END IF;
+    IF NOT TG_TABLE_NAME = ANY(string_to_array(pending, ',')) THEN
+        PERFORM set_config('table_versions.pending', concat_ws(',', nullif(pending, ''), TG_TABLE_NAME), true);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION table_versions_bump() RETURNS trigger AS $$
+DECLARE
+    tables text[] := string_to_array(current_setting('table_versions.pending', true), ',');
+BEGIN
+    PERFORM 1 FROM table_versions WHERE table_name = ANY(tables) ORDER BY table_name FOR UPDATE;
+    UPDATE table_versions SET version = version + 1 WHERE table_name = ANY(tables);
+    -- Later writes in the same transaction (after SET CONSTRAINTS ... IMMEDIATE) queue a new bump
+    PERFORM set_config('table_versions.pending', '', true);
+    DELETE FROM table_versions_pending WHERE txid = NEW.txid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER = """
+CREATE TRIGGER table_versions_{table}
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+FOR EACH STATEMENT EXECUTE FUNCTION table_versions_mark();
+"""
+
+BUMP_TRIGGER = """
+CREATE CONSTRAINT TRIGGER table_versions_pending_bump
+AFTER INSERT ON table_versions_pending
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION table_versions_bump();
+"""
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.bulk_insert(table_versions, [{'table_name': table, 'version': 1} for table in VERSIONED_TABLES])
+    op.create_table('table_versions_pending',
+    sa.Column('txid', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('txid'),
+    prefixes=['UNLOGGED']
+    )
+
+    op.execute(BUMP_FUNCTION)
+    op.execute(BUMP_TRIGGER)
+    op.execute(MARK_FUNCTION)
+    for table in VERSIONED_TABLES:
+        op.execute(TRIGGER.format(table=table))
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS table_versions_{table} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS table_versions_mark()")
+    op.drop_table('table_versions_pending')
+    op.execute("DROP FUNCTION IF EXISTS table_versions_bump()")
+    op.drop_table('table_versions')
@@ -0,0 +1,126 @@
+"""Add trigger-maintained member_balances table
+
+Revision ID: 75ef9f2ff351
+Revises: 452a9126a154
+Create Date: 2026-10-17 15:48:10.731904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '75ef9f2ff351'
+down_revision = '452a9126a154'
+branch_labels = None
+depends_on = None
+
+
+# Adds signed deltas to one member's running totals and keeps the last activity
+# date. An added row can only move it forward, so that is a GREATEST against the
+# locked row. A removed row may have been the latest, so the date is then
+# recomputed by a statement that runs after the upsert has taken the row lock:
+# its snapshot includes every write that committed before this one could proceed.
+# The max(date) lookups are served by the (member_id, date) indexes.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION member_balances_apply(
+    p_member_id integer, p_contributed numeric, p_fines numeric, p_loans numeric,
+    p_date date, p_removed boolean
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO member_balances AS b
+        (member_id, total_contributed, fines_outstanding, loan_principal_outstanding, last_activity_date)
+    VALUES (p_member_id, p_contributed, p_fines, p_loans, CASE WHEN NOT p_removed THEN p_date END)
+    ON CONFLICT (member_id) DO UPDATE SET
+        total_contributed = b.total_contributed + EXCLUDED.total_contributed,
+        fines_outstanding = b.fines_outstanding + EXCLUDED.fines_outstanding,
+        loan_principal_outstanding = b.loan_principal_outstanding + EXCLUDED.loan_principal_outstanding,
+        last_activity_date = GREATEST(b.last_activity_date, EXCLUDED.last_activity_date);
+
+    IF p_removed THEN
+        UPDATE member_balances SET last_activity_date = GREATEST(
+            (SELECT max(date) FROM contributions WHERE member_id = p_member_id),
+            (SELECT max(date) FROM fines WHERE member_id = p_member_id),
+            (SELECT max(date) FROM loans WHERE member_id = p_member_id)
+        )
+        WHERE member_id = p_member_id
+          AND (last_activity_date IS NULL OR last_activity_date <= p_date);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# table -> (contributed delta, fines delta, loans delta) for a row referenced as {row}
+ROW_DELTAS = {
+    'contributions': ("{row}.amount", "0", "0"),
+    'fines': ("0", "CASE WHEN COALESCE({row}.status, 'pending') <> 'paid' THEN {row}.amount ELSE 0 END", "0"),
+    'loans': ("0", "0", "CASE WHEN COALESCE({row}.status, 'pending') <> 'paid' THEN {row}.amount ELSE 0 END"),
+}
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION member_balances_{table}_trg() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM member_balances_apply(OLD.member_id, -({old[0]}), -({old[1]}), -({old[2]}), OLD.date, true);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM member_balances_apply(NEW.member_id, {new[0]}, {new[1]}, {new[2]}, NEW.date, false);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER member_balances_{table}
+AFTER INSERT OR UPDATE OR DELETE ON {table}
+FOR EACH ROW EXECUTE FUNCTION member_balances_{table}_trg();
+"""
+
+BACKFILL = """
+INSERT INTO member_balances
+    (member_id, total_contributed, fines_outstanding, loan_principal_outstanding, last_activity_date)
+SELECT m.id,
+       COALESCE(c.total, 0),
+       COALESCE(f.total, 0),
+       COALESCE(l.total, 0),
+       GREATEST(c.last_date, f.last_date, l.last_date)
+FROM members m
+LEFT JOIN (SELECT member_id, sum(amount) AS total, max(date) AS last_date
+           FROM contributions GROUP BY member_id) c ON c.member_id = m.id
+LEFT JOIN (SELECT member_id,
+                  sum(CASE WHEN COALESCE(status, 'pending') <> 'paid' THEN amount ELSE 0 END) AS total,
+                  max(date) AS last_date
+           FROM fines GROUP BY member_id) f ON f.member_id = m.id
+LEFT JOIN (SELECT member_id,
+                  sum(CASE WHEN COALESCE(status, 'pending') <> 'paid' THEN amount ELSE 0 END) AS total,
+                  max(date) AS last_date
+           FROM loans GROUP BY member_id) l ON l.member_id = m.id
+"""
+
+
+def upgrade():
+    op.create_table('member_balances',
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('total_contributed', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('fines_outstanding', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('loan_principal_outstanding', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('last_activity_date', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('member_id')
+    )
+
+    op.execute(APPLY_FUNCTION)
+    for table, deltas in ROW_DELTAS.items():
+        op.execute(TRIGGER_FUNCTION.format(
+            table=table,
+            old=[delta.format(row='OLD') for delta in deltas],
+            new=[delta.format(row='NEW') for delta in deltas]
+        ))
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    for table in ROW_DELTAS:
+        op.execute(f"DROP TRIGGER IF EXISTS member_balances_{table} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS member_balances_{table}_trg()")
+    op.execute("DROP FUNCTION IF EXISTS member_balances_apply(integer, numeric, numeric, numeric, date, boolean)")
+    op.drop_table('member_balances')
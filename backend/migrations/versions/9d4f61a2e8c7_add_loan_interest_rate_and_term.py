@@ -0,0 +1,28 @@
+"""Add interest_rate and term_months to loans
+
+Revision ID: 9d4f61a2e8c7
+Revises: e5a27c94f0b3
+Create Date: 2026-10-17 19:34:52.861090
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f61a2e8c7'
+down_revision = 'e5a27c94f0b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('interest_rate', sa.Numeric(precision=5, scale=4), nullable=True))
+        batch_op.add_column(sa.Column('term_months', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.drop_column('term_months')
+        batch_op.drop_column('interest_rate')
@@ -0,0 +1,68 @@
+"""Unique attendance per member and date
+
+Revision ID: b83e0f6d4c12
+Revises: 3c1d8e5a9b27
+Create Date: 2026-10-17 17:41:09.527113
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e0f6d4c12'
+down_revision = '3c1d8e5a9b27'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.env')
+
+
+# Rows removed by the deduplication are kept here, unchanged, for review;
+# downgrade puts them back
+DUPLICATES_TABLE = 'attendances_removed_duplicates'
+
+# Every row of a duplicated (member_id, date) pair except the most recently recorded one
+SAVE_DUPLICATES = f"""
+CREATE TABLE {DUPLICATES_TABLE} AS
+SELECT a.*, now() AS removed_at
+FROM attendances a
+WHERE EXISTS (
+    SELECT 1 FROM attendances newer
+    WHERE newer.member_id = a.member_id
+      AND newer.date = a.date
+      AND newer.id > a.id
+)
+"""
+
+DEDUPLICATE = f"""
+DELETE FROM attendances a
+USING {DUPLICATES_TABLE} removed
+WHERE removed.id = a.id
+"""
+
+RESTORE_DUPLICATES = f"""
+INSERT INTO attendances (id, member_id, date, status)
+SELECT id, member_id, date, status FROM {DUPLICATES_TABLE}
+"""
+
+
+def upgrade():
+    op.execute(SAVE_DUPLICATES)
+    removed = op.get_bind().execute(sa.text(DEDUPLICATE)).rowcount
+    if removed:
+        logger.warning("Removed %d duplicate attendance rows; they are kept in %s", removed, DUPLICATES_TABLE)
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_attendances_member_id_date', ['member_id', 'date'])
+        # Superseded by the unique constraint's index
+        batch_op.drop_index('ix_attendances_member_id_date')
+
+
+def downgrade():
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.create_index('ix_attendances_member_id_date', ['member_id', 'date'], unique=False)
+        batch_op.drop_constraint('uq_attendances_member_id_date', type_='unique')
+    op.execute(RESTORE_DUPLICATES)
+    op.drop_table(DUPLICATES_TABLE)
@@ -0,0 +1,31 @@
+"""Add rule_id and period to fines for rule-generated fines
+
+Revision ID: e5a27c94f0b3
+Revises: b83e0f6d4c12
+Create Date: 2026-10-17 18:56:37.204418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a27c94f0b3'
+down_revision = 'b83e0f6d4c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('fines', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rule_id', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('period', sa.Date(), nullable=True))
+        batch_op.create_index('uq_fines_rule_id_member_id_period', ['rule_id', 'member_id', 'period'], unique=True,
+                              postgresql_where=sa.text('rule_id IS NOT NULL'))
+
+
+def downgrade():
+    with op.batch_alter_table('fines', schema=None) as batch_op:
+        batch_op.drop_index('uq_fines_rule_id_member_id_period', postgresql_where=sa.text('rule_id IS NOT NULL'))
+        batch_op.drop_column('period')
+        batch_op.drop_column('rule_id')
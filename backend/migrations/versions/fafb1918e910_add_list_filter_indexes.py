@@ -0,0 +1,50 @@
+"""Add composite indexes for list filtering and keyset pagination
+
+Revision ID: fafb1918e910
+Revises: 7f0503b32319
+Create Date: 2026-10-17 13:02:27.904711
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fafb1918e910'
+down_revision = '7f0503b32319'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (date, id) serves both the date range filters and the newest-first keyset order.
+    # (status, date, id) lets "pending fines" / "borrowed loans" pages read one index range.
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.create_index('ix_attendances_date_id', ['date', 'id'], unique=False)
+
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.create_index('ix_contributions_date_id', ['date', 'id'], unique=False)
+
+    with op.batch_alter_table('fines', schema=None) as batch_op:
+        batch_op.create_index('ix_fines_date_id', ['date', 'id'], unique=False)
+        batch_op.create_index('ix_fines_status_date_id', ['status', 'date', 'id'], unique=False)
+
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.create_index('ix_loans_date_id', ['date', 'id'], unique=False)
+        batch_op.create_index('ix_loans_status_date_id', ['status', 'date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.drop_index('ix_loans_status_date_id')
+        batch_op.drop_index('ix_loans_date_id')
+
+    with op.batch_alter_table('fines', schema=None) as batch_op:
+        batch_op.drop_index('ix_fines_status_date_id')
+        batch_op.drop_index('ix_fines_date_id')
+
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.drop_index('ix_contributions_date_id')
+
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendances_date_id')
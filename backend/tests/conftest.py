@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """The testing app bound to TEST_DATABASE_URL, inside an app context."""
+    from app import create_app, db
+    from app.config import config_by_name
+
+    # The config classes read DATABASE_URL when app is first imported, so point
+    # the Testing class itself at the scratch database for this test only
+    monkeypatch.setattr(config_by_name["testing"], "SQLALCHEMY_DATABASE_URI", TEST_DATABASE_URL)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.rollback()
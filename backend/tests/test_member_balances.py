@@ -0,0 +1,97 @@
+# member_balances is kept by the triggers of migration 75ef9f2ff351, so these
+# tests need a throwaway Postgres database upgraded with `flask db upgrade`:
+#   TEST_DATABASE_URL=postgresql://.../chama_test python -m pytest tests
+import os
+import threading
+
+import pytest
+from sqlalchemy import text
+from werkzeug.security import generate_password_hash
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or "").startswith("postgresql"),
+    reason="set TEST_DATABASE_URL to a scratch Postgres database"
+)
+
+ADD_CONTRIBUTION = text("INSERT INTO contributions (member_id, date, amount) VALUES (:member_id, :date, 100)")
+DELETE_CONTRIBUTION = text("DELETE FROM contributions WHERE member_id = :member_id AND date = :date")
+
+
+@pytest.fixture
+def member_id(app):
+    from app import db
+    from app.models.contribution import Contribution
+    from app.models.member_balance import MemberBalance
+    from app.models.member_monthly_rollup import MemberMonthlyRollup
+    from app.models.members import Member
+
+    member = Member(name="Balance Test", email="balance-test@example.com", phone="254700999201",
+                    gender="female", password_hash=generate_password_hash("Passw0rd!"), role="member")
+    db.session.add(member)
+    db.session.commit()
+    yield member.id
+
+    for model in (Contribution, MemberBalance, MemberMonthlyRollup):
+        model.query.filter(model.member_id == member.id).delete(synchronize_session=False)
+    Member.query.filter(Member.id == member.id).delete(synchronize_session=False)
+    db.session.commit()
+
+
+@pytest.fixture
+def connections(app):
+    from app import db
+
+    opened = [db.engine.connect() for _ in range(2)]
+    for connection in opened:
+        connection.execute(text("SET lock_timeout = '5s'"))
+    yield opened
+    for connection in opened:
+        connection.rollback()
+        connection.close()
+
+
+def last_activity(member_id):
+    from app import db
+
+    db.session.rollback()
+    return str(db.session.execute(
+        text("SELECT last_activity_date FROM member_balances WHERE member_id = :member_id"),
+        {"member_id": member_id}
+    ).scalar())
+
+
+def run_blocked(connection, statement, params):
+    """Start a statement that is expected to wait on the other connection's lock."""
+    worker = threading.Thread(target=connection.execute, args=(statement, params))
+    worker.start()
+    worker.join(0.5)
+    assert worker.is_alive()
+    return worker
+
+
+def test_concurrent_earlier_write_keeps_the_later_date(member_id, connections):
+    first, second = connections
+    first.execute(ADD_CONTRIBUTION, {"member_id": member_id, "date": "2026-03-01"})
+    # Its own snapshot cannot see March, so it used to overwrite it with January
+    worker = run_blocked(second, ADD_CONTRIBUTION, {"member_id": member_id, "date": "2026-01-01"})
+    first.commit()
+    worker.join()
+    second.commit()
+
+    assert last_activity(member_id) == "2026-03-01"
+
+
+def test_delete_recomputes_after_concurrent_writes_commit(member_id, connections):
+    first, second = connections
+    first.execute(ADD_CONTRIBUTION, {"member_id": member_id, "date": "2026-01-01"})
+    first.execute(ADD_CONTRIBUTION, {"member_id": member_id, "date": "2026-02-01"})
+    first.commit()
+
+    first.execute(ADD_CONTRIBUTION, {"member_id": member_id, "date": "2026-03-01"})
+    worker = run_blocked(second, DELETE_CONTRIBUTION, {"member_id": member_id, "date": "2026-02-01"})
+    first.commit()
+    worker.join()
+    second.commit()
+
+    assert last_activity(member_id) == "2026-03-01"
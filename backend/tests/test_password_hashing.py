@@ -0,0 +1,97 @@
+import os
+import threading
+
+import pytest
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from app.utils.password_hashing import PasswordHasher, HashingPoolSaturated
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def make_hasher(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    hasher = PasswordHasher()
+    hasher.init_app(app)
+    return hasher
+
+
+def hold_slots(hasher, count):
+    """Occupies count slots with jobs that block until the returned event is set."""
+    release = threading.Event()
+    started = threading.Barrier(count + 1)
+
+    def job():
+        started.wait()
+        release.wait()
+
+    threads = [threading.Thread(target=hasher._run, args=(job,)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    return release, threads
+
+
+def test_slots_are_capped_at_half_the_request_threads():
+    hasher = make_hasher(PASSWORD_HASH_WORKERS=4, PASSWORD_HASH_QUEUE_DEPTH=16, WEB_THREADS=8)
+    assert hasher.slot_count == 4
+
+    hasher = make_hasher(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_DEPTH=1, WEB_THREADS=16)
+    assert hasher.slot_count == 2
+
+
+def test_saturated_pool_rejects_instead_of_queueing():
+    hasher = make_hasher(PASSWORD_HASH_WORKERS=2, PASSWORD_HASH_QUEUE_DEPTH=0, WEB_THREADS=8,
+                         PASSWORD_HASH_RETRY_AFTER=7)
+    pwhash = generate_password_hash("Passw0rd!")
+    release, threads = hold_slots(hasher, hasher.slot_count)
+    try:
+        with pytest.raises(HashingPoolSaturated) as saturated:
+            hasher.check(pwhash, "Passw0rd!")
+        assert saturated.value.retry_after == 7
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert hasher.check(pwhash, "Passw0rd!")
+    hasher.shutdown()
+
+
+@pytest.mark.skipif(not (TEST_DATABASE_URL or "").startswith("postgresql"),
+                    reason="set TEST_DATABASE_URL to a scratch Postgres database")
+def test_login_answers_503_while_the_pool_is_saturated(app):
+    from app import db
+    from app.models.members import Member
+    from app.models.refresh_tokens import RefreshToken
+    from app.utils.password_hashing import password_hasher
+
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_DEPTH=0, PASSWORD_HASH_RETRY_AFTER=3)
+    password_hasher.init_app(app)
+
+    member = Member(name="Hash Test", email="hash-test@example.com", phone="254700999002",
+                    gender="female", password_hash=generate_password_hash("Passw0rd!"), role="member")
+    db.session.add(member)
+    db.session.commit()
+
+    client = app.test_client()
+    credentials = {"email": "hash-test@example.com", "password": "Passw0rd!"}
+    release, threads = hold_slots(password_hasher, password_hasher.slot_count)
+    try:
+        response = client.post("/auth/login", json=credentials)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    try:
+        assert client.post("/auth/login", json=credentials).status_code == 200
+    finally:
+        RefreshToken.query.filter_by(member_id=member.id).delete()
+        Member.query.filter_by(id=member.id).delete()
+        db.session.commit()
+        password_hasher.shutdown()
@@ -0,0 +1,73 @@
+# Reconciliation runs bulk Postgres statements (id = ANY(array), FOR UPDATE SKIP LOCKED),
+# so these tests need a real, throwaway Postgres database:
+#   TEST_DATABASE_URL=postgresql://.../chama_test python -m pytest tests
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or "").startswith("postgresql"),
+    reason="set TEST_DATABASE_URL to a scratch Postgres database"
+)
+
+
+@pytest.fixture
+def member(app):
+    from app import db
+    from app.models.members import Member
+    from app.models.fines import Fine
+    from app.models.payment import Payment, PaymentAllocation
+    from app.models.member_balance import MemberBalance
+    from app.models.member_monthly_rollup import MemberMonthlyRollup
+
+    member = Member(name="Reconcile Test", email="reconcile-test@example.com", phone="254700999001",
+                    gender="female", password_hash=generate_password_hash("Passw0rd!"), role="member")
+    db.session.add(member)
+    db.session.commit()
+    yield member
+
+    payment_ids = [payment.id for payment in Payment.query.filter_by(member_id=member.id)]
+    PaymentAllocation.query.filter(PaymentAllocation.payment_id.in_(payment_ids)).delete(synchronize_session=False)
+    Payment.query.filter_by(member_id=member.id).delete()
+    Fine.query.filter_by(member_id=member.id).delete()
+    # Members are never deleted by the app; clear the rows the triggers derived from the fine first
+    MemberBalance.query.filter_by(member_id=member.id).delete()
+    MemberMonthlyRollup.query.filter_by(member_id=member.id).delete()
+    Member.query.filter_by(id=member.id).delete()
+    db.session.commit()
+
+
+def test_reconcile_closes_debt_that_is_already_covered(member):
+    from app import db
+    from app.models.fines import Fine
+    from app.models.payment import Payment, PaymentAllocation
+    from app.utils.payments import reconcile_payments
+
+    # A fine fully paid by an earlier payment whose status was edited back to pending
+    fine = Fine(member_id=member.id, amount=Decimal("100.00"), date=date(2026, 1, 5), status="pending",
+                reason="Late to meeting")
+    earlier = Payment(provider_ref="RECONCILE-T1", phone=member.phone, amount=Decimal("100.00"),
+                      allocated_amount=Decimal("100.00"), date=date(2026, 1, 6), member_id=member.id,
+                      status="allocated")
+    db.session.add_all([fine, earlier])
+    db.session.flush()
+    db.session.add(PaymentAllocation(payment_id=earlier.id, fine_id=fine.id, amount=Decimal("100.00")))
+    # A new payment with nothing left to settle
+    latest = Payment(provider_ref="RECONCILE-T2", phone=member.phone, amount=Decimal("50.00"),
+                     date=date(2026, 2, 1), member_id=member.id, status="unallocated")
+    db.session.add(latest)
+    db.session.commit()
+
+    report = reconcile_payments()
+
+    assert report["fines_settled"] == 1
+    assert report["allocations"] == 0
+    db.session.expire_all()
+    assert db.session.get(Fine, fine.id).status == "paid"
+    assert PaymentAllocation.query.filter_by(fine_id=fine.id).count() == 1
+    latest = db.session.get(Payment, latest.id)
+    assert (latest.status, latest.allocated_amount) == ("unallocated", Decimal("0.00"))
@@ -0,0 +1,93 @@
+# The counters are kept by the triggers of migration 6f2b9c0d4a17, so these
+# tests need a throwaway Postgres database upgraded with `flask db upgrade`:
+#   TEST_DATABASE_URL=postgresql://.../chama_test python -m pytest tests
+import os
+
+import pytest
+from sqlalchemy import text
+from werkzeug.security import generate_password_hash
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or "").startswith("postgresql"),
+    reason="set TEST_DATABASE_URL to a scratch Postgres database"
+)
+
+ADD_ATTENDANCE = text("INSERT INTO attendances (member_id, date, status) VALUES (:member_id, '2026-01-05', 'present')")
+ADD_CONTRIBUTION = text("INSERT INTO contributions (member_id, date, amount) VALUES (:member_id, '2026-01-05', 100)")
+
+
+@pytest.fixture
+def members(app):
+    from app import db
+    from app.models.attendance import Attendance
+    from app.models.contribution import Contribution
+    from app.models.member_balance import MemberBalance
+    from app.models.member_monthly_rollup import MemberMonthlyRollup
+    from app.models.members import Member
+
+    members = [
+        Member(name=f"Version Test {n}", email=f"version-test-{n}@example.com", phone=f"25470099910{n}",
+               gender="female", password_hash=generate_password_hash("Passw0rd!"), role="member")
+        for n in (1, 2)
+    ]
+    db.session.add_all(members)
+    db.session.commit()
+    member_ids = [member.id for member in members]
+    yield member_ids
+
+    for model in (Attendance, Contribution, MemberBalance, MemberMonthlyRollup, Member):
+        column = model.id if model is Member else model.member_id
+        model.query.filter(column.in_(member_ids)).delete(synchronize_session=False)
+    db.session.commit()
+
+
+@pytest.fixture
+def connections(app):
+    """Two independent transactions that fail fast instead of waiting on a lock."""
+    from app import db
+
+    opened = [db.engine.connect() for _ in range(2)]
+    for connection in opened:
+        connection.execute(text("SET lock_timeout = '2s'"))
+    yield opened
+    for connection in opened:
+        connection.rollback()
+        connection.close()
+
+
+def versions():
+    from app.utils.table_versions import current_versions
+    from app import db
+
+    db.session.rollback()
+    return current_versions(['attendances', 'contributions'])
+
+
+def test_writers_to_one_table_do_not_wait_for_each_other(members, connections):
+    first, second = connections
+    before = versions()
+
+    first.execute(ADD_ATTENDANCE, {"member_id": members[0]})
+    # With the counter bumped per statement, this waited for `first` to end
+    second.execute(ADD_ATTENDANCE, {"member_id": members[1]})
+    assert versions() == before
+
+    first.commit()
+    second.commit()
+    assert versions() == [before[0] + 2, before[1]]
+
+
+def test_writers_crossing_tables_do_not_deadlock(members, connections):
+    first, second = connections
+    before = versions()
+
+    first.execute(ADD_ATTENDANCE, {"member_id": members[0]})
+    second.execute(ADD_CONTRIBUTION, {"member_id": members[1]})
+    first.execute(ADD_CONTRIBUTION, {"member_id": members[0]})
+    second.execute(ADD_ATTENDANCE, {"member_id": members[1]})
+    first.commit()
+    second.commit()
+
+    # One bump per table per transaction, however many statements wrote to it
+    assert versions() == [before[0] + 2, before[1] + 2]
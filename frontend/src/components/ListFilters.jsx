@@ -0,0 +1,90 @@
+import { useState } from "react";
+
+const inputClass = "border border-[var(--beige)] rounded-lg p-2 focus:outline-none focus:ring-2 focus:ring-[var(--brown-medium)]";
+
+// Filter bar for the admin list pages. The filters are applied by the server (see utils/listPage.jsx),
+// so only the matching rows are downloaded.
+// statuses: [{ value, label }] for a status filter, omitted when the list has none
+// amounts: show the min/max amount filters
+// onApply(filters) is called with the filter values when the admin applies or clears them
+const ListFilters = ({ members, statuses, amounts = false, initial = {}, onApply }) => {
+    const empty = {
+        member_id: "",
+        date_from: "",
+        date_to: "",
+        ...(statuses ? { status: "" } : {}),
+        ...(amounts ? { min_amount: "", max_amount: "" } : {})
+    };
+    const [filters, setFilters] = useState({ ...empty, ...initial });
+
+    const handleChange = (e) => {
+        setFilters({ ...filters, [e.target.name]: e.target.value });
+    };
+
+    const handleSubmit = (e) => {
+        e.preventDefault();
+        onApply(filters);
+    };
+
+    const handleClear = () => {
+        setFilters(empty);
+        onApply(empty);
+    };
+
+    return (
+        <form
+            onSubmit={handleSubmit}
+            className="bg-white p-4 rounded-2xl shadow-md mb-6 flex flex-wrap items-end gap-4"
+        >
+            <select name="member_id" value={filters.member_id} onChange={handleChange} className={inputClass}>
+                <option value="">All members</option>
+                {(members || []).map((member) => (
+                    <option key={member.id} value={member.id}>
+                        {member.name}
+                    </option>
+                ))}
+            </select>
+            <label className="flex flex-col text-sm text-[var(--brown-dark)]">
+                From
+                <input type="date" name="date_from" value={filters.date_from} onChange={handleChange} className={inputClass} />
+            </label>
+            <label className="flex flex-col text-sm text-[var(--brown-dark)]">
+                To
+                <input type="date" name="date_to" value={filters.date_to} onChange={handleChange} className={inputClass} />
+            </label>
+            {statuses && (
+                <select name="status" value={filters.status} onChange={handleChange} className={inputClass}>
+                    <option value="">All statuses</option>
+                    {statuses.map(({ value, label }) => (
+                        <option key={value} value={value}>
+                            {label}
+                        </option>
+                    ))}
+                </select>
+            )}
+            {amounts && (
+                <>
+                    <input type="number" name="min_amount" placeholder="Min amount" value={filters.min_amount}
+                        onChange={handleChange} className={inputClass} />
+                    <input type="number" name="max_amount" placeholder="Max amount" value={filters.max_amount}
+                        onChange={handleChange} className={inputClass} />
+                </>
+            )}
+            <button
+                type="submit"
+                className="bg-[var(--brown-medium)] text-white px-6 py-2 rounded-xl font-semibold shadow-md hover:opacity-90 transition"
+            >
+                Apply Filters
+            </button>
+            <button
+                type="button"
+                onClick={handleClear}
+                className="bg-[var(--beige)] text-[var(--brown-dark)] px-6 py-2 rounded-xl font-semibold shadow-md hover:opacity-90 transition"
+            >
+                Clear
+            </button>
+        </form>
+    );
+};
+
+export default ListFilters;
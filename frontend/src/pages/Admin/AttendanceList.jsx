@@ -6,6 +6,7 @@ import {
     updateAttendance
 } from "../../redux/Slices/attendanceSlice";
 import { FetchAllMembers } from "../../redux/Slices/membersSlice";
+import ListFilters from "../../components/ListFilters";
 import {
     XAxis,
     YAxis,
@@ -24,7 +25,7 @@ import "react-toastify/dist/ReactToastify.css";
 
 const AttendanceList = () => {
     const dispatch = useDispatch();
-    const { attendances, loading, error } = useSelector(state => state.attendance);
+    const { attendances, loading, loadingMore, error, filters, nextCursor } = useSelector(state => state.attendance);
 
     const { members } = useSelector(state => state.members);
 
@@ -46,6 +47,14 @@ const AttendanceList = () => {
         dispatch(FetchAllMembers());
     }, [dispatch]);
 
+    const applyFilters = newFilters => {
+        dispatch(fetchAllAttendances({ filters: newFilters }));
+    };
+
+    const loadMore = () => {
+        dispatch(fetchAllAttendances({ after: nextCursor }));
+    };
+
     const handleChange = e => {
         setForm({ ...form, [e.target.name]: e.target.value });
     };
@@ -87,7 +96,10 @@ const AttendanceList = () => {
     };
 
     useEffect(() => {
-        if (attendances.length > 0) {
+        if (attendances.length === 0) {
+            setBarByMember([]);
+            setBarByDate([]);
+        } else {
             // --- Attendance Per Member ---
             const memberMap = {};
             attendances.forEach(att => {
@@ -190,6 +202,18 @@ const AttendanceList = () => {
                 </form>
             </div>
 
+            {/* FILTERS (applied by the server) */}
+            <ListFilters
+                members={members}
+                statuses={[
+                    { value: "present", label: "Present" },
+                    { value: "absent", label: "Absent" },
+                    { value: "late", label: "Late" }
+                ]}
+                initial={filters}
+                onApply={applyFilters}
+            />
+
             {/* TABLE */}
             {loading && <p className="text-[var(--brown-dark)]">Loading...</p>}
             {error && <p className="text-red-500">{error}</p>}
@@ -240,6 +264,18 @@ const AttendanceList = () => {
                 </table>
             </div>
 
+            {nextCursor && (
+                <div className="mt-6 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="bg-[var(--brown-medium)] text-white px-6 py-2 rounded-xl font-semibold shadow-md hover:opacity-90 transition disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more attendance records"}
+                    </button>
+                </div>
+            )}
+
             <div className="p-4 space-y-10">
                 <h2 className="text-2xl font-bold text-[var(--brown-dark)]">
                     Attendance Analytics
@@ -248,6 +284,7 @@ const AttendanceList = () => {
                     <h2 className="text-xl font-bold text-[var(--brown-dark)]">
                         Attendance Analytics
                     </h2>
+                    <p className="text-sm opacity-70">Covers the attendance records listed above</p>
 
                     {/* Bar Chart: Attendance Per Member */}
                     <div className="bg-white p-6 rounded-xl shadow-lg">
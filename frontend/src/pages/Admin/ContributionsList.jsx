@@ -10,6 +10,8 @@ import {
 } from "../../redux/Slices/contributionsSlice";
 
 import { FetchAllMembers } from "../../redux/Slices/membersSlice";
+import { dashboardService } from "../../services/dashboardService";
+import ListFilters from "../../components/ListFilters";
 
 import { ToastContainer, toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
@@ -17,7 +19,7 @@ import Swal from "sweetalert2";
 
 const ContributionList = () => {
     const dispatch = useDispatch();
-    const { contributions, loading, error } = useSelector(
+    const { contributions, loading, loadingMore, error, filters, nextCursor } = useSelector(
         (state) => state.contributions
     );
 
@@ -37,10 +39,27 @@ const ContributionList = () => {
 
     const [editId, setEditId] = useState(null);
 
+    // Overall total, summed by the server over every contribution (the list only holds the loaded pages)
+    const [summary, setSummary] = useState(null);
+    const refreshSummary = () => {
+        dashboardService.getDashboardSummary()
+            .then(setSummary)
+            .catch(() => setSummary(null));
+    };
+
     useEffect(() => {
         dispatch(fetchContributions());
+        refreshSummary();
     }, [dispatch]);
 
+    const applyFilters = (newFilters) => {
+        dispatch(fetchContributions({ filters: newFilters }));
+    };
+
+    const loadMore = () => {
+        dispatch(fetchContributions({ after: nextCursor }));
+    };
+
     const handleChange = (e) => {
         setFormData({
             ...formData,
@@ -57,6 +76,7 @@ const ContributionList = () => {
                 .then(() => {
                     toast.success("Contribution updated successfully!");
                     setEditId(null);
+                    refreshSummary();
                 })
                 .catch(() => {
                     toast.error("Failed to update contribution.");
@@ -66,6 +86,7 @@ const ContributionList = () => {
                 .unwrap()
                 .then(() => {
                     toast.success("Contribution added successfully!");
+                    refreshSummary();
                 })
                 .catch(() => {
                     toast.error("Failed to add contribution.");
@@ -111,6 +132,7 @@ const ContributionList = () => {
                     .unwrap()
                     .then(() => {
                         Swal.fire("Deleted!", "The contribution has been deleted.", "success");
+                        refreshSummary();
                     })
                     .catch(() => {
                         Swal.fire("Error!", "Something went wrong.", "error");
@@ -138,11 +160,8 @@ const ContributionList = () => {
         total
     }));
 
-    // Calculate total contributions overall
-    const totalContributions = Object.values(contributionsByDate).reduce(
-        (sum, value) => sum + value,
-        0
-    );
+    // Total contributions overall
+    const totalContributions = summary ? parseFloat(summary.contributions.total) || 0 : 0;
 
     const getMemberName = (id) => {
         const member = members.find((m) => m.id === id);
@@ -202,6 +221,9 @@ const ContributionList = () => {
                 </button>
             </form>
 
+            {/* FILTERS (applied by the server) */}
+            <ListFilters members={members} amounts initial={filters} onApply={applyFilters} />
+
             {/* STATUS */}
             {loading && <p className="text-[var(--brown-dark)] mb-4">Loading...</p>}
             {error && <p className="text-red-500 mb-4">{error}</p>}
@@ -246,9 +268,22 @@ const ContributionList = () => {
                 </table>
             </div>
 
+            {nextCursor && (
+                <div className="mt-6 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="bg-[var(--brown-medium)] text-white px-6 py-2 rounded-xl font-semibold shadow-md hover:opacity-90 transition disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more contributions"}
+                    </button>
+                </div>
+            )}
+
             <div className="mt-8 bg-white p-4 rounded-xl">
                 <h3 className="text-2xl font-bold mb-4">Total Contributions per Date</h3>
-                <p className="mb-4 text-lg font-semibold">Overall Total: KSh {totalContributions.toLocaleString()}</p>
+                <p className="mb-2 text-lg font-semibold">Overall Total: KSh {totalContributions.toLocaleString()}</p>
+                <p className="mb-4 text-sm opacity-70">The chart covers the contributions listed above</p>
 
                 <ResponsiveContainer width="100%" height={300}>
                     <BarChart
@@ -8,6 +8,8 @@ import {
 } from "../../redux/Slices/fineSlice";
 
 import { FetchAllMembers } from "../../redux/Slices/membersSlice";
+import { dashboardService } from "../../services/dashboardService";
+import ListFilters from "../../components/ListFilters";
 
 import { ToastContainer, toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
@@ -15,7 +17,7 @@ import Swal from "sweetalert2";
 
 const FineList = () => {
     const dispatch = useDispatch();
-    const { fines, loading } = useSelector((state) => state.fine);
+    const { fines, loading, loadingMore, filters, nextCursor } = useSelector((state) => state.fine);
 
     const { members } = useSelector((state) => state.members);
 
@@ -30,12 +32,28 @@ const FineList = () => {
         reason: ""
     });
 
+    // Totals for the summary cards, counted by the server over every fine (the list only holds the loaded pages)
+    const [summary, setSummary] = useState(null);
+    const refreshSummary = () => {
+        dashboardService.getDashboardSummary()
+            .then(setSummary)
+            .catch(() => setSummary(null));
+    };
+
     useEffect(() => {
         dispatch(fetchAllFines());
-        console.log("Fetched fines:", fines);
         dispatch(FetchAllMembers());
+        refreshSummary();
     }, [dispatch]);
 
+    const applyFilters = (newFilters) => {
+        dispatch(fetchAllFines({ filters: newFilters }));
+    };
+
+    const loadMore = () => {
+        dispatch(fetchAllFines({ after: nextCursor }));
+    };
+
     const handleChange = (e) => {
         setForm({ ...form, [e.target.name]: e.target.value });
     };
@@ -49,6 +67,7 @@ const FineList = () => {
                 .then(() => {
                     toast.success("Fine updated successfully!");
                     setEditingId(null);
+                    refreshSummary();
                 })
                 .catch(() => {
                     toast.error("Failed to update fine.");
@@ -58,6 +77,7 @@ const FineList = () => {
                 .unwrap()
                 .then(() => {
                     toast.success("Fine created successfully!");
+                    refreshSummary();
                 })
                 .catch(() => {
                     toast.error("Failed to create fine.");
@@ -105,6 +125,7 @@ const FineList = () => {
                     .unwrap()
                     .then(() => {
                         Swal.fire("Deleted!", "The fine has been deleted.", "success");
+                        refreshSummary();
                     })
                     .catch(() => {
                         Swal.fire("Error!", "Something went wrong.", "error");
@@ -135,7 +156,9 @@ const FineList = () => {
                     <div className="text-5xl opacity-80">💰</div>
                     <div>
                         <h3 className="text-xl font-semibold mb-1">Total Fines</h3>
-                        <p className="text-3xl font-bold">{fines?.length || 0}</p>
+                        <p className="text-3xl font-bold">
+                            {summary ? summary.fines.outstanding.count + summary.fines.paid.count : "…"}
+                        </p>
                         <span className="text-sm opacity-70">All fines in the system</span>
                     </div>
                 </div>
@@ -145,7 +168,7 @@ const FineList = () => {
                     <div className="text-5xl opacity-80">⏳</div>
                     <div>
                         <h3 className="text-xl font-semibold mb-1">Pending Fines</h3>
-                        <p className="text-3xl font-bold">{pendingFines.length}</p>
+                        <p className="text-3xl font-bold">{summary ? summary.fines.outstanding.count : "…"}</p>
                         <span className="text-sm opacity-70">Fines not yet paid</span>
                     </div>
                 </div>
@@ -155,7 +178,7 @@ const FineList = () => {
                     <div className="text-5xl opacity-80">✅</div>
                     <div>
                         <h3 className="text-xl font-semibold mb-1">Paid Fines</h3>
-                        <p className="text-3xl font-bold">{paidFines.length}</p>
+                        <p className="text-3xl font-bold">{summary ? summary.fines.paid.count : "…"}</p>
                         <span className="text-sm opacity-70">Fines that are settled</span>
                     </div>
                 </div>
@@ -229,6 +252,15 @@ const FineList = () => {
                 </form>
             </div>
 
+            {/* FILTERS (applied by the server) */}
+            <ListFilters
+                members={members}
+                statuses={[{ value: "pending", label: "Pending" }, { value: "paid", label: "Paid" }]}
+                amounts
+                initial={filters}
+                onApply={applyFilters}
+            />
+
             {/* PENDING FINES TABLE */}
             <div className="overflow-x-auto shadow-md mb-8 bg-white rounded-2xl p-4">
                 <h2 className="text-2xl font-bold mb-4 text-[var(--brown-dark)]">Pending Fines</h2>
@@ -300,6 +332,18 @@ const FineList = () => {
                 </table>
             </div>
 
+            {nextCursor && (
+                <div className="mt-6 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="bg-[var(--brown-medium)] text-white px-6 py-2 rounded-xl font-semibold shadow-md hover:opacity-90 transition disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more fines"}
+                    </button>
+                </div>
+            )}
+
             {/* Toastify Container */}
             <ToastContainer
                 position="top-right"
@@ -7,6 +7,8 @@ import {
 } from "../../redux/Slices/loanSlice"
 
 import { FetchAllMembers } from '../../redux/Slices/membersSlice';
+import { dashboardService } from "../../services/dashboardService";
+import ListFilters from "../../components/ListFilters";
 
 import { ToastContainer, toast } from "react-toastify";
 import "react-toastify/dist/ReactToastify.css";
@@ -15,7 +17,7 @@ const AdminLoanList = () => {
 
     const dispatch = useDispatch();
 
-    const { loans, loading } = useSelector((state) => state.loan);
+    const { loans, loading, loadingMore, filters, nextCursor } = useSelector((state) => state.loan);
     const { members } = useSelector((state) => state.members);
 
     const formRef = useRef();
@@ -28,11 +30,28 @@ const AdminLoanList = () => {
         status: "borrowed"
     });
 
+    // Totals for the summary cards, counted by the server over every loan (the list only holds the loaded pages)
+    const [summary, setSummary] = useState(null);
+    const refreshSummary = () => {
+        dashboardService.getDashboardSummary()
+            .then(setSummary)
+            .catch(() => setSummary(null));
+    };
+
     useEffect(() => {
         dispatch(fetchAllLoans());
         dispatch(FetchAllMembers());
+        refreshSummary();
     }, [dispatch]);
 
+    const applyFilters = (newFilters) => {
+        dispatch(fetchAllLoans({ filters: newFilters }));
+    };
+
+    const loadMore = () => {
+        dispatch(fetchAllLoans({ after: nextCursor }));
+    };
+
     const handleChange = (e) => {
         setForm({ ...form, [e.target.name]: e.target.value });
     };
@@ -45,6 +64,7 @@ const AdminLoanList = () => {
                 .then(() => {
                     toast.success("Loan updated successfully!");
                     setEditingId(null);
+                    refreshSummary();
                 })
                 .catch(() => {
                     toast.error("Failed to update loan.");
@@ -54,6 +74,7 @@ const AdminLoanList = () => {
                 .unwrap()
                 .then(() => {
                     toast.success("Loan created successfully!");
+                    refreshSummary();
                 })
                 .catch(() => {
                     toast.error("Failed to create loan.");
@@ -107,7 +128,9 @@ const AdminLoanList = () => {
                     <div className="text-5xl opacity-80">💵</div>
                     <div>
                         <h3 className="text-xl font-semibold mb-1">Total Loans</h3>
-                        <p className="text-3xl font-bold">{loans?.length || 0}</p>
+                        <p className="text-3xl font-bold">
+                            {summary ? summary.loans.active.count + summary.loans.paid.count : "…"}
+                        </p>
                         <span className="text-sm opacity-70">All loans in the system</span>
                     </div>
                 </div>
@@ -117,7 +140,7 @@ const AdminLoanList = () => {
                     <div className="text-5xl opacity-80">⏳</div>
                     <div>
                         <h3 className="text-xl font-semibold mb-1">Pending Loans</h3>
-                        <p className="text-3xl font-bold">{pendingLoans.length}</p>
+                        <p className="text-3xl font-bold">{summary ? summary.loans.active.count : "…"}</p>
                         <span className="text-sm opacity-70">Loans not yet paid</span>
                     </div>
                 </div>
@@ -127,7 +150,7 @@ const AdminLoanList = () => {
                     <div className="text-5xl opacity-80">✅</div>
                     <div>
                         <h3 className="text-xl font-semibold mb-1">Paid Loans</h3>
-                        <p className="text-3xl font-bold">{paidLoans.length}</p>
+                        <p className="text-3xl font-bold">{summary ? summary.loans.paid.count : "…"}</p>
                         <span className="text-sm opacity-70">Loans that are settled</span>
                     </div>
                 </div>
@@ -190,7 +213,16 @@ const AdminLoanList = () => {
                 </form>
             </div>
 
-            {/* PENDING FINES TABLE */}
+            {/* FILTERS (applied by the server) */}
+            <ListFilters
+                members={members}
+                statuses={[{ value: "borrowed", label: "Borrowed" }, { value: "paid", label: "Paid" }]}
+                amounts
+                initial={filters}
+                onApply={applyFilters}
+            />
+
+            {/* PENDING LOANS TABLE */}
             <div className="overflow-x-auto shadow-md mb-8 bg-white rounded-2xl p-4">
                 <h2 className="text-2xl font-bold mb-4 text-[var(--brown-dark)]">Pending Loans</h2>
                 <table className="min-w-full border-collapse border border-[var(--beige)] text-left">
@@ -251,6 +283,18 @@ const AdminLoanList = () => {
                 </table>
             </div>
 
+            {nextCursor && (
+                <div className="mt-6 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="bg-[var(--brown-medium)] text-white px-6 py-2 rounded-xl font-semibold shadow-md hover:opacity-90 transition disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more loans"}
+                    </button>
+                </div>
+            )}
+
             {/* Toastify Container */}
             <ToastContainer
                 position="top-right"
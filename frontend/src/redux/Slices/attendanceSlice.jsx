@@ -1,18 +1,20 @@
 import { createSlice, createAsyncThunk } from "@reduxjs/toolkit";
 import { attendanceService } from "../../services/attendanceService";
 
-// Async thunk to fetch all attendance records (admin only)
+// Async thunk to fetch one page of attendance records (admin only), newest first
+// filters are the server-side list filters; without them the ones already applied are kept.
+// after is the cursor of the last page loaded: that page's successor is appended to the list.
 export const fetchAllAttendances = createAsyncThunk(
     "attendance/fetchAllAttendances",
-    async (_, thunkAPI) => {
+    async ({ filters, after } = {}, thunkAPI) => {
         try {
-            const response = await attendanceService.getAttendances();
-            return response;
-        }
-        catch (error) {
+            const applied = filters ?? thunkAPI.getState().attendance.filters;
+            const page = await attendanceService.getAttendances({ ...applied, after });
+            return { ...page, filters: applied, append: Boolean(after) };
+        } catch (error) {
             return thunkAPI.rejectWithValue(error.message);
         }
-    }   
+    }
 );
 
 // Async thunk to fetch a specific attendance record by ID (admin only)
@@ -96,21 +98,34 @@ const attendanceSlice = createSlice({
         myAttendances: [],
         selectedAttendance: null,
         loading: false,
-        error: null
+        loadingMore: false,
+        error: null,
+        // Server-side filters of the admin list, and the cursor of its next page (null on the last one)
+        filters: {},
+        nextCursor: null,
     },
     reducers: {},
     extraReducers: (builder) => {
         builder
-            .addCase(fetchAllAttendances.pending, (state) => {
-                state.loading = true;
+            .addCase(fetchAllAttendances.pending, (state, action) => {
+                // Loading the next page keeps the rows already shown
+                state.loading = !action.meta.arg?.after;
+                state.loadingMore = Boolean(action.meta.arg?.after);
                 state.error = null;
             })
             .addCase(fetchAllAttendances.fulfilled, (state, action) => {
                 state.loading = false;
-                state.attendances = action.payload;
+                state.loadingMore = false;
+                state.attendances = action.payload.append
+                    ? [...state.attendances, ...action.payload.items]
+                    : action.payload.items;
+                state.nextCursor = action.payload.nextCursor;
+                state.filters = action.payload.filters;
+                state.error = null;
             })
             .addCase(fetchAllAttendances.rejected, (state, action) => {
                 state.loading = false;
+                state.loadingMore = false;
                 state.error = action.payload;
             })
             .addCase(fetchAttendanceById.pending, (state) => {
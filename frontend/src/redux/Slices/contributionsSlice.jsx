@@ -24,13 +24,16 @@ export const createContribution = createAsyncThunk(
     }
 );
 
+// Async thunk to fetch one page of contributions (admin only), newest first
+// filters are the server-side list filters; without them the ones already applied are kept.
+// after is the cursor of the last page loaded: that page's successor is appended to the list.
 export const fetchContributions = createAsyncThunk(
-    'contributions/fetchContributions',
-    async (_, thunkAPI) => {
+    "contributions/fetchContributions",
+    async ({ filters, after } = {}, thunkAPI) => {
         try {
-            const response = await contributionService.getContributions();
-
-            return response;
+            const applied = filters ?? thunkAPI.getState().contributions.filters;
+            const page = await contributionService.getContributions({ ...applied, after });
+            return { ...page, filters: applied, append: Boolean(after) };
         } catch (error) {
             return thunkAPI.rejectWithValue(error.message);
         }
@@ -99,7 +102,11 @@ const contributionsSlice = createSlice({
     initialState: {
         contributions: [],
         loading: false,
+        loadingMore: false,
         error: null,
+        // Server-side filters of the admin list, and the cursor of its next page (null on the last one)
+        filters: {},
+        nextCursor: null,
     },
     reducers: {},
     extraReducers: (builder) => {
@@ -118,17 +125,25 @@ const contributionsSlice = createSlice({
                 state.loading = false;
                 state.error = action.payload;
             })
-            .addCase(fetchContributions.pending, (state) => {
-                state.loading = true;
+            .addCase(fetchContributions.pending, (state, action) => {
+                // Loading the next page keeps the rows already shown
+                state.loading = !action.meta.arg?.after;
+                state.loadingMore = Boolean(action.meta.arg?.after);
                 state.error = null;
             })
             .addCase(fetchContributions.fulfilled, (state, action) => {
                 state.loading = false;
-                state.contributions = action.payload;
+                state.loadingMore = false;
+                state.contributions = action.payload.append
+                    ? [...state.contributions, ...action.payload.items]
+                    : action.payload.items;
+                state.nextCursor = action.payload.nextCursor;
+                state.filters = action.payload.filters;
                 state.error = null;
             })
             .addCase(fetchContributions.rejected, (state, action) => {
                 state.loading = false;
+                state.loadingMore = false;
                 state.error = action.payload;
             })
             .addCase(fetchContributionById.pending, (state) => {
@@ -1,13 +1,16 @@
 import { createAsyncThunk, createSlice } from "@reduxjs/toolkit";
 import { fineService } from "../../services/fineService";
 
-// Async thunk to fetch all fines for the current member
+// Async thunk to fetch one page of fines (admin only), newest first
+// filters are the server-side list filters; without them the ones already applied are kept.
+// after is the cursor of the last page loaded: that page's successor is appended to the list.
 export const fetchAllFines = createAsyncThunk(
     "fine/fetchAllFines",
-    async (_, thunkAPI) => {
+    async ({ filters, after } = {}, thunkAPI) => {
         try {
-            const response = await fineService.getAllFines();
-            return response;
+            const applied = filters ?? thunkAPI.getState().fine.filters;
+            const page = await fineService.getAllFines({ ...applied, after });
+            return { ...page, filters: applied, append: Boolean(after) };
         } catch (error) {
             return thunkAPI.rejectWithValue(error.message);
         }
@@ -90,21 +93,34 @@ const fineSlice = createSlice({
         fines: [],
         fineDetails: null,
         loading: false,
+        loadingMore: false,
         error: null,
+        // Server-side filters of the admin list, and the cursor of its next page (null on the last one)
+        filters: {},
+        nextCursor: null,
     },
     reducers: {},
     extraReducers: (builder) => {
         builder
-            .addCase(fetchAllFines.pending, (state) => {
-                state.loading = true;
+            .addCase(fetchAllFines.pending, (state, action) => {
+                // Loading the next page keeps the rows already shown
+                state.loading = !action.meta.arg?.after;
+                state.loadingMore = Boolean(action.meta.arg?.after);
                 state.error = null;
             })
             .addCase(fetchAllFines.fulfilled, (state, action) => {
                 state.loading = false;
-                state.fines = action.payload;
+                state.loadingMore = false;
+                state.fines = action.payload.append
+                    ? [...state.fines, ...action.payload.items]
+                    : action.payload.items;
+                state.nextCursor = action.payload.nextCursor;
+                state.filters = action.payload.filters;
+                state.error = null;
             })
             .addCase(fetchAllFines.rejected, (state, action) => {
                 state.loading = false;
+                state.loadingMore = false;
                 state.error = action.payload;
             })
             .addCase(fetchFineById.pending, (state) => {
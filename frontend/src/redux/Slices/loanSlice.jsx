@@ -1,13 +1,16 @@
 import { createAsyncThunk, createSlice } from "@reduxjs/toolkit";
 import { loanService } from "../../services/loanService";
 
-// Async thunk to fetch all loans for the current member
+// Async thunk to fetch one page of loans (admin only), newest first
+// filters are the server-side list filters; without them the ones already applied are kept.
+// after is the cursor of the last page loaded: that page's successor is appended to the list.
 export const fetchAllLoans = createAsyncThunk(
     "loan/fetchAllLoans",
-    async (_, thunkAPI) => {
+    async ({ filters, after } = {}, thunkAPI) => {
         try {
-            const response = await loanService.getAllLoans();
-            return response;
+            const applied = filters ?? thunkAPI.getState().loan.filters;
+            const page = await loanService.getAllLoans({ ...applied, after });
+            return { ...page, filters: applied, append: Boolean(after) };
         } catch (error) {
             return thunkAPI.rejectWithValue(error.message);
         }
@@ -90,21 +93,34 @@ const loanSlice = createSlice({
         loans: [],
         loanDetails: null,
         loading: false,
+        loadingMore: false,
         error: null,
+        // Server-side filters of the admin list, and the cursor of its next page (null on the last one)
+        filters: {},
+        nextCursor: null,
     },
     reducers: {},
     extraReducers: (builder) => {
         builder
-            .addCase(fetchAllLoans.pending, (state) => {
-                state.loading = true;
+            .addCase(fetchAllLoans.pending, (state, action) => {
+                // Loading the next page keeps the rows already shown
+                state.loading = !action.meta.arg?.after;
+                state.loadingMore = Boolean(action.meta.arg?.after);
                 state.error = null;
             })
             .addCase(fetchAllLoans.fulfilled, (state, action) => {
                 state.loading = false;
-                state.loans = action.payload;
+                state.loadingMore = false;
+                state.loans = action.payload.append
+                    ? [...state.loans, ...action.payload.items]
+                    : action.payload.items;
+                state.nextCursor = action.payload.nextCursor;
+                state.filters = action.payload.filters;
+                state.error = null;
             })
             .addCase(fetchAllLoans.rejected, (state, action) => {
                 state.loading = false;
+                state.loadingMore = false;
                 state.error = action.payload;
             })
             .addCase(fetchLoanById.pending, (state) => {
@@ -1,4 +1,6 @@
 import { API_URL } from "../../config";
+import { authFetch } from "../utils/authFetch";
+import { listParams, readPage } from "../utils/listPage";
 
 // Helper token
 const getAuthHeaders = () => {
@@ -8,7 +10,7 @@ const getAuthHeaders = () => {
 
 // Sends a POST request to the backend to create a new attendance record
 export const createAttendance = async (attendanceData) => {
-    const response = await fetch(`${API_URL}/attendance`, {
+    const response = await authFetch(`${API_URL}/attendance`, {
         method: "POST",
         headers: {
             'Content-Type': 'application/json',
@@ -26,9 +28,32 @@ export const createAttendance = async (attendanceData) => {
     return data;
 };
 
-// Sends a GET request to the backend to retrieve all attendance records
-export const getAttendances = async () => {
-    const response = await fetch(`${API_URL}/attendance`, {
+// Sends one POST request with a whole meeting's roll call
+// records is a list of { member_id, status }; re-submitting the same date updates it
+export const createBulkAttendance = async (date, records) => {
+    const response = await authFetch(`${API_URL}/attendance/bulk`, {
+        method: "POST",
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: JSON.stringify({ date, records })
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to record attendance");
+    }
+
+    return response.json();
+};
+
+// Sends a GET request to the backend for one page of attendance records, newest first
+// query holds the server-side filters, e.g. { date_from, date_to, member_id, status },
+// plus an optional limit and the after cursor of the previous page
+// Resolves to { items, nextCursor }; nextCursor is null on the last page
+export const getAttendances = async (query = {}) => {
+    const response = await authFetch(`${API_URL}/attendance?${listParams(query)}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -39,14 +64,13 @@ export const getAttendances = async () => {
         throw new Error(errorData.message || "Failed to fetch attendance records");
     }
 
-    const data = await response.json();
-    return data;
+    return readPage(response);
 };
 
 
 // Sends a GET request to the backend to retrieve a specific attendance record by ID
 export const getAttendanceById = async (id) => {
-    const response = await fetch(`${API_URL}/attendance/${id}`, {
+    const response = await authFetch(`${API_URL}/attendance/${id}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -64,7 +88,7 @@ export const getAttendanceById = async (id) => {
 
 // Sends a DELETE request to the backend to delete a specific attendance record by ID
 export const deleteAttendance = async (id) => {
-    const response = await fetch(`${API_URL}/attendance/${id}`, {
+    const response = await authFetch(`${API_URL}/attendance/${id}`, {
         method: "DELETE",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -79,8 +103,28 @@ export const deleteAttendance = async (id) => {
     return response.json();
 };
 
+// Sends one DELETE request that removes many attendance records, e.g. a cancelled meeting's roll call
+// selection is { ids: [...] } and/or { filter: { date, date_from, date_to, member_id, status } }
+export const bulkDeleteAttendances = async (selection) => {
+    const response = await authFetch(`${API_URL}/attendance/bulk`, {
+        method: "DELETE",
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: JSON.stringify(selection)
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to delete attendance records");
+    }
+
+    return response.json();
+};
+
 export const getMyAttendances = async () => {
-    const response = await fetch(`${API_URL}/attendance/my`, {
+    const response = await authFetch(`${API_URL}/attendance/my`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -97,7 +141,7 @@ export const getMyAttendances = async () => {
 };
 
 export const updateAttendance = async (id, attendanceData) => {
-    const response = await fetch(`${API_URL}/attendance/${id}`, {
+    const response = await authFetch(`${API_URL}/attendance/${id}`, {
         method: "PATCH",
         headers: {
             'Content-Type': 'application/json',
@@ -117,9 +161,11 @@ export const updateAttendance = async (id, attendanceData) => {
 
 export const attendanceService = {
     createAttendance,
+    createBulkAttendance,
     getAttendances,
     getAttendanceById,
     getMyAttendances,
     deleteAttendance,
+    bulkDeleteAttendances,
     updateAttendance
 }
@@ -41,6 +41,29 @@ const register = async (userData) => {
     return data;
 }
 
+// Sends the stored refresh token to the backend to get a new access token without logging in again
+const refresh = async () => {
+    const user = JSON.parse(localStorage.getItem('user'));
+    const response = await fetch(`${API_URL}/auth/refresh`, {
+        method: "POST",
+        headers: {
+            'Authorization': `Bearer ${user?.refresh_token}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.message || "Session expired");
+    }
+
+    const data = await response.json();
+
+    // Refresh tokens are single use, so the rotated one must replace the old one
+    localStorage.setItem('user', JSON.stringify({ ...user, ...data }));
+    localStorage.setItem('token', data.access_token);
+    return data;
+}
+
 const getToken = () => {
     return localStorage.getItem('token');
 };
@@ -48,6 +71,7 @@ const getToken = () => {
 export const authService = {
     login,
     register,
+    refresh,
     getToken
 };
 
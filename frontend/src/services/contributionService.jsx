@@ -1,4 +1,6 @@
 import { API_URL } from "../../config";
+import { authFetch } from "../utils/authFetch";
+import { listParams, readPage } from "../utils/listPage";
 
 // Helper token 
 const getAuthHeaders = () => {
@@ -8,7 +10,7 @@ const getAuthHeaders = () => {
 
 // Sends a POST request to the backend to create a new contribution
 export const createContribution = async (contributionData) => {
-    const response = await fetch(`${API_URL}/contribution`, {
+    const response = await authFetch(`${API_URL}/contribution`, {
         method: "POST",
         headers: {
             'Content-Type': 'application/json',
@@ -26,9 +28,37 @@ export const createContribution = async (contributionData) => {
     return data;
 };
 
-// Sends a GET request to the backend to retrieve all contributions
-export const getContributions = async () => {
-    const response = await fetch(`${API_URL}/contribution`, {
+// Uploads a CSV (phone, date, amount) or M-Pesa statement file of contributions
+// options: { format: 'auto' | 'csv' | 'mpesa', skipInvalid, dryRun }
+// Resolves to the import report; rejected files still resolve so the row errors can be shown
+export const importContributions = async (file, { format = 'auto', skipInvalid = false, dryRun = false } = {}) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('format', format);
+    formData.append('skip_invalid', skipInvalid);
+    formData.append('dry_run', dryRun);
+
+    const response = await authFetch(`${API_URL}/contribution/import`, {
+        method: "POST",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: formData
+    });
+
+    const data = await response.json();
+    if (!response.ok && response.status !== 422) {
+        throw new Error(data.msg || "Failed to import contributions");
+    }
+    return data;
+};
+
+// Sends a GET request to the backend for one page of contributions, newest first
+// query holds the server-side filters, e.g. { date_from, date_to, member_id, min_amount, max_amount },
+// plus an optional limit and the after cursor of the previous page
+// Resolves to { items, nextCursor }; nextCursor is null on the last page
+export const getContributions = async (query = {}) => {
+    const response = await authFetch(`${API_URL}/contribution?${listParams(query)}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -39,13 +69,12 @@ export const getContributions = async () => {
         throw new Error(errorData.message || "Failed to fetch contributions");
     }
 
-    const data = await response.json();
-    return data;
+    return readPage(response);
 };
 
 // Sends a GET request to the backend to retrieve a specific contribution by ID
 export const getContributionById = async (id) => {
-    const response = await fetch(`${API_URL}/contribution/${id}`, {
+    const response = await authFetch(`${API_URL}/contribution/${id}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -64,7 +93,7 @@ export const getContributionById = async (id) => {
 
 // Sends a DELETE request to the backend to delete a specific contribution by ID
 export const deleteContribution = async (id) => {
-    const response = await fetch(`${API_URL}/contribution/${id}`, {
+    const response = await authFetch(`${API_URL}/contribution/${id}`, {
         method: "DELETE",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -81,9 +110,29 @@ export const deleteContribution = async (id) => {
 };
 
 
+// Sends one DELETE request that removes many contributions
+// selection is { ids: [...] } and/or { filter: { date, date_from, date_to, member_id } }
+export const bulkDeleteContributions = async (selection) => {
+    const response = await authFetch(`${API_URL}/contribution/bulk`, {
+        method: "DELETE",
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: JSON.stringify(selection)
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to delete contributions");
+    }
+
+    return response.json();
+};
+
 // Sends a PUT request to the backend to update a specific contribution by ID
 export const updateContribution = async (id, contributionData) => {
-    const response = await fetch(`${API_URL}/contribution/${id}`, {
+    const response = await authFetch(`${API_URL}/contribution/${id}`, {
         method: "PUT",
         headers: {
             'Content-Type': 'application/json',
@@ -103,7 +152,7 @@ export const updateContribution = async (id, contributionData) => {
 
 export const getMyContributions = async () => {
 
-    const response = await fetch(`${API_URL}/contribution/my`, {
+    const response = await authFetch(`${API_URL}/contribution/my`, {
         method: "GET",
         headers: {
             Authorization: `Bearer ${getAuthHeaders()}`
@@ -120,9 +169,11 @@ export const getMyContributions = async () => {
 
 export const contributionService = {
     createContribution,
+    importContributions,
     getContributions,
     getContributionById,
     deleteContribution,
+    bulkDeleteContributions,
     updateContribution,
     getMyContributions
 };
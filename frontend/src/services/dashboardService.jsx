@@ -0,0 +1,33 @@
+import { API_URL } from "../../config";
+import { authFetch } from "../utils/authFetch";
+
+// Helper token 
+const getAuthHeaders = () => {
+    const user = JSON.parse(localStorage.getItem('user'));
+    return user?.access_token;
+};
+
+// Sends a GET request to the backend for the admin dashboard totals.
+// The backend aggregates everything in SQL, so this one request replaces fetching
+// every contribution, fine, loan and attendance record and summing them here.
+export const getDashboardSummary = async () => {
+    const response = await authFetch(`${API_URL}/dashboard/summary`, {
+        method: "GET",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.message || "Failed to fetch dashboard summary");
+    }
+
+    return await response.json();
+};
+
+export const dashboardService = {
+    getDashboardSummary
+};
+
+export default dashboardService;
@@ -1,4 +1,6 @@
 import {API_URL} from "../../config";
+import { authFetch } from "../utils/authFetch";
+import { listParams, readPage } from "../utils/listPage";
 
 // Helper token
 const getAuthHeaders = () => {
@@ -6,8 +8,12 @@ const getAuthHeaders = () => {
     return user?.access_token;
 }
 
-export const getAllFines = async () => {
-    const response = await fetch(`${API_URL}/fine`, {
+// Sends a GET request to the backend for one page of fines, newest first
+// query holds the server-side filters, e.g. { date_from, date_to, member_id, status, min_amount, max_amount },
+// plus an optional limit and the after cursor of the previous page
+// Resolves to { items, nextCursor }; nextCursor is null on the last page
+export const getAllFines = async (query = {}) => {
+    const response = await authFetch(`${API_URL}/fine?${listParams(query)}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -19,13 +25,12 @@ export const getAllFines = async () => {
         throw new Error(errorData.message || "Failed to fetch Fines"); 
     }
 
-    const data = await response.json();
-    return data;
+    return readPage(response);
 };
 
 // Sends a POST request to the backend to create a new fine
 export const createFine = async (finedata) => {
-    const response = await fetch(`${API_URL}/fine`, {
+    const response = await authFetch(`${API_URL}/fine`, {
         method: "POST",
         headers: {
             'Content-Type': 'application/json',
@@ -45,7 +50,7 @@ export const createFine = async (finedata) => {
 
 // Sends a GET request to the backend to retrieve a specific fine by ID
 export const getFineById = async (id) => {
-    const response = await fetch(`${API_URL}/fine/${id}`, {
+    const response = await authFetch(`${API_URL}/fine/${id}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -63,7 +68,7 @@ export const getFineById = async (id) => {
 
 // Sends a PUT request to the backend to update a specific fine by ID
 export const updateFine = async (id, finedata) => {
-    const response = await fetch(`${API_URL}/fine/${id}`, {
+    const response = await authFetch(`${API_URL}/fine/${id}`, {
         method: "PUT",
         headers: {
             'Content-Type': 'application/json',
@@ -81,9 +86,49 @@ export const updateFine = async (id, finedata) => {
     return data;
 };
 
+// Sends one PATCH request that changes many fines, e.g. bulkUpdateFines({ ids }, { status: "paid" })
+// selection is { ids: [...] } and/or { filter: { date, date_from, date_to, member_id, status } }
+export const bulkUpdateFines = async (selection, changes) => {
+    const response = await authFetch(`${API_URL}/fine/bulk`, {
+        method: "PATCH",
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: JSON.stringify({ ...selection, ...changes })
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to update fines");
+    }
+
+    return response.json();
+};
+
+// Sends a POST request that generates the fines the configured rules produce for a period
+// options: { rules: ['absent', ...], dryRun: true } — rules defaults to all configured rules
+export const applyFineRules = async (dateFrom, dateTo, { rules, dryRun = false } = {}) => {
+    const response = await authFetch(`${API_URL}/fine/rules/apply`, {
+        method: "POST",
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: JSON.stringify({ date_from: dateFrom, date_to: dateTo, rules, dry_run: dryRun })
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to apply fine rules");
+    }
+
+    return response.json();
+};
+
 // Sends a DELETE request to the backend to delete a specific fine by ID
 export const deleteFine = async (id) => {
-    const response = await fetch(`${API_URL}/fine/${id}`, {
+    const response = await authFetch(`${API_URL}/fine/${id}`, {
         method: "DELETE",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -102,7 +147,7 @@ export const deleteFine = async (id) => {
 
 // Sends a GET request to the backend to retrieve all fines for a specific member 
 export const getMemberFines = async () => {
-    const response = await fetch(`${API_URL}/fine/my`, {
+    const response = await authFetch(`${API_URL}/fine/my`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -123,6 +168,8 @@ export const fineService = {
     createFine,
     getFineById,
     updateFine,
+    bulkUpdateFines,
+    applyFineRules,
     deleteFine,
     getMemberFines
 }
@@ -1,4 +1,6 @@
 import {API_URL} from "../../config";
+import { authFetch } from "../utils/authFetch";
+import { listParams, readPage } from "../utils/listPage";
 
 // Helper token
 const getAuthHeaders = () => {
@@ -6,8 +8,12 @@ const getAuthHeaders = () => {
     return user?.access_token;
 }
 
-export const getAllLoans = async () => {
-    const response = await fetch(`${API_URL}/loan`, {
+// Sends a GET request to the backend for one page of loans, newest first
+// query holds the server-side filters, e.g. { date_from, date_to, member_id, status, min_amount, max_amount },
+// plus an optional limit and the after cursor of the previous page
+// Resolves to { items, nextCursor }; nextCursor is null on the last page
+export const getAllLoans = async (query = {}) => {
+    const response = await authFetch(`${API_URL}/loan?${listParams(query)}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -19,13 +25,12 @@ export const getAllLoans = async () => {
         throw new Error(errorData.message || "Failed to fetch Loans"); 
     }
 
-    const data = await response.json();
-    return data;
+    return readPage(response);
 };
 
 // Sends a POST request to the backend to create a new fine
 export const createLoan = async (loandata) => {
-    const response = await fetch(`${API_URL}/loan`, {
+    const response = await authFetch(`${API_URL}/loan`, {
         method: "POST",
         headers: {
             'Content-Type': 'application/json',
@@ -45,7 +50,7 @@ export const createLoan = async (loandata) => {
 
 // Sends a GET request to the backend to retrieve a specific fine by ID
 export const getLoanById = async (id) => {
-    const response = await fetch(`${API_URL}/loan/${id}`, {
+    const response = await authFetch(`${API_URL}/loan/${id}`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -63,7 +68,7 @@ export const getLoanById = async (id) => {
 
 // Sends a PUT request to the backend to update a specific fine by ID
 export const updateLoan = async (id, loandata) => {
-    const response = await fetch(`${API_URL}/loan/${id}`, {
+    const response = await authFetch(`${API_URL}/loan/${id}`, {
         method: "PUT",
         headers: {
             'Content-Type': 'application/json',
@@ -81,9 +86,29 @@ export const updateLoan = async (id, loandata) => {
     return data;
 };
 
+// Sends one PATCH request that changes the status of many loans
+// selection is { ids: [...] } and/or { filter: { date, date_from, date_to, member_id, status } }
+export const bulkUpdateLoans = async (selection, changes) => {
+    const response = await authFetch(`${API_URL}/loan/bulk`, {
+        method: "PATCH",
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        },
+        body: JSON.stringify({ ...selection, ...changes })
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to update loans");
+    }
+
+    return response.json();
+};
+
 // Sends a DELETE request to the backend to delete a specific fine by ID
 export const deleteLoan = async (id) => {
-    const response = await fetch(`${API_URL}/loan/${id}`, {
+    const response = await authFetch(`${API_URL}/loan/${id}`, {
         method: "DELETE",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -102,7 +127,7 @@ export const deleteLoan = async (id) => {
 
 // Sends a GET request to the backend to retrieve all fines for a specific member 
 export const getMemberLoans = async () => {
-    const response = await fetch(`${API_URL}/loan/my`, {
+    const response = await authFetch(`${API_URL}/loan/my`, {
         method: "GET",
         headers: {
             'Authorization': `Bearer ${getAuthHeaders()}`
@@ -118,13 +143,50 @@ export const getMemberLoans = async () => {
     return data;
 };
 
+// Sends a GET request to the backend to retrieve the repayment schedule of a loan
+export const getLoanSchedule = async (id) => {
+    const response = await authFetch(`${API_URL}/loan/${id}/schedule`, {
+        method: "GET",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to fetch loan schedule.")
+    }
+
+    return await response.json();
+};
+
+// Sends a GET request to the backend to project the loan portfolio's repayments
+export const getPortfolioProjection = async (months = 12) => {
+    const response = await authFetch(`${API_URL}/loan/portfolio/projection?months=${months}`, {
+        method: "GET",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to fetch portfolio projection.")
+    }
+
+    return await response.json();
+};
+
 export const loanService = {
     getAllLoans,
     createLoan,
     getLoanById,
     updateLoan,
+    bulkUpdateLoans,
     deleteLoan,
-    getMemberLoans
+    getMemberLoans,
+    getLoanSchedule,
+    getPortfolioProjection
 }
 
 export default loanService;
\ No newline at end of file
@@ -1,4 +1,5 @@
 import { API_URL } from "../../config";
+import { authFetch } from "../utils/authFetch";
 
 // Helper token
 const getAuthHeaders = () => {
@@ -8,7 +9,7 @@ const getAuthHeaders = () => {
 
 // Sends a GET request to show all members
 export const getMembers = async () => {
-    const response = await fetch(`${API_URL}/member`, {
+    const response = await authFetch(`${API_URL}/member?all=true`, {
         method: "GET",
         headers: {
             "Authorization": `Bearer ${getAuthHeaders()}`
@@ -19,7 +20,19 @@ export const getMembers = async () => {
 
 // Sends a GET request to show a specific member by ID
 export const getMemberById = async (id) => {
-    const response = await fetch(`${API_URL}/member/${id}`, {
+    const response = await authFetch(`${API_URL}/member/${id}`, {
+        method: "GET",
+        headers: {
+            "Authorization": `Bearer ${getAuthHeaders()}`
+        }
+    });
+    return response.json();
+};
+
+// Sends a GET request for a member's statement: profile, balances, attendance and recent activity
+export const getMemberStatement = async (id, recent = 10) => {
+    const path = id ? `member/${id}` : "member/me";
+    const response = await authFetch(`${API_URL}/${path}/statement?recent=${recent}`, {
         method: "GET",
         headers: {
             "Authorization": `Bearer ${getAuthHeaders()}`
@@ -30,7 +43,7 @@ export const getMemberById = async (id) => {
 
 // Send a PATCH request to disable a member (admin only)
 export const disableMember = async (id) => {
-    const response = await fetch(`${API_URL}/member/${id}/disabled`, {
+    const response = await authFetch(`${API_URL}/member/${id}/disabled`, {
         method: "PATCH",
         headers: {
             "Authorization": `Bearer ${getAuthHeaders()}`
@@ -47,7 +60,7 @@ export const disableMember = async (id) => {
 
 // Send a PATCH request to enable a member (admin only)
 export const enableMember = async (id) => {
-    const response = await fetch(`${API_URL}/member/${id}/enable`, {
+    const response = await authFetch(`${API_URL}/member/${id}/enable`, {
         method: "PATCH",
         headers: {
             "Authorization": `Bearer ${getAuthHeaders()}`
@@ -64,7 +77,7 @@ export const enableMember = async (id) => {
 
 // Send GET request to retrieved all disabled members (admin only)
 export const getDisabledMembers = async () => {
-    const response = await fetch(`${API_URL}/member/disabled`, {
+    const response = await authFetch(`${API_URL}/member/disabled`, {
         method: "GET",
         headers: {
             "Authorization": `Bearer ${getAuthHeaders()}`
@@ -81,7 +94,7 @@ export const getDisabledMembers = async () => {
 
 // Send a PATCH request to update member details 
 export const updateMember = async (id, memberData) => {
-    const response = await fetch(`${API_URL}/member/${id}`, {
+    const response = await authFetch(`${API_URL}/member/${id}`, {
         method: "PATCH",
         headers: {
             "Content-Type": "application/json",
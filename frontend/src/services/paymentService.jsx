@@ -0,0 +1,86 @@
+import {API_URL} from "../../config";
+import { authFetch } from "../utils/authFetch";
+
+// Helper token
+const getAuthHeaders = () => {
+    const user = JSON.parse(localStorage.getItem('user'));
+    return user?.access_token;
+}
+
+// filters are optional server-side query filters, e.g. { status: 'unmatched', member_id: 3 }
+export const getAllPayments = async (filters = {}) => {
+    const params = new URLSearchParams({ all: true, ...filters });
+    const response = await authFetch(`${API_URL}/payment?${params}`, {
+        method: "GET",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to fetch payments");
+    }
+
+    return await response.json();
+};
+
+// Sends a GET request to the backend to retrieve one payment and what it was applied to
+export const getPaymentById = async (id) => {
+    const response = await authFetch(`${API_URL}/payment/${id}`, {
+        method: "GET",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to fetch payment");
+    }
+
+    return await response.json();
+};
+
+// Sends a GET request to the backend to retrieve the logged-in member's payments
+export const getMemberPayments = async () => {
+    const response = await authFetch(`${API_URL}/payment/my`, {
+        method: "GET",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to fetch payments for specified member.");
+    }
+
+    return await response.json();
+};
+
+// Sends a POST request to the backend to settle fines and loans with the payments received
+export const reconcilePayments = async () => {
+    const response = await authFetch(`${API_URL}/payment/reconcile`, {
+        method: "POST",
+        headers: {
+            'Authorization': `Bearer ${getAuthHeaders()}`
+        }
+    });
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.msg || "Failed to reconcile payments");
+    }
+
+    return await response.json();
+};
+
+export const paymentService = {
+    getAllPayments,
+    getPaymentById,
+    getMemberPayments,
+    reconcilePayments
+}
+
+export default paymentService;
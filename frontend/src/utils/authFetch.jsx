@@ -0,0 +1,43 @@
+import { authService } from "../services/authService";
+
+// A refresh already in flight; concurrent 401s wait for it instead of each spending
+// the single-use refresh token (a second use would revoke the whole session)
+let refreshing = null;
+
+// Sends the request with the current access token
+const send = (url, options) => {
+    const user = JSON.parse(localStorage.getItem('user'));
+    return fetch(url, {
+        ...options,
+        headers: {
+            ...options.headers,
+            'Authorization': `Bearer ${user?.access_token}`
+        }
+    });
+};
+
+// Drop-in replacement for fetch on authenticated API calls.
+// When the access token has expired (401), it gets a new one with the refresh token and retries the request once.
+// If the session cannot be refreshed, the stored login is cleared and the user is sent to the login page.
+export const authFetch = async (url, options = {}) => {
+    const response = await send(url, options);
+
+    const user = JSON.parse(localStorage.getItem('user'));
+    if (response.status !== 401 || !user?.refresh_token) {
+        return response;
+    }
+
+    try {
+        refreshing = refreshing || authService.refresh().finally(() => { refreshing = null; });
+        await refreshing;
+    } catch (error) {
+        localStorage.removeItem('user');
+        localStorage.removeItem('token');
+        window.location.assign('/login');
+        return response;
+    }
+
+    return send(url, options);
+};
+
+export default authFetch;
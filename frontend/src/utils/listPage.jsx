@@ -0,0 +1,24 @@
+// Rows the admin list pages ask for per request; further pages are fetched with "Load more"
+export const PAGE_SIZE = 50;
+
+// Builds the query string of a list request: the server-side filters (empty ones are left out),
+// the page size, and the cursor of the page to continue after
+export const listParams = ({ limit = PAGE_SIZE, after, ...filters } = {}) => {
+    const params = new URLSearchParams({ limit });
+    if (after) {
+        params.set('after', after);
+    }
+    Object.entries(filters).forEach(([name, value]) => {
+        if (value !== '' && value !== null && value !== undefined) {
+            params.set(name, value);
+        }
+    });
+    return params;
+};
+
+// Reads one page of a list response.
+// nextCursor is the X-Next-Cursor header: pass it back as `after` for the next page; it is null on the last page.
+export const readPage = async (response) => ({
+    items: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor')
+});